@@ -4,6 +4,21 @@
 고양시 테니스장 예약 API 서버
 n8n에서 HTTP Request로 호출하여 사용
 
+aiohttp.web 위에서 이벤트 루프 하나를 프로세스 내내 유지한다.
+  - TCP 연결 풀(커넥터)은 서버 시작 시 하나 만들어 모든 요청이 공유한다.
+  - check-login/check-slots/reserve-single/search-*는 user_id별 로그인 세션을
+    캐시해(session_cache.py) 요청마다 로그인(3회 왕복)을 반복하지 않는다.
+    reserve-single은 같은 세션의 예약끼리 직렬화한다 (apply → proc 세션 상태).
+  - /reserve(복수)는 예약마다 독립 세션을 새로 로그인하되, 연결 풀은 공유한다.
+요청이 워커 스레드를 붙잡지 않으므로 n8n이 동시에 여러 건을 호출해도 된다.
+
+오래 걸리는 /reserve, /reserve-single, /search-weekend, /search-all은 본문에
+"async": true를 주면 job id를 바로 돌려주고 백그라운드에서 실행한다 (jobs.py).
+    GET    /jobs               작업 목록
+    GET    /jobs/<id>          상태·결과
+    GET    /jobs/<id>/events   진행 이벤트 (Server-Sent Events)
+    DELETE /jobs/<id>          취소
+
 사용법:
     python3 api_server.py                    # 기본 포트 5000
     python3 api_server.py --port 8080        # 포트 지정
@@ -20,39 +35,121 @@ n8n 호출 예시:
 """
 
 import argparse
-import asyncio
-import urllib3
-from flask import Flask, request, jsonify
+import json
+import logging
 from datetime import datetime
 
+from aiohttp import web
+
 import config
+from jobs import JobLimitError, JobManager
 from reservation_async import (
-    TennisReservationAsync,
+    _make_connector,
     run_reservation_async,
     search_available_slots_async,
     search_all_slots_async,
 )
-from reservation_http import TennisReservationHTTP
+from session_cache import SessionCache
+
+CREDENTIALS_REQUIRED = "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
+
+
+CONNECTOR = web.AppKey("connector", object)
+SESSIONS = web.AppKey("sessions", SessionCache)
+JOBS = web.AppKey("jobs", JobManager)
+
+SSE_HEARTBEAT_S = 15
+
+
+async def _lifecycle(app):
+    """프로세스 공용 커넥터·로그인 세션 캐시·작업 관리자를 만들고 종료 시 닫는다."""
+    connector = _make_connector(config.API_CONNECTION_LIMIT, config.API_CONNECTION_LIMIT)
+    app[CONNECTOR] = connector
+    app[SESSIONS] = SessionCache(connector)
+    app[JOBS] = JobManager()
+    yield
+    await app[JOBS].close()
+    await app[SESSIONS].close()
+    await connector.close()
+
+
+# ============================================================
+# 요청 처리 도우미
+# ============================================================
+
+def _error(message, status=400):
+    return web.json_response({"error": message}, status=status)
+
+
+async def _json_body(request):
+    """요청 JSON 본문 (없으면 빈 dict). 형식이 잘못되면 400."""
+    if not request.body_exists:
+        return {}
+    try:
+        data = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": "잘못된 JSON 본문"}, ensure_ascii=False),
+            content_type="application/json")
+    return data if isinstance(data, dict) else {}
+
 
-# SSL 경고 비활성화
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+def _credentials(data):
+    return data.get("user_id") or config.USER_ID, data.get("user_pw") or config.USER_PW
 
-app = Flask(__name__)
 
+async def _respond(request, data, kind, user_id, run, params):
+    """run(job)을 실행해 결과를 돌려준다. 본문에 "async": true면 작업으로 넘기고 202.
 
-@app.route("/health", methods=["GET"])
-def health():
+    run은 job(동기 실행 시 None)을 받아 결과 dict를 반환하는 코루틴 함수.
+    """
+    if not data.get("async"):
+        return web.json_response(await run(None))
+    try:
+        job = request.app[JOBS].submit(kind, user_id, run, params)
+    except JobLimitError as e:
+        return _error(str(e), 429)
+    print(f"[API] 작업 {job.id} 등록: {kind} ({user_id})")
+    return web.json_response({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+    }, status=202)
+
+
+def _progress(job):
+    """월 검색의 날짜별 진행 콜백 — 작업이면 "date" 이벤트로 내보낸다."""
+    if job is None:
+        return None
+    return lambda progress: job.emit("date", **progress)
+
+
+def _default_court():
+    cfg = config.RESERVATION_CONFIG
+    if "reservations" in cfg:
+        return cfg["reservations"][0]["court"]
+    if "court_schedules" in cfg:
+        return cfg["court_schedules"][0]["court"]
+    return cfg.get("court_number", 1)
+
+
+# ============================================================
+# 엔드포인트
+# ============================================================
+
+async def health(request):
     """헬스 체크"""
-    return jsonify({
+    return web.json_response({
         "status": "ok",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "sessions": request.app[SESSIONS].stats(),
     })
 
 
-@app.route("/config", methods=["GET"])
-def get_config():
+async def get_config(request):
     """현재 설정 조회"""
-    return jsonify({
+    return web.json_response({
         "config": config.RESERVATION_CONFIG,
         "site_url": config.MAIN_URL,
         "reservation_day": config.RESERVATION_DAY,
@@ -61,83 +158,63 @@ def get_config():
     })
 
 
-@app.route("/check-login", methods=["POST"])
-def check_login():
+async def check_login(request):
     """로그인 테스트"""
-    data = request.get_json() or {}
-
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
+    data = await _json_body(request)
+    user_id, user_pw = _credentials(data)
 
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수)"
-        }), 400
+        return _error("user_id 또는 user_pw 필요 (요청 본문 또는 환경변수)")
 
-    bot = TennisReservationHTTP()
-    success = bot.login(user_id, user_pw)
+    async with request.app[SESSIONS].borrow(user_id, user_pw) as bot:
+        success = bot is not None
 
-    return jsonify({
+    return web.json_response({
         "success": success,
         "message": "로그인 성공" if success else "로그인 실패"
     })
 
 
-@app.route("/check-slots", methods=["POST"])
-def check_slots():
+async def check_slots(request):
     """예약 가능 시간대 조회"""
-    data = request.get_json() or {}
+    data = await _json_body(request)
 
     date_str = data.get("date")
-    _cfg = config.RESERVATION_CONFIG
-    if "reservations" in _cfg:
-        _default_court = _cfg["reservations"][0]["court"]
-    elif "court_schedules" in _cfg:
-        _default_court = _cfg["court_schedules"][0]["court"]
-    else:
-        _default_court = _cfg.get("court_number", 1)
-    court = data.get("court", _default_court)
+    court = data.get("court", _default_court())
 
     if not date_str:
-        return jsonify({"error": "date 필드 필요 (YYYY-MM-DD)"}), 400
+        return _error("date 필드 필요 (YYYY-MM-DD)")
 
     try:
         dt = datetime.strptime(date_str, "%Y-%m-%d")
     except ValueError:
-        return jsonify({"error": "잘못된 날짜 형식 (YYYY-MM-DD)"}), 400
-
-    # 로그인 정보
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
+        return _error("잘못된 날짜 형식 (YYYY-MM-DD)")
 
+    user_id, user_pw = _credentials(data)
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
-        }), 400
-
-    async def _check():
-        async with TennisReservationAsync() as bot:
-            if not await bot.login(user_id, user_pw):
-                return None, None
-            html = await bot.get_reservation_page(court, dt.year, dt.month, dt.day)
-            if not html:
-                return None, None
-            return bot.get_available_slots(html), None
+        return _error(CREDENTIALS_REQUIRED)
 
-    slots, _ = asyncio.run(_check())
+    sessions = request.app[SESSIONS]
+    slots = None
+    async with sessions.borrow(user_id, user_pw) as bot:
+        if bot is not None:
+            html = await bot.get_reservation_page(court, dt.year, dt.month, dt.day)
+            if html:
+                slots = bot.get_available_slots(html)
+            else:
+                await sessions.invalidate(user_id)
 
     if slots is None:
-        return jsonify({"error": "로그인 실패 또는 예약 페이지 조회 실패"}), 500
+        return _error("로그인 실패 또는 예약 페이지 조회 실패", 500)
 
-    return jsonify({
+    return web.json_response({
         "date": date_str,
         "court": court,
         "available_slots": slots
     })
 
 
-@app.route("/reserve", methods=["POST"])
-def reserve():
+async def reserve(request):
     """예약 실행
 
     요청 본문 (방법 1 - 기존 방식):
@@ -170,61 +247,50 @@ def reserve():
         "test_mode": false
     }
     """
-    data = request.get_json() or {}
+    data = await _json_body(request)
     test_mode = data.get("test_mode", False)
 
     # 로그인 정보 확인
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
-
+    user_id, user_pw = _credentials(data)
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
-        }), 400
+        return _error(CREDENTIALS_REQUIRED)
 
     # 방법 2: reservations 배열 직접 지정
     if "reservations" in data:
         reservations = data["reservations"]
         if not isinstance(reservations, list):
-            return jsonify({"error": "reservations는 배열이어야 합니다."}), 400
+            return _error("reservations는 배열이어야 합니다.")
 
         # 유효성 검사
         for i, res in enumerate(reservations):
             if "date" not in res:
-                return jsonify({"error": f"reservations[{i}]에 date 필드 필요"}), 400
+                return _error(f"reservations[{i}]에 date 필드 필요")
             if "hour" not in res:
-                return jsonify({"error": f"reservations[{i}]에 hour 필드 필요"}), 400
+                return _error(f"reservations[{i}]에 hour 필드 필요")
             if "court" not in res:
-                return jsonify({"error": f"reservations[{i}]에 court 필드 필요"}), 400
+                return _error(f"reservations[{i}]에 court 필드 필요")
 
             # 날짜 검증
             try:
                 datetime.strptime(res["date"], "%Y-%m-%d")
             except ValueError:
-                return jsonify({"error": f"잘못된 날짜 형식: {res['date']} (YYYY-MM-DD 필요)"}), 400
+                return _error(f"잘못된 날짜 형식: {res['date']} (YYYY-MM-DD 필요)")
 
             # 시간 검증
             if res["hour"] not in config.AVAILABLE_HOURS:
-                return jsonify({"error": f"잘못된 시간: {res['hour']} (6, 8, 10 등 2시간 단위)"}), 400
+                return _error(f"잘못된 시간: {res['hour']} (6, 8, 10 등 2시간 단위)")
 
             # 코트 검증
             if res["court"] not in config.ALL_COURTS:
-                return jsonify({"error": f"잘못된 코트 번호: {res['court']} (1-4)"}), 400
+                return _error(f"잘못된 코트 번호: {res['court']} (1-4)")
 
         print(f"[API] 예약 요청 수신 (상세 지정)")
         print(f"  총 {len(reservations)}건")
         for res in reservations:
             print(f"    - {res['date']} {res['hour']:02d}:00 {res['court']}번 코트")
 
-        # 예약 실행
-        result = asyncio.run(run_reservation_async(
-            test_mode=test_mode,
-            reservations=reservations,
-            user_id=user_id,
-            user_pw=user_pw,
-            wait_for_open=False,
-        ))
-        return jsonify(result)
+        return await _respond_reserve(request, data, user_id, user_pw,
+                                      test_mode=test_mode, reservations=reservations)
 
     # 방법 3: court_schedules로 코트별 시간 지정
     if "court_schedules" in data:
@@ -232,34 +298,34 @@ def reserve():
         dates = data.get("dates", config.RESERVATION_CONFIG["dates"])
 
         if not isinstance(court_schedules, list):
-            return jsonify({"error": "court_schedules는 배열이어야 합니다."}), 400
+            return _error("court_schedules는 배열이어야 합니다.")
         if not dates:
-            return jsonify({"error": "dates 필드가 필요합니다."}), 400
+            return _error("dates 필드가 필요합니다.")
 
         # 날짜 검증
         for d in dates:
             try:
                 datetime.strptime(d, "%Y-%m-%d")
             except ValueError:
-                return jsonify({"error": f"잘못된 날짜 형식: {d} (YYYY-MM-DD 필요)"}), 400
+                return _error(f"잘못된 날짜 형식: {d} (YYYY-MM-DD 필요)")
 
         # court_schedules → reservations 변환
         reservations = []
         for schedule in court_schedules:
             if "court" not in schedule or "hours" not in schedule:
-                return jsonify({"error": "court_schedules 항목에 court, hours 필드 필요"}), 400
+                return _error("court_schedules 항목에 court, hours 필드 필요")
 
             court = schedule["court"]
             hours = schedule["hours"]
 
             # 코트 검증
             if court not in config.ALL_COURTS:
-                return jsonify({"error": f"잘못된 코트 번호: {court} (1-4)"}), 400
+                return _error(f"잘못된 코트 번호: {court} (1-4)")
 
             # 시간 검증
             for h in hours:
                 if h not in config.AVAILABLE_HOURS:
-                    return jsonify({"error": f"잘못된 시간: {h} (6, 8, 10 등 2시간 단위)"}), 400
+                    return _error(f"잘못된 시간: {h} (6, 8, 10 등 2시간 단위)")
 
             # 날짜 × 시간 조합
             for date in dates:
@@ -275,15 +341,8 @@ def reserve():
         for res in reservations:
             print(f"    - {res['date']} {res['hour']:02d}:00 {res['court']}번 코트")
 
-        # 예약 실행
-        result = asyncio.run(run_reservation_async(
-            test_mode=test_mode,
-            reservations=reservations,
-            user_id=user_id,
-            user_pw=user_pw,
-            wait_for_open=False,
-        ))
-        return jsonify(result)
+        return await _respond_reserve(request, data, user_id, user_pw,
+                                      test_mode=test_mode, reservations=reservations)
 
     # 방법 1: 기존 방식 (dates × hours × courts)
     dates = data.get("dates", config.RESERVATION_CONFIG["dates"])
@@ -293,7 +352,7 @@ def reserve():
     if "courts" in data:
         courts = data["courts"]
         if not isinstance(courts, list):
-            return jsonify({"error": "courts는 배열이어야 합니다."}), 400
+            return _error("courts는 배열이어야 합니다.")
     elif "court" in data:
         courts = [data["court"]]
     else:
@@ -301,30 +360,30 @@ def reserve():
 
     # 유효성 검사
     if not dates:
-        return jsonify({"error": "dates 필드가 비어있습니다."}), 400
+        return _error("dates 필드가 비어있습니다.")
 
     if not hours:
-        return jsonify({"error": "hours 필드가 비어있습니다."}), 400
+        return _error("hours 필드가 비어있습니다.")
 
     if not courts:
-        return jsonify({"error": "courts 필드가 비어있습니다."}), 400
+        return _error("courts 필드가 비어있습니다.")
 
     # 날짜 형식 검증
     for d in dates:
         try:
             datetime.strptime(d, "%Y-%m-%d")
         except ValueError:
-            return jsonify({"error": f"잘못된 날짜 형식: {d} (YYYY-MM-DD 필요)"}), 400
+            return _error(f"잘못된 날짜 형식: {d} (YYYY-MM-DD 필요)")
 
     # 시간 검증
     for h in hours:
         if h not in config.AVAILABLE_HOURS:
-            return jsonify({"error": f"잘못된 시간: {h} (6, 8, 10 등 2시간 단위)"}), 400
+            return _error(f"잘못된 시간: {h} (6, 8, 10 등 2시간 단위)")
 
     # 코트 검증
     for court in courts:
         if court not in config.ALL_COURTS:
-            return jsonify({"error": f"잘못된 코트 번호: {court} (1-4)"}), 400
+            return _error(f"잘못된 코트 번호: {court} (1-4)")
 
     print(f"[API] 예약 요청 수신")
     print(f"  날짜: {dates}")
@@ -332,22 +391,27 @@ def reserve():
     print(f"  코트: {courts}")
     print(f"  테스트: {test_mode}")
 
-    # 예약 실행
-    result = asyncio.run(run_reservation_async(
-        test_mode=test_mode,
-        dates=dates,
-        hours=hours,
-        courts=courts,
-        user_id=user_id,
-        user_pw=user_pw,
-        wait_for_open=False,
-    ))
+    return await _respond_reserve(request, data, user_id, user_pw,
+                                  test_mode=test_mode, dates=dates, hours=hours, courts=courts)
+
 
-    return jsonify(result)
+async def _respond_reserve(request, data, user_id, user_pw, **kwargs):
+    """검증을 마친 /reserve 요청을 실행한다 (kwargs → run_reservation_async)."""
+    connector = request.app[CONNECTOR]
 
+    async def run(job):
+        return await run_reservation_async(
+            user_id=user_id,
+            user_pw=user_pw,
+            wait_for_open=False,
+            connector=connector,
+            **kwargs,
+        )
+
+    return await _respond(request, data, "reserve", user_id, run, kwargs)
 
-@app.route("/reserve-single", methods=["POST"])
-def reserve_single():
+
+async def reserve_single(request):
     """단일 예약 실행
 
     요청 본문:
@@ -360,61 +424,52 @@ def reserve_single():
         "user_pw": "your_pw"     # 선택사항 (환경변수 또는 config.py에서 읽음)
     }
     """
-    data = request.get_json() or {}
+    data = await _json_body(request)
 
     date = data.get("date")
     hour = data.get("hour")
-    _cfg = config.RESERVATION_CONFIG
-    if "reservations" in _cfg:
-        _default_court = _cfg["reservations"][0]["court"]
-    elif "court_schedules" in _cfg:
-        _default_court = _cfg["court_schedules"][0]["court"]
-    else:
-        _default_court = _cfg.get("court_number", 1)
-    court = data.get("court", _default_court)
+    court = data.get("court", _default_court())
     test_mode = data.get("test_mode", False)
 
     if not date:
-        return jsonify({"error": "date 필드 필요"}), 400
+        return _error("date 필드 필요")
 
     if hour is None:
-        return jsonify({"error": "hour 필드 필요"}), 400
+        return _error("hour 필드 필요")
 
     try:
         datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
-        return jsonify({"error": "잘못된 날짜 형식 (YYYY-MM-DD)"}), 400
-
-    # 로그인 정보
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
+        return _error("잘못된 날짜 형식 (YYYY-MM-DD)")
 
+    user_id, user_pw = _credentials(data)
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
-        }), 400
+        return _error(CREDENTIALS_REQUIRED)
 
     print(f"[API] 단일 예약 요청: {date} {hour:02d}:00 / {court}번 코트")
 
-    async def _reserve():
-        async with TennisReservationAsync() as bot:
-            if not await bot.login(user_id, user_pw):
-                return False, "로그인 실패"
-            return await bot.reserve(date, hour, court, test_mode)
+    sessions = request.app[SESSIONS]
 
-    success, message = asyncio.run(_reserve())
+    async def run(job):
+        # 캐시된 세션을 쓰되 apply → proc 사이에 같은 세션의 다른 예약이 끼지 않게 한다
+        async with sessions.borrow(user_id, user_pw, exclusive=True) as bot:
+            if bot is None:
+                success, message = False, "로그인 실패"
+            else:
+                success, message = await bot.reserve(date, hour, court, test_mode)
+        return {
+            "success": success,
+            "message": message,
+            "date": date,
+            "hour": hour,
+            "court": court
+        }
 
-    return jsonify({
-        "success": success,
-        "message": message,
-        "date": date,
-        "hour": hour,
-        "court": court
-    })
+    return await _respond(request, data, "reserve-single", user_id, run,
+                          {"date": date, "hour": hour, "court": court, "test_mode": test_mode})
 
 
-@app.route("/search-weekend", methods=["POST"])
-def search_weekend():
+async def search_weekend(request):
     """주말 빈자리 검색 (토/일, 6시~12시)
 
     요청 본문:
@@ -423,42 +478,47 @@ def search_weekend():
         "month": 2,
         "courts": [1, 2, 3, 4],  # 선택사항
         "hours": [6, 8, 10],     # 선택사항
+        "shards": 3,             # 선택사항, 조회에 쓸 계정 수 (기본 TENNIS_SEARCH_SHARDS)
+        "max_age": 0,            # 선택사항, 이보다 새(초) 캐시 결과 재사용 (0 = 모두 새로 조회)
         "user_id": "your_id",    # 선택사항 (환경변수 또는 config.py에서 읽음)
         "user_pw": "your_pw"     # 선택사항 (환경변수 또는 config.py에서 읽음)
     }
     """
-    data = request.get_json() or {}
+    data = await _json_body(request)
 
     year = data.get("year")
     month = data.get("month")
 
     if not year or not month:
-        return jsonify({"error": "year, month 필드 필요"}), 400
+        return _error("year, month 필드 필요")
 
     courts = data.get("courts", config.ALL_COURTS)
     hours = data.get("hours", config.SEARCH_DEFAULT_HOURS)
+    shards = data.get("shards")
+    max_age = data.get("max_age")
 
-    # 로그인 정보
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
-
+    user_id, user_pw = _credentials(data)
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
-        }), 400
+        return _error(CREDENTIALS_REQUIRED)
 
     print(f"[API] 주말 빈자리 검색: {year}년 {month}월")
 
-    result = asyncio.run(search_available_slots_async(
-        year, month, courts=courts, hours=hours, verbose=False,
-        user_id=user_id, user_pw=user_pw,
-    ))
+    sessions = request.app[SESSIONS]
 
-    return jsonify(result)
+    async def run(job):
+        async with sessions.borrow(user_id, user_pw) as bot:
+            if bot is None:
+                return {"error": "로그인 실패", "results": []}
+            return await search_available_slots_async(
+                year, month, courts=courts, hours=hours, verbose=False, bot=bot,
+                user_id=user_id, shards=shards, max_age=max_age, on_result=_progress(job),
+            )
 
+    return await _respond(request, data, "search-weekend", user_id, run,
+                          {"year": year, "month": month, "courts": courts, "hours": hours})
 
-@app.route("/search-all", methods=["POST"])
-def search_all():
+
+async def search_all(request):
     """전체 날짜/시간 빈자리 검색
 
     요청 본문:
@@ -466,46 +526,136 @@ def search_all():
         "year": 2026,
         "month": 2,
         "courts": [1, 2, 3, 4],  # 선택사항
+        "shards": 3,             # 선택사항, 조회에 쓸 계정 수 (기본 TENNIS_SEARCH_SHARDS)
+        "max_age": 0,            # 선택사항, 이보다 새(초) 캐시 결과 재사용 (0 = 모두 새로 조회)
         "user_id": "your_id",    # 선택사항 (환경변수 또는 config.py에서 읽음)
         "user_pw": "your_pw"     # 선택사항 (환경변수 또는 config.py에서 읽음)
     }
     """
-    data = request.get_json() or {}
+    data = await _json_body(request)
 
     year = data.get("year")
     month = data.get("month")
 
     if not year or not month:
-        return jsonify({"error": "year, month 필드 필요"}), 400
+        return _error("year, month 필드 필요")
 
     courts = data.get("courts", config.ALL_COURTS)
+    shards = data.get("shards")
+    max_age = data.get("max_age")
 
-    # 로그인 정보
-    user_id = data.get("user_id") or config.USER_ID
-    user_pw = data.get("user_pw") or config.USER_PW
-
+    user_id, user_pw = _credentials(data)
     if not user_id or not user_pw:
-        return jsonify({
-            "error": "user_id 또는 user_pw 필요 (요청 본문 또는 환경변수 TENNIS_USER_ID, TENNIS_USER_PW)"
-        }), 400
+        return _error(CREDENTIALS_REQUIRED)
 
     print(f"[API] 전체 빈자리 검색: {year}년 {month}월")
 
-    result = asyncio.run(search_all_slots_async(
-        year, month, courts=courts, verbose=False,
-        user_id=user_id, user_pw=user_pw,
-    ))
+    sessions = request.app[SESSIONS]
+
+    async def run(job):
+        async with sessions.borrow(user_id, user_pw) as bot:
+            if bot is None:
+                return {"error": "로그인 실패", "results": []}
+            return await search_all_slots_async(
+                year, month, courts=courts, verbose=False, bot=bot,
+                user_id=user_id, shards=shards, max_age=max_age, on_result=_progress(job),
+            )
+
+    return await _respond(request, data, "search-all", user_id, run,
+                          {"year": year, "month": month, "courts": courts})
+
+
+# ============================================================
+# 작업 (jobs.py)
+# ============================================================
 
-    return jsonify(result)
+def _job_or_404(request):
+    job = request.app[JOBS].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(
+            text=json.dumps({"error": "작업을 찾을 수 없습니다."}, ensure_ascii=False),
+            content_type="application/json")
+    return job
+
+
+async def list_jobs(request):
+    """작업 목록 (최근 순, 결과 제외)"""
+    jobs = request.app[JOBS]
+    return web.json_response({"stats": jobs.stats(), "jobs": jobs.list()})
+
+
+async def get_job(request):
+    """작업 상태·결과"""
+    return web.json_response(_job_or_404(request).to_dict())
+
+
+async def cancel_job(request):
+    """작업 취소"""
+    job = _job_or_404(request)
+    cancelled = request.app[JOBS].cancel(job.id)
+    return web.json_response({"job_id": job.id, "cancelled": cancelled, "status": job.status})
+
+
+async def job_events(request):
+    """작업 진행 이벤트를 Server-Sent Events로 보낸다.
+
+    지난 이벤트부터 재생하고(Last-Event-ID 헤더가 있으면 그 다음부터), 작업이 끝나면
+    종료 이벤트(done/failed/cancelled)를 보낸 뒤 스트림을 닫는다.
+    """
+    job = _job_or_404(request)
+    resp = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream; charset=utf-8",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await resp.prepare(request)
+
+    try:
+        sent = int(request.headers.get("Last-Event-ID", -1)) + 1
+    except ValueError:
+        sent = 0
+    while True:
+        for event in job.events[sent:]:
+            await resp.write(
+                f"id: {event['seq']}\nevent: {event['type']}\n"
+                f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+        sent = len(job.events)
+        if job.done:
+            break
+        await job.wait_events(sent, SSE_HEARTBEAT_S)
+        if len(job.events) == sent:
+            await resp.write(b": keep-alive\n\n")
+    return resp
+
+
+def create_app():
+    app = web.Application()
+    app.cleanup_ctx.append(_lifecycle)
+    app.router.add_get("/health", health)
+    app.router.add_get("/config", get_config)
+    app.router.add_post("/check-login", check_login)
+    app.router.add_post("/check-slots", check_slots)
+    app.router.add_post("/reserve", reserve)
+    app.router.add_post("/reserve-single", reserve_single)
+    app.router.add_post("/search-weekend", search_weekend)
+    app.router.add_post("/search-all", search_all)
+    app.router.add_get("/jobs", list_jobs)
+    app.router.add_get("/jobs/{job_id}", get_job)
+    app.router.add_delete("/jobs/{job_id}", cancel_job)
+    app.router.add_get("/jobs/{job_id}/events", job_events)
+    return app
 
 
 def main():
     parser = argparse.ArgumentParser(description="테니스장 예약 API 서버")
     parser.add_argument("--host", default=config.API_HOST, help=f"바인딩 호스트 (기본: {config.API_HOST})")
     parser.add_argument("--port", type=int, default=config.API_PORT, help=f"포트 번호 (기본: {config.API_PORT})")
-    parser.add_argument("--debug", action="store_true", help="디버그 모드")
+    parser.add_argument("--debug", action="store_true", help="디버그 모드 (asyncio·aiohttp 디버그 로그)")
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO,
+                        format="%(message)s")
+
     print("=" * 50)
     print("고양시 테니스장 예약 API 서버")
     print("=" * 50)
@@ -520,10 +670,12 @@ def main():
     print(f"  POST /reserve-single - 예약 실행 (단일)")
     print(f"  POST /search-weekend - 주말 빈자리 검색")
     print(f"  POST /search-all     - 전체 빈자리 검색")
+    print("  GET  /jobs/<id>      - 비동기 작업 상태 (\"async\": true 요청)")
+    print("  GET  /jobs/<id>/events - 작업 진행 이벤트 (SSE)")
     print("=" * 50)
     print()
 
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    web.run_app(create_app(), host=args.host, port=args.port, print=None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+빈자리 조회 캐시 — (날짜, 코트)별 빈 시간대를 실행 간 보관
+
+같은 달을 1분 안에 다시 검색해도(--search, API /search-*, 뷰어 /api/search) 모든
+페이지를 처음부터 다시 받았다. 예약 페이지 하나 = (날짜, 코트) 하나이므로 그 단위로
+빈 시간대와 조회 시각을 저장하고, 검색은 max_age초보다 새 항목은 캐시에서 쓰고
+오래된 키만 다시 조회한다.
+
+저장소: cache/availability.sqlite3 (WAL, 표 하나)
+    pages(date TEXT, court INTEGER, fetched_at REAL, hours INTEGER)  PK (date, court)
+    hours = 8비트 시간대 마스크 (slot_bitmap.hour_mask, 06시 = 0번 비트)
+조회 실패한 페이지는 저장하지 않고, 지난 날짜는 저장할 때 지운다.
+예약은 캐시를 쓰지 않는다 (조회 전용).
+
+검색 파이프라인(search_pipeline.fetch_by_date)이 읽고 쓴다. 뷰어는 스레드마다
+asyncio.run을 돌리므로 연결은 호출마다 새로 연다.
+
+설정: config.AVAIL_CACHE, config.AVAIL_CACHE_MAX_AGE_S
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date
+from pathlib import Path
+
+CACHE_PATH = Path(__file__).resolve().parent / "cache" / "availability.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    date       TEXT    NOT NULL,
+    court      INTEGER NOT NULL,
+    fetched_at REAL    NOT NULL,
+    hours      INTEGER NOT NULL,
+    PRIMARY KEY (date, court)
+) WITHOUT ROWID;
+"""
+
+
+class AvailabilityCache:
+    """(date "YYYY-MM-DD", court) → (fetched_at, 시간대 마스크) 저장소."""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = Path(path)
+        self._ready = False
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _connect(self):
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def get_fresh(self, keys, max_age):
+        """keys 중 max_age초 안에 조회된 항목만 {(date, court): 시간대 마스크}로 돌려준다."""
+        keys = list(keys)
+        if not keys or max_age <= 0:
+            self._count(misses=len(keys))
+            return {}
+        cutoff = time.time() - max_age
+        dates = sorted({d for d, _ in keys})
+        wanted = set(keys)
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    f"SELECT date, court, hours FROM pages "
+                    f"WHERE fetched_at >= ? AND date IN ({','.join('?' * len(dates))})",
+                    (cutoff, *dates),
+                ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            print(f"[WARN] 빈자리 캐시 읽기 실패: {e}")
+            rows = []
+        fresh = {(d, c): hours for d, c, hours in rows if (d, c) in wanted}
+        self._count(hits=len(fresh), misses=len(keys) - len(fresh))
+        return fresh
+
+    def put_many(self, items, fetched_at=None):
+        """items: {(date, court): 시간대 마스크} — 한 트랜잭션으로 저장하고 지난 날짜는 지운다."""
+        if not items:
+            return
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        rows = [(d, c, fetched_at, hours) for (d, c), hours in items.items()]
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO pages (date, court, fetched_at, hours) "
+                    "VALUES (?, ?, ?, ?)", rows)
+                conn.execute("DELETE FROM pages WHERE date < ?", (date.today().isoformat(),))
+        except (sqlite3.Error, OSError) as e:
+            print(f"[WARN] 빈자리 캐시 저장 실패: {e}")
+            return
+        self._count(stored=len(rows))
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, n in deltas.items():
+                self.stats[key] += n
+
+
+CACHE = AvailabilityCache()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엔진별 종단 간 벤치마크 (mock_server.py 대상)
+
+reservation_async(asyncio), reservation_http(스레드), reservation(Selenium)을
+로컬 모의 서버에 대고 예약 N건(기본 1, 4, 16, 64)씩 실행해 비교한다.
+측정 대상 엔진은 실행마다 별도 프로세스로 띄워 메모리·CPU를 분리한다.
+
+  - wall_ms       첫 예약 발사 → 마지막 결과 (엔진의 reserve 호출 구간)
+  - latency_ms    예약 1건의 reserve 시작 → 결과 p50/p99
+  - requests      서버가 받은 요청 수 (로그인 포함, 경로별) — /__stats
+  - connections   서버가 받은 새 TCP 연결 수 (keep-alive 재사용·공유 커넥터 효과)
+  - peak_rss_mb   측정 프로세스 최대 RSS (Selenium은 브라우저 자식 프로세스 별도)
+  - cpu_s         측정 프로세스 user+sys CPU 시간
+
+예약 N건은 서로 다른 (날짜, 코트, 시간)으로 만들어 모두 접수될 수 있게 하고,
+모의 서버는 1일 1건 제한을 끈 상태(--no-daily-limit)로 띄운다.
+엔진의 타이밍 로그는 임시 폴더로 돌려 실제 이력(logs/, FIRE_PLAN=auto)을
+오염시키지 않는다. Selenium/Chrome이 없으면 해당 엔진은 건너뛴다.
+
+사용법:
+    python3 bench_e2e.py                          # 3개 엔진 × N=1,4,16,64
+    python3 bench_e2e.py --engines async,http --sizes 16,64
+    python3 bench_e2e.py --latency 80 --jitter 40 # 서버 지연 주입
+    python3 bench_e2e.py --json                   # JSON 출력 (회귀 추적용)
+"""
+
+import argparse
+import inspect
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+ENGINES = ("async", "http", "selenium")
+DEFAULT_SIZES = (1, 4, 16, 64)
+DEFAULT_PORT = 18081          # mock_server 기본 포트(18080)와 겹치지 않게
+RESULT_MARK = "BENCH_RESULT "
+
+SLOT_HOURS = (6, 8, 10, 12, 14, 16, 18, 20)
+BASE_DATE = date(2026, 6, 1)
+
+
+def build_reservations(n):
+    """서로 다른 (날짜, 코트, 시간) 예약 n건 — 하루 32칸(4코트 × 8시간대)씩 채운다."""
+    out = []
+    for i in range(n):
+        day, k = divmod(i, len(SLOT_HOURS) * 4)
+        out.append({
+            "date": (BASE_DATE + timedelta(days=day)).isoformat(),
+            "hour": SLOT_HOURS[k // 4],
+            "court": k % 4 + 1,
+        })
+    return out
+
+
+def percentile(values, q):
+    """최근접 순위 백분위수. 값이 없으면 None."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+# ============================================================
+# 측정 프로세스 (--child)
+# ============================================================
+
+def _instrument(cls, method_name, spans):
+    """엔진 클래스의 예약 메서드를 감싸 (시작, 종료) perf_counter 구간을 모은다."""
+    original = getattr(cls, method_name)
+
+    if inspect.iscoroutinefunction(original):
+        async def wrapped(self, *args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return await original(self, *args, **kwargs)
+            finally:
+                spans.append((t0, time.perf_counter()))
+    else:
+        def wrapped(self, *args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return original(self, *args, **kwargs)
+            finally:
+                spans.append((t0, time.perf_counter()))
+
+    setattr(cls, method_name, wrapped)
+
+
+def _run_engine(engine, reservations, spans):
+    """엔진을 오픈 대기 없이 실행하고 성공 건수를 반환한다."""
+    import config
+
+    if engine == "async":
+        import asyncio
+        import reservation_async
+        reservation_async.LOGS_DIR = Path(tempfile.mkdtemp(prefix="bench_e2e_"))
+        _instrument(reservation_async.TennisReservationAsync, "reserve", spans)
+        result = asyncio.run(reservation_async.run_reservation_async(
+            reservations=reservations, user_id="bench", user_pw="bench",
+            wait_for_open=False))
+        return sum(1 for r in result.get("results", []) if r["success"])
+
+    if engine == "http":
+        import reservation_http
+        _instrument(reservation_http.TennisReservationHTTP, "reserve", spans)
+        result = reservation_http.run_reservation_http(
+            reservations=reservations, user_id="bench", user_pw="bench",
+            wait_for_open=False)
+        return sum(1 for r in result.get("results", []) if r["success"])
+
+    # Selenium: run_reservation은 config.RESERVATION_CONFIG를 읽고 성공 여부만 반환한다
+    import reservation
+    config.RESERVATION_CONFIG = {"reservations": reservations}
+    results = []
+    original = reservation.TennisReservationBot.reserve_single
+
+    def reserve_single(self, *args, **kwargs):
+        ok = original(self, *args, **kwargs)
+        results.append(bool(ok))
+        return ok
+
+    reservation.TennisReservationBot.reserve_single = reserve_single
+    _instrument(reservation.TennisReservationBot, "reserve_single", spans)
+    reservation.run_reservation(user_id="bench", user_pw="bench")
+    return sum(results)
+
+
+def child_main(engine, n):
+    """측정 프로세스: 결과 JSON 한 줄을 RESULT_MARK 뒤에 출력한다."""
+    reservations = build_reservations(n)
+    spans = []
+    out = {"engine": engine, "n": n}
+    t0 = time.perf_counter()
+    try:
+        out["success"] = _run_engine(engine, reservations, spans)
+    except ImportError as e:
+        out["skipped"] = f"모듈 없음: {e.name}"
+    except Exception as e:
+        if engine == "selenium" and not spans:
+            out["skipped"] = f"브라우저 실행 불가: {type(e).__name__}: {str(e).splitlines()[0][:120]}"
+        else:
+            out["error"] = f"{type(e).__name__}: {e}"
+    out["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    if engine in ("async", "http"):
+        from codec_cache import CACHE
+        out["codec"] = CACHE.stats()
+
+    import config
+    out["config"] = {"max_concurrent": config.MAX_CONCURRENT,
+                     "fire_jitter_ms": config.FIRE_JITTER_MS}
+
+    if spans:
+        fire = min(s for s, _ in spans)
+        last = max(e for _, e in spans)
+        latencies = [(e - s) * 1000 for s, e in spans]
+        out["reserved"] = len(spans)
+        out["wall_ms"] = round((last - fire) * 1000, 1)
+        out["latency_ms"] = {
+            "p50": round(percentile(latencies, 50), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies), 1),
+        }
+
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # Linux ru_maxrss 단위는 KB (macOS는 바이트)
+    rss_div = 1024 * 1024 if sys.platform == "darwin" else 1024
+    out["peak_rss_mb"] = round(self_usage.ru_maxrss / rss_div, 1)
+    out["cpu_s"] = round(self_usage.ru_utime + self_usage.ru_stime, 3)
+    if child_usage.ru_maxrss:
+        out["children_peak_rss_mb"] = round(child_usage.ru_maxrss / rss_div, 1)
+        out["children_cpu_s"] = round(child_usage.ru_utime + child_usage.ru_stime, 3)
+    print(RESULT_MARK + json.dumps(out, ensure_ascii=False), flush=True)
+
+
+# ============================================================
+# 조정 프로세스
+# ============================================================
+
+def _mock_url(port, path):
+    return f"http://localhost:{port}{path}"
+
+
+def _mock_call(port, path, method="GET"):
+    req = urllib.request.Request(_mock_url(port, path), method=method,
+                                 data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def start_mock(port, latency, jitter):
+    """모의 서버를 띄우고 /__stats가 응답할 때까지 기다린다."""
+    cmd = [sys.executable, str(ROOT / "mock_server.py"), "--port", str(port),
+           "--no-daily-limit", "--latency", str(latency), "--jitter", str(jitter)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"모의 서버 시작 실패 (종료 코드 {proc.returncode})")
+        try:
+            _mock_call(port, "/__stats")
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("모의 서버 응답 없음 (10초)")
+
+
+def run_case(engine, n, port, timeout):
+    """엔진 1개 × N건을 별도 프로세스로 실행하고 서버 요청 수를 합친 결과를 반환한다."""
+    _mock_call(port, "/__reset", method="POST")
+    env = dict(os.environ,
+               TENNIS_BASE_URL=_mock_url(port, ""),
+               TENNIS_RESERVATION_DAY="0",
+               TENNIS_SESSION_REUSE="0",
+               TENNIS_HEDGE="0",
+               TENNIS_FIRE_PLAN="")
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", engine, str(n)]
+    try:
+        proc = subprocess.run(cmd, env=env, cwd=ROOT, capture_output=True,
+                              text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"engine": engine, "n": n, "error": f"시간 초과 ({timeout}초)"}
+
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARK):
+            result = json.loads(line[len(RESULT_MARK):])
+    if result is None:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["출력 없음"]
+        return {"engine": engine, "n": n, "error": f"측정 프로세스 실패: {tail[0][:200]}"}
+
+    if "skipped" not in result:
+        stats = _mock_call(port, "/__stats")
+        result["requests"] = stats["requests"]
+        result["requests_by_path"] = {
+            path: sum(by_status.values()) for path, by_status in stats["paths"].items()
+        }
+        result["connections"] = stats["connections"]
+        result["server_max_inflight"] = stats["max_inflight"]
+    return result
+
+
+def _fmt(value, width):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}}"
+
+
+def print_report(runs, args):
+    print("=" * 78)
+    print(f"  종단 간 엔진 벤치마크 (모의 서버 지연 {args.latency:.0f}±{args.jitter:.0f}ms)")
+    print("=" * 78)
+    print(f"  {'엔진':<9} {'N':>4} {'성공':>5} {'wall ms':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'요청':>6} {'연결':>5} {'RSS MB':>7} {'CPU s':>7}")
+    for r in runs:
+        if "skipped" in r or "error" in r:
+            print(f"  {r['engine']:<9} {r['n']:>4}  {r.get('skipped') or '[ERROR] ' + r['error']}")
+            continue
+        lat = r.get("latency_ms", {})
+        print(f"  {r['engine']:<9} {r['n']:>4} {_fmt(r.get('success'), 5)} "
+              f"{_fmt(r.get('wall_ms'), 9)} {_fmt(lat.get('p50'), 8)} {_fmt(lat.get('p99'), 8)} "
+              f"{r['requests']:>6} {r['connections']:>5} {r['peak_rss_mb']:>7.1f} {r['cpu_s']:>7.2f}")
+    print("=" * 78)
+
+
+def _csv(value, cast):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔진별 종단 간 벤치마크 (mock_server.py 대상)")
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help=f"쉼표 구분 ({', '.join(ENGINES)})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="예약 건수 N 목록 (기본 1,4,16,64)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="모의 서버 포트")
+    parser.add_argument("--latency", type=float, default=0.0, help="모의 서버 요청당 지연 ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="모의 서버 추가 무작위 지연 ms")
+    parser.add_argument("--timeout", type=float, default=300, help="실행 1회 제한 시간(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--child", nargs=2, metavar=("ENGINE", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args.child[0], int(args.child[1]))
+        return
+
+    engines = _csv(args.engines, str)
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f"알 수 없는 엔진: {', '.join(unknown)}")
+    sizes = _csv(args.sizes, int)
+
+    mock = start_mock(args.port, args.latency, args.jitter)
+    runs = []
+    try:
+        for engine in engines:
+            for n in sizes:
+                if not args.json:
+                    print(f"[INFO] {engine} N={n} 실행 중...", flush=True)
+                result = run_case(engine, n, args.port, args.timeout)
+                runs.append(result)
+                if "skipped" in result:
+                    # 모듈·브라우저가 없으면 다른 N도 같은 이유로 건너뛴다
+                    runs += [{**result, "n": m} for m in sizes[sizes.index(n) + 1:]]
+                    break
+    finally:
+        mock.terminate()
+        mock.wait(timeout=5)
+
+    if args.json:
+        print(json.dumps({
+            "mock": {"latency_ms": args.latency, "jitter_ms": args.jitter},
+            "runs": runs,
+        }, ensure_ascii=False, indent=2))
+        return
+    print_report(runs, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTML 추출 엔진 마이크로 벤치마크 (html_extract.py)
+
+fixtures/ 의 저장된 페이지(EUC-KR)로 엔진별 페이지당 파싱 시간을 측정하고,
+fast 엔진 결과가 bs4(기준 구현)와 같은지 먼저 검증한다.
+
+사용법:
+    python3 bench_parse.py              # 기본 200회 반복
+    python3 bench_parse.py -n 1000      # 반복 횟수 지정
+    python3 bench_parse.py --json       # JSON 출력 (회귀 추적용)
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import html_extract
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+# (fixture 파일, 추출 종류) — 크리티컬 경로에서 실제로 호출되는 조합
+CASES = [
+    ("tennis_rent_open.html", "slots"),
+    ("tennis_rent_open.html", "document_form"),
+    ("tennis_rent_before_open.html", "slots"),
+    ("tennis_rent_before_open.html", "document_form"),
+    ("tennis_rent_closure.html", "slots"),
+    ("rent_period_apply.html", "use_form"),
+]
+
+EXTRACTORS = {
+    "slots": html_extract.extract_slots,
+    "document_form": html_extract.extract_document_form,
+    "use_form": html_extract.extract_use_form,
+}
+
+
+def load_fixture(name):
+    return (FIXTURES_DIR / name).read_bytes().decode("euc-kr")
+
+
+def time_per_call(fn, html, engine, repeat):
+    """repeat회 호출한 뒤 1회당 평균·최소 시간(µs)을 반환한다."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        fn(html, engine=engine)
+        samples.append(time.perf_counter_ns() - t0)
+    return sum(samples) / len(samples) / 1000, min(samples) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 추출 엔진 마이크로 벤치마크")
+    parser.add_argument("-n", "--repeat", type=int, default=200,
+                        help="케이스당 반복 횟수 (기본 200)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    rows = []
+    for fixture, kind in CASES:
+        html = load_fixture(fixture)
+        fn = EXTRACTORS[kind]
+
+        expected = fn(html, engine="bs4")
+        actual = fn(html, engine="fast")
+        if actual != expected:
+            print(f"[FAIL] {fixture} / {kind}: fast 엔진 결과가 bs4와 다름")
+            print(f"  bs4 : {expected}")
+            print(f"  fast: {actual}")
+            sys.exit(1)
+
+        row = {"fixture": fixture, "kind": kind, "bytes": len(html.encode("euc-kr"))}
+        for engine in ("bs4", "fast"):
+            mean_us, min_us = time_per_call(fn, html, engine, args.repeat)
+            row[f"{engine}_mean_us"] = round(mean_us, 1)
+            row[f"{engine}_min_us"] = round(min_us, 1)
+        row["speedup"] = round(row["bs4_mean_us"] / row["fast_mean_us"], 1)
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps({"repeat": args.repeat, "results": rows},
+                         ensure_ascii=False, indent=2))
+        return
+
+    print("=" * 78)
+    print(f"  HTML 추출 엔진 벤치마크 (케이스당 {args.repeat}회, 결과 일치 검증 완료)")
+    print("=" * 78)
+    print(f"  {'fixture':<30} {'종류':<14} {'bs4 µs':>10} {'fast µs':>10} {'배율':>7}")
+    for r in rows:
+        print(f"  {r['fixture']:<30} {r['kind']:<14} "
+              f"{r['bs4_mean_us']:>10.1f} {r['fast_mean_us']:>10.1f} {r['speedup']:>6.1f}x")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
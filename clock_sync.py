@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+서버 시계 오프셋 추정 — 로컬 시계가 아니라 사이트 시계 기준으로 정각 발사
+
+wait_for_reservation_open_async는 로컬 datetime.now()로 정각을 판단한다.
+호스트 시계가 사이트보다 300ms 늦으면 300ms 늦게, 빠르면 아직 열리지 않은
+페이지를 때린다. 로그인 직후(오픈 전 대기 구간)에 사이트 HTTP Date 헤더를
+여러 번 샘플링해 오프셋(서버 − 로컬)을 추정하고 발사 시각을 그만큼 옮긴다.
+
+추정 방법 (NTP와 같은 왕복 구간 논리):
+  요청 송신 t0, 응답 수신 t1(로컬 시각), Date 헤더 D(초 단위 절삭)이면
+  서버는 [t0, t1] 사이 어느 순간에 시각 [D, D+1)을 보고 있었으므로
+      오프셋 ∈ (D − t1, D + 1 − t0)
+  샘플마다 이 구간을 교집합하면 초 단위 Date 헤더로도 RTT 수준의 정밀도가
+  나온다. 교집합 중점이 추정값, 반폭이 불확실도다.
+  앞쪽 절반은 송신 시점을 1초 안에서 고르게 흩어 대략적인 경계를 찾고,
+  뒤쪽 절반은 서버 초 경계가 왕복 중간에 걸리도록 송신해 구간을 좁힌다.
+
+  교집합이 비면(서버 시계 튐·프록시 캐시 등) 샘플별 RTT 중점 추정값의
+  중앙값으로 폴백하고 consistent=False로 표시한다.
+
+설정: config.CLOCK_SYNC, CLOCK_SYNC_SAMPLES, CLOCK_SYNC_MAX_SHIFT_MS
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+import config
+
+
+def _parse_http_date(value):
+    """HTTP Date 헤더 → epoch 초 (파싱 실패 시 None)."""
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_offset(samples):
+    """(t0, t1, server_ts) 샘플 목록으로 서버 시계 오프셋을 추정한다.
+
+    Returns:
+        dict: {"offset_ms", "uncertainty_ms", "rtt_ms", "jitter_ms",
+               "samples", "consistent"} — 샘플이 없으면 None
+    """
+    if not samples:
+        return None
+
+    lo = max(d - t1 for t0, t1, d in samples)
+    hi = min(d + 1 - t0 for t0, t1, d in samples)
+    rtts = [t1 - t0 for t0, t1, d in samples]
+
+    if lo <= hi:
+        offset, uncertainty, consistent = (lo + hi) / 2, (hi - lo) / 2, True
+    else:
+        # 구간이 서로 모순 — RTT 중점 추정(Date 절삭 보정 +0.5초)의 중앙값
+        mids = [d + 0.5 - (t0 + t1) / 2 for t0, t1, d in samples]
+        offset, uncertainty, consistent = statistics.median(mids), 0.5, False
+
+    return {
+        "offset_ms": round(offset * 1000, 1),
+        "uncertainty_ms": round(uncertainty * 1000, 1),
+        "rtt_ms": round(statistics.median(rtts) * 1000, 1),
+        "jitter_ms": round(statistics.pstdev(rtts) * 1000, 1),
+        "samples": len(samples),
+        "consistent": consistent,
+    }
+
+
+async def _sample(session, url):
+    t0 = time.time()
+    async with session.head(url, allow_redirects=False) as resp:
+        date_header = resp.headers.get("Date")
+    t1 = time.time()
+    server_ts = _parse_http_date(date_header)
+    return None if server_ts is None else (t0, t1, server_ts)
+
+
+async def measure_server_clock(url=None, n_samples=None, deadline=None, resolver=None):
+    """사이트 Date 헤더를 샘플링해 estimate_offset() 결과를 반환한다.
+
+    로그인 세션과 분리된 익명 세션으로 HEAD 요청만 보낸다 (PHP 세션 상태 무관).
+
+    Args:
+        deadline: 로컬 epoch 초. 이 시각을 넘기는 샘플은 보내지 않는다
+                  (오픈 직전 재예열 구간을 침범하지 않도록).
+    """
+    url = url or config.MAIN_URL
+    n_samples = n_samples or config.CLOCK_SYNC_SAMPLES
+    samples = []
+    timeout = aiohttp.ClientTimeout(total=config.CONNECTION_TIMEOUT)
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False, limit=1, resolver=resolver), timeout=timeout,
+    ) as session:
+        # 첫 요청은 TCP/TLS 핸드셰이크가 RTT에 섞이므로 예열용으로만 쓴다
+        try:
+            await _sample(session, url)
+        except Exception as e:
+            print(f"[WARN] 서버 시계 샘플링 실패: {e}")
+            return None
+
+        for k in range(n_samples):
+            estimate = estimate_offset(samples)
+            if k < n_samples // 2 or estimate is None or not estimate["consistent"]:
+                phase = k / n_samples
+            else:
+                # 서버 초 경계가 왕복 중간에 오도록: 로컬 t + RTT/2 + 오프셋 ≡ 0 (mod 1),
+                # 현재 불확실 구간 안에서 무작위로 흔들어 매 샘플이 구간을 자르게 한다
+                half = estimate["uncertainty_ms"] / 1000
+                phase = -(estimate["offset_ms"] / 1000 + estimate["rtt_ms"] / 2000
+                          + random.uniform(-half, half))
+            now = time.time()
+            wait = (phase - now) % 1
+            if deadline is not None and now + wait > deadline:
+                break
+            await asyncio.sleep(wait)
+            try:
+                sample = await _sample(session, url)
+            except Exception:
+                continue
+            if sample is not None:
+                samples.append(sample)
+
+    return estimate_offset(samples)
+
+
+def fire_shift_seconds(estimate):
+    """발사 시각 보정량(초, 서버 − 로컬). 상한을 넘는 추정은 버린다."""
+    if estimate is None:
+        return 0.0
+    if abs(estimate["offset_ms"]) > config.CLOCK_SYNC_MAX_SHIFT_MS:
+        print(f"[WARN] 서버 시계 오프셋 {estimate['offset_ms']:+.0f}ms가 상한 "
+              f"{config.CLOCK_SYNC_MAX_SHIFT_MS}ms를 넘어 보정하지 않습니다.")
+        return 0.0
+    return estimate["offset_ms"] / 1000
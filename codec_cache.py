@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+응답 디코딩 코덱 캐시 — 경로별로 맞았던 코덱을 기억해 한 번에 디코드한다
+
+사이트는 EUC-KR을 선언하지만 일부 페이지에 CP949 확장 문자나 UTF-8 바이트가
+섞여 있어, 응답마다 euc-kr → cp949 → utf-8 순으로 시도해 왔다. 앞 코덱이 실패하면
+실패 지점까지 본문을 다시 훑으므로 같은 경로에서 매번 같은 낭비가 반복된다.
+
+경로(URL path)별로 마지막으로 성공한 코덱을 기억해 다음 응답은 그 코덱으로 먼저
+디코드하고, 실패할 때만 나머지 코덱을 같은 순서로 시도한다(성공한 코덱으로 갱신).
+모두 실패하면 utf-8 replace로 디코드한다 (기존 동작과 같음).
+
+reservation_async와 reservation_http가 프로세스 전역 인스턴스 하나(CACHE)를
+공유한다. http 엔진은 스레드 풀에서 호출하므로 갱신은 잠금 안에서 한다.
+"""
+
+import threading
+
+CODECS = ("euc-kr", "cp949", "utf-8")
+REPLACE = "utf-8-replace"
+
+
+class CodecCache:
+    """경로 → 코덱 캐시와 코덱별 성공 집계."""
+
+    def __init__(self, codecs=CODECS):
+        self.codecs = codecs
+        self._by_path = {}
+        self._lock = threading.Lock()
+        self.wins = {}      # 코덱 → 디코드 성공 횟수 (REPLACE 포함)
+        self.hits = 0       # 캐시된 코덱으로 한 번에 성공
+        self.misses = 0     # 캐시된 코덱이 실패해 다른 코덱으로 폴백
+
+    def decode(self, path, raw):
+        path = path or "/"
+        cached = self._by_path.get(path)
+        if cached is not None:
+            try:
+                text = raw.decode(cached)
+            except UnicodeDecodeError:
+                pass
+            else:
+                self._count(cached, hit=True)
+                return text
+
+        for enc in self.codecs:
+            if enc == cached:
+                continue
+            try:
+                text = raw.decode(enc)
+            except UnicodeDecodeError:
+                continue
+            self._count(enc, path=path, miss=cached is not None)
+            return text
+
+        self._count(REPLACE, miss=cached is not None)
+        return raw.decode("utf-8", errors="replace")
+
+    def _count(self, codec, path=None, hit=False, miss=False):
+        with self._lock:
+            self.wins[codec] = self.wins.get(codec, 0) + 1
+            if hit:
+                self.hits += 1
+            if miss:
+                self.misses += 1
+            if path is not None:
+                self._by_path[path] = codec
+
+    def stats(self):
+        with self._lock:
+            return {
+                "paths": dict(sorted(self._by_path.items())),
+                "wins": dict(sorted(self.wins.items())),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+CACHE = CodecCache()
+
+
+def decode_body(path, raw):
+    """전역 캐시로 응답 본문을 디코드한다."""
+    return CACHE.decode(path, raw)
@@ -39,9 +39,9 @@ USER_PW = os.environ.get("TENNIS_USER_PW")
 # ============================================
 # 예약 대상 설정
 # ============================================
-# 사이트 URL
-MAIN_URL = "https://daehwa.gys.or.kr:451"
-TENNIS_RESERVATION_URL = "https://daehwa.gys.or.kr:451/rent/tennis_rent.php"
+# 사이트 URL (TENNIS_BASE_URL로 교체 가능 — 예: 모의 서버 http://localhost:18080)
+MAIN_URL = os.environ.get("TENNIS_BASE_URL", "https://daehwa.gys.or.kr:451").rstrip("/")
+TENNIS_RESERVATION_URL = f"{MAIN_URL}/rent/tennis_rent.php"
 
 
 # ============================================
@@ -155,21 +155,91 @@ SESSION_RETRY_TOTAL    = 3    # urllib3 소켓 레벨 재시도 횟수
 SESSION_RETRY_BACKOFF  = 0.5  # urllib3 재시도 백오프 계수
 SESSION_POOL_SIZE      = 10   # 연결 풀 크기
 
+# HTML 추출 엔진 (html_extract.py): "fast"(정규식 태그 스캐너, 실패 시 bs4 폴백) | "bs4"
+HTML_PARSER            = os.environ.get("TENNIS_HTML_PARSER", "fast")
+# 정각 발사 구간의 HTML 파싱 오프로드: "off"(이벤트 루프에서 직접) | "thread" | "process"
+PARSE_OFFLOAD          = os.environ.get("TENNIS_PARSE_OFFLOAD", "off")
+PARSE_WORKERS          = int(os.environ.get("TENNIS_PARSE_WORKERS", 2))  # 오프로드 풀 크기
+
+# 응답 스트리밍 판정 (stream_scan.py): apply/proc 응답을 청크 단위로 훑다가 useForm 블록·
+# 결과 alert가 도착하면 나머지 본문을 기다리지 않는다 (남은 본문은 백그라운드에서 드레인).
+STREAM_SCAN            = os.environ.get("TENNIS_STREAM_SCAN", "1") == "1"
+
+# 로그인 세션 풀 (session_pool.py): 지난 실행의 쿠키를 sessions/ 에서 불러와 재사용
+SESSION_REUSE          = os.environ.get("TENNIS_SESSION_REUSE", "1") == "1"
+SESSION_MAX_AGE_HOURS  = float(os.environ.get("TENNIS_SESSION_MAX_AGE_HOURS", 6))  # 이보다 오래된 쿠키는 검증 없이 폐기
+
+# 연결 공유 (reservation_async): 모든 봇이 TCPConnector 하나(keep-alive 풀)를 나눠 쓴다.
+# 쿠키 저장소는 봇(세션)마다 따로 유지되므로 PHP 세션은 섞이지 않는다.
+SHARED_CONNECTOR       = os.environ.get("TENNIS_SHARED_CONNECTOR", "0") == "1"
+
+# DNS 고정 (dns_pin.py): 로그인 직전 사이트 호스트를 한 번 해석하고 주소별 TCP 연결
+# RTT를 재서 가장 빠른 주소로 실행 내내 연결한다 (정각 발사 경로에서 DNS 조회 제거).
+DNS_PIN                = os.environ.get("TENNIS_DNS_PIN", "1") == "1"
+DNS_PIN_PROBES         = int(os.environ.get("TENNIS_DNS_PIN_PROBES", 3))  # 주소당 연결 측정 횟수 (최솟값 사용)
+
+# 연결 유지 (keepalive.py): 서버 유휴 연결 종료 시간을 측정해 정각 직전 핑 간격을 정한다.
+# 끄면(0) 고정 재예열(남은 20초/4초)만 쓴다.
+KEEPALIVE              = os.environ.get("TENNIS_KEEPALIVE", "1") == "1"
+KEEPALIVE_PING_PATH    = os.environ.get("TENNIS_KEEPALIVE_PING_PATH", "/css/common.css")  # 정적 경로 (PHP 세션 무관)
+KEEPALIVE_DEFAULT_IDLE_S = float(os.environ.get("TENNIS_KEEPALIVE_DEFAULT_IDLE_S", 3))  # 측정 전 가정값
+KEEPALIVE_SAFETY       = float(os.environ.get("TENNIS_KEEPALIVE_SAFETY", 0.6))     # 핑 간격 = 유휴 종료 × 이 값
+KEEPALIVE_WINDOW_S     = float(os.environ.get("TENNIS_KEEPALIVE_WINDOW_S", 20))    # 정각 전 핑 구간 (초)
+
+# 정각 발사 헤징 (hedge.py): apply/proc 응답이 임계값 안에 오지 않으면 그림자 세션으로
+# 같은 예약을 한 번 더 진행하고 먼저 성공한 쪽을 채택한다. 켜면 예약마다 로그인 세션이 2개.
+HEDGE                  = os.environ.get("TENNIS_HEDGE", "0") == "1"
+HEDGE_PERCENTILE       = float(os.environ.get("TENNIS_HEDGE_PERCENTILE", 90))  # 임계값 = 최근 응답 시간의 백분위수
+HEDGE_DELAY_MS         = float(os.environ.get("TENNIS_HEDGE_DELAY_MS", 800))   # 표본 부족 시 고정 임계값
+HEDGE_MIN_SAMPLES      = int(os.environ.get("TENNIS_HEDGE_MIN_SAMPLES", 5))
+HEDGE_MAX              = int(os.environ.get("TENNIS_HEDGE_MAX", 2))            # 실행당 헤지 체인 상한 (단일 IP 폭주 방지)
+
+# 서버 시계 동기화 (clock_sync.py): 로그인 직후 사이트 Date 헤더로 오프셋을 추정해
+# 로컬 시계가 아니라 서버 시계 기준 정각에 발사한다.
+CLOCK_SYNC             = os.environ.get("TENNIS_CLOCK_SYNC", "1") == "1"
+CLOCK_SYNC_SAMPLES     = int(os.environ.get("TENNIS_CLOCK_SYNC_SAMPLES", 16))         # 샘플 수 (약 1초 간격)
+CLOCK_SYNC_MAX_SHIFT_MS = int(os.environ.get("TENNIS_CLOCK_SYNC_MAX_SHIFT_MS", 3000))  # 이보다 큰 추정값은 무시
+
 # ============================================
 # 예약/검색 상수
 # ============================================
 ALL_COURTS            = [1, 2, 3, 4]
 AVAILABLE_HOURS       = [6, 8, 10, 12, 14, 16, 18, 20]
 SEARCH_DEFAULT_HOURS  = [6, 8, 10]
+SEARCH_CONCURRENCY    = int(os.environ.get("TENNIS_SEARCH_CONCURRENCY", 4))     # 빈자리 검색 동시 페이지 조회 수 (search_pipeline.py)
+SEARCH_RATE           = float(os.environ.get("TENNIS_SEARCH_RATE", 10))         # 빈자리 검색 세션당 초당 요청 상한 (0=제한 없음)
+SEARCH_SHARDS         = int(os.environ.get("TENNIS_SEARCH_SHARDS", 1))          # 빈자리 검색에 쓸 계정 수 (2 이상 = load_accounts() 계정으로 분할 조회)
+AVAIL_CACHE           = os.environ.get("TENNIS_AVAIL_CACHE", "1") == "1"       # 빈자리 조회 캐시 (avail_cache.py, cache/availability.sqlite3)
+AVAIL_CACHE_MAX_AGE_S = int(os.environ.get("TENNIS_AVAIL_CACHE_MAX_AGE_S", 60))  # 이보다 새 캐시 항목은 다시 조회하지 않음 (초)
+
+# 취소분 감시 모드 (watcher.py, main.py --watch)
+WATCH_MIN_INTERVAL_S  = float(os.environ.get("TENNIS_WATCH_MIN_INTERVAL_S", 5))   # 변화 감지 직후 조회 간격(초)
+WATCH_MAX_INTERVAL_S  = float(os.environ.get("TENNIS_WATCH_MAX_INTERVAL_S", 60))  # 조용할 때 최대 조회 간격(초)
+WATCH_BACKOFF         = float(os.environ.get("TENNIS_WATCH_BACKOFF", 1.5))        # 변화 없는 주기마다 간격 배수
+WATCH_VERIFY_S        = int(os.environ.get("TENNIS_WATCH_VERIFY_S", 300))         # 로그인 상태 확인 주기(초)
+WATCH_MAX_ATTEMPTS    = int(os.environ.get("TENNIS_WATCH_MAX_ATTEMPTS", 3))       # 같은 슬롯 신청 실패 한도 (넘으면 감시 제외)
 LOGIN_ADVANCE_MINUTES = int(os.environ.get("TENNIS_LOGIN_ADVANCE_MINUTES", 10))  # 예약 오픈 N분 전에 로그인 시작
 SLOTS_PER_ACCOUNT     = int(os.environ.get("TENNIS_SLOTS_PER_ACCOUNT", 4))       # 재배치 시 계정당 배정 슬롯 수
 FIRE_JITTER_MS        = int(os.environ.get("TENNIS_FIRE_JITTER_MS", 150))        # 정각 발사 지터 상한 ms (0=비활성)
+FIRE_SPIN_MS          = float(os.environ.get("TENNIS_FIRE_SPIN_MS", 2))         # 정각 직전 바쁜 대기 구간 ms (utils.FireScheduler)
+# 발사 웨이브 계획 (fire_plan.py): "" = FIRE_JITTER_MS 사용 | "0:4,80:4,160:*" | "auto"(이력 기반)
+FIRE_PLAN             = os.environ.get("TENNIS_FIRE_PLAN", "")
+FIRE_PLAN_MIN_SAMPLES = int(os.environ.get("TENNIS_FIRE_PLAN_MIN_SAMPLES", 5))   # auto 모드 최소 이력 표본 수
 
 # ============================================
 # API 서버 설정
 # ============================================
 API_HOST = os.environ.get("API_HOST", "0.0.0.0")
 API_PORT = int(os.environ.get("API_PORT", 5000))
+API_CONNECTION_LIMIT = int(os.environ.get("API_CONNECTION_LIMIT", 64))   # 프로세스 공용 커넥터 연결 상한
+# 로그인 세션 캐시 (session_cache.py): user_id별 로그인된 세션을 요청 간 재사용
+API_SESSION_TTL_S = int(os.environ.get("API_SESSION_TTL_S", 600))         # 로그인 세션 재사용 최대 시간(초)
+API_SESSION_CACHE_SIZE = int(os.environ.get("API_SESSION_CACHE_SIZE", 32))   # 캐시할 계정 수 (초과 시 LRU 제거)
+API_SESSION_VALIDATE_S = int(os.environ.get("API_SESSION_VALIDATE_S", 60))   # 이보다 오래 안 쓴 세션은 빌려줄 때 로그인 상태 확인
+# 비동기 작업 (jobs.py): 요청 본문 "async": true → job id 즉시 반환, 백그라운드 실행
+API_MAX_RUNNING_JOBS = int(os.environ.get("API_MAX_RUNNING_JOBS", 4))     # 동시에 실행하는 작업 수 (나머지는 대기)
+API_JOBS_PER_ACCOUNT = int(os.environ.get("API_JOBS_PER_ACCOUNT", 2))     # 계정별 대기+실행 작업 상한
+API_JOB_KEEP         = int(os.environ.get("API_JOB_KEEP", 200))           # 보관할 끝난 작업 수
 
 
 # ============================================
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+DNS 사전 해석 + 대상 IP 고정 — 정각 발사 경로에서 DNS 조회를 없앤다
+
+커넥터는 새 연결을 맺을 때마다 호스트명을 해석한다 (aiohttp DNS 캐시 TTL 10초).
+정각에 리졸버가 느리거나 실패하면 그 시간이 새 연결 지연에 그대로 더해진다.
+
+  1. 로그인 직전 한 번 사이트 호스트명을 해석한다 (getaddrinfo, 전체 주소 family).
+  2. 돌려받은 주소마다 TCP 연결을 DNS_PIN_PROBES회 맺어 최소 RTT를 잰다.
+  3. 가장 빠른 주소를 맨 앞(고정)에, 나머지를 RTT 순 폴백으로 실행 내내 캐시한다.
+     커넥터는 첫 주소부터 연결하므로 정각 연결은 고정 주소로 간다.
+     (호스트명은 그대로라 TLS SNI·Host 헤더는 바뀌지 않는다.)
+
+다른 호스트는 처음 한 번만 해석해 같은 방식으로 캐시한다.
+
+설정: config.DNS_PIN, DNS_PIN_PROBES
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from urllib.parse import urlsplit
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import ThreadedResolver
+
+import config
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+async def _connect_rtt_ms(addr, port, timeout):
+    """TCP 연결 1회 소요 시간(ms). 실패 시 None."""
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(addr, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    rtt = (time.perf_counter() - t0) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return rtt
+
+
+class PinnedResolver(AbstractResolver):
+    """한 번 해석한 결과를 실행 내내 재사용하고, pin()한 호스트는 최저 RTT 주소를 앞세운다.
+
+    여러 커넥터(봇별·공유·시계 동기화·keep-alive 측정)에 같은 인스턴스를 넘겨 쓴다.
+    커넥터는 외부에서 받은 리졸버를 닫지 않으므로 close()는 실행 끝에 직접 부른다.
+    """
+
+    def __init__(self):
+        self._resolver = ThreadedResolver()
+        self._cache = {}        # (host, port) → ResolveResult 목록 (고정 주소가 맨 앞)
+        self.pinned = None      # pin() 요약 (summary())
+
+    async def _lookup(self, host, port):
+        key = (host, port)
+        if key not in self._cache:
+            self._cache[key] = await self._resolver.resolve(host, port, socket.AF_UNSPEC)
+        return self._cache[key]
+
+    async def pin(self, url, probes=None):
+        """url 호스트를 해석하고 주소별 TCP 연결 RTT를 재서 가장 빠른 주소를 고정한다.
+
+        IP 주소 URL이면 아무것도 하지 않는다. 해석 실패 시 예외 대신 None을 돌려주고
+        (커넥터가 평소처럼 직접 해석) 이후 resolve()가 다시 시도한다.
+        """
+        parts = urlsplit(url)
+        host = parts.hostname
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        if not host or _is_ip(host):
+            return None
+        probes = config.DNS_PIN_PROBES if probes is None else probes
+
+        t0 = time.perf_counter()
+        try:
+            infos = await self._resolver.resolve(host, port, socket.AF_UNSPEC)
+        except OSError as e:
+            print(f"[WARN] DNS 해석 실패 ({host}): {e} — 발사 시 다시 해석")
+            return None
+        dns_ms = (time.perf_counter() - t0) * 1000
+
+        async def probe(info):
+            rtts = []
+            for _ in range(probes):
+                rtt = await _connect_rtt_ms(info["host"], info["port"], config.CONNECTION_TIMEOUT)
+                if rtt is not None:
+                    rtts.append(rtt)
+            return min(rtts) if rtts else None
+
+        rtts = await asyncio.gather(*[probe(info) for info in infos])
+        # 연결되는 주소를 RTT 순으로, 실패한 주소는 해석 순서대로 뒤에 둔다
+        ranked = sorted(zip(infos, rtts),
+                        key=lambda p: (p[1] is None, p[1] if p[1] is not None else 0))
+        self._cache[(host, port)] = [info for info, _ in ranked]
+
+        best, best_rtt = ranked[0]
+        self.pinned = {
+            "host": host,
+            "addr": best["host"],
+            "rtt_ms": None if best_rtt is None else round(best_rtt, 2),
+            "dns_ms": round(dns_ms, 2),
+            "candidates": [{"addr": info["host"],
+                            "rtt_ms": None if rtt is None else round(rtt, 2)}
+                           for info, rtt in ranked],
+        }
+        if best_rtt is None:
+            print(f"[WARN] DNS 고정: {host}의 주소 {len(infos)}개 모두 연결 실패 — 해석 순서 유지")
+        else:
+            print(f"[DNS] {host} → {best['host']} 고정 (연결 RTT {best_rtt:.1f}ms, "
+                  f"후보 {len(infos)}개, 해석 {dns_ms:.1f}ms)")
+        return self.pinned
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        hosts = await self._lookup(host, port)
+        if family in (socket.AF_INET, socket.AF_INET6):
+            hosts = [h for h in hosts if h["family"] == family]
+        return [dict(h) for h in hosts]
+
+    async def close(self):
+        await self._resolver.close()
+
+    def summary(self):
+        return self.pinned
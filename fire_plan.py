@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+정각 발사 웨이브 계획
+
+FIRE_JITTER_MS는 모든 워커에 [0, N]ms 균등 지연을 주는 방식이라 우선순위도,
+서버가 실제로 열리는 시점도 반영하지 못한다. 발사 계획은 예약 작업을
+설정 순서(= 우선순위)대로 웨이브에 나눠 담고, 웨이브마다 정각 기준 오프셋에
+발사한다.
+
+계획 문자열 (config.FIRE_PLAN, 환경변수 TENNIS_FIRE_PLAN):
+    ""                  미사용 — 기존 FIRE_JITTER_MS 균등 지터
+    "0:4,80:4,160:*"    "오프셋ms:동시발사수" 목록. "*"는 나머지 전부.
+                        작업이 용량보다 많으면 남는 작업은 마지막 웨이브에 붙는다.
+    "auto"              logs/timing_*.jsonl 이력에서 서버가 apply.php를 실제로
+                        받아들이기 시작한 시점(정각 대비 ms) 분포를 구해
+                        10/50/90 백분위수를 웨이브 오프셋으로 쓴다.
+                        이력이 FIRE_PLAN_MIN_SAMPLES개 미만이면 "0:*".
+"""
+
+import statistics
+
+import config
+from timing_log import accepted_apply_delay_ms, iter_timing_records
+
+AUTO_QUANTILES = (10, 50, 90)
+
+
+def parse_plan(spec):
+    """"오프셋ms:동시발사수,..." → [(offset_ms, count or None)] (오프셋 순 정렬).
+
+    Raises:
+        ValueError: 형식 오류
+    """
+    waves = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        offset_str, sep, count_str = part.partition(":")
+        try:
+            offset = float(offset_str)
+            count = None if count_str.strip() in ("", "*") else int(count_str)
+        except ValueError:
+            raise ValueError(
+                f"[설정 오류] TENNIS_FIRE_PLAN 웨이브 '{part}'\n"
+                f"  → 올바른 형식: 오프셋ms:동시발사수  (예: 0:4,80:4,160:*)"
+            )
+        if offset < 0 or (count is not None and count < 1):
+            raise ValueError(f"[설정 오류] TENNIS_FIRE_PLAN 웨이브 '{part}': 음수/0 불가")
+        waves.append((offset, count))
+    if not waves:
+        raise ValueError("[설정 오류] TENNIS_FIRE_PLAN: 웨이브가 없습니다")
+    return sorted(waves, key=lambda w: w[0])
+
+
+def collect_accept_delays(records=None):
+    """이력 레코드에서 apply.php 수락 지연(ms) 표본을 모은다."""
+    records = iter_timing_records() if records is None else records
+    delays = []
+    for record in records:
+        delay = accepted_apply_delay_ms(record)
+        if delay is not None:
+            delays.append(delay)
+    return delays
+
+
+def auto_plan(delays, min_samples=None):
+    """수락 지연 표본으로 웨이브를 만든다. 표본 부족 시 None.
+
+    백분위수 오프셋마다 같은 몫의 작업을 배정한다 (count=None → 균등 분배).
+    음수 지연(정각 전에 이미 열림)은 0으로 자른다.
+    """
+    min_samples = config.FIRE_PLAN_MIN_SAMPLES if min_samples is None else min_samples
+    if len(delays) < max(min_samples, 1):
+        return None
+    if len(delays) == 1:
+        cuts = [delays[0]]
+    else:
+        percentiles = statistics.quantiles(delays, n=100, method="inclusive")
+        cuts = [percentiles[q - 1] for q in AUTO_QUANTILES]
+    offsets = sorted({float(max(0, round(c))) for c in cuts})
+    return [(o, None) for o in offsets]
+
+
+class FirePlan:
+    """작업 인덱스별 발사 오프셋.
+
+    waves의 count가 None인 웨이브는 작업을 균등 분배받는다 (auto 모드),
+    단 parse_plan 형식의 "*"는 앞 웨이브가 다 차고 남은 작업 전부를 받는다.
+    """
+
+    def __init__(self, waves, source):
+        self.waves = waves
+        self.source = source    # "config" | "config-fallback" | "auto" | "auto-fallback"
+
+    def assign(self, n_jobs):
+        """작업 n개의 [(wave_idx, offset_ms)] — 작업 순서(우선순위) 그대로."""
+        counts = [c for _, c in self.waves]
+        if all(c is None for c in counts):
+            # 균등 분배: 앞 웨이브부터 올림 몫
+            counts, left = [], n_jobs
+            for i in range(len(self.waves)):
+                share = -(-left // (len(self.waves) - i))
+                counts.append(share)
+                left -= share
+
+        assigned = []
+        for idx, ((offset, _), count) in enumerate(zip(self.waves, counts)):
+            take = n_jobs - len(assigned) if count is None else count
+            assigned += [(idx, offset)] * min(take, n_jobs - len(assigned))
+        last = len(self.waves) - 1
+        assigned += [(last, self.waves[last][0])] * (n_jobs - len(assigned))
+        return assigned
+
+    def describe(self):
+        if all(c is None for _, c in self.waves):
+            return f"{self.source}: " + ", ".join(f"+{o:.0f}ms" for o, _ in self.waves) + " (균등 분배)"
+        waves = ", ".join(f"+{o:.0f}ms×{'*' if c is None else c}" for o, c in self.waves)
+        return f"{self.source}: {waves}"
+
+
+def build_fire_plan(spec=None):
+    """config.FIRE_PLAN(또는 spec)으로 FirePlan을 만든다. 미사용("")이면 None.
+
+    형식이 잘못됐으면 경고를 출력하고 정각 일괄 발사("0:*") 계획을 돌려준다.
+    """
+    spec = (config.FIRE_PLAN if spec is None else spec).strip()
+    if not spec:
+        return None
+    if spec.lower() == "auto":
+        delays = collect_accept_delays()
+        waves = auto_plan(delays)
+        if waves is None:
+            print(f"[WARN] 발사 계획 auto: 이력 표본 {len(delays)}개 — "
+                  f"최소 {config.FIRE_PLAN_MIN_SAMPLES}개 필요, 정각 일괄 발사로 대체")
+            return FirePlan([(0.0, None)], "auto-fallback")
+        print(f"[INFO] 발사 계획 auto: 이력 표본 {len(delays)}개 "
+              f"(수락 지연 중앙값 {statistics.median(delays):.0f}ms)")
+        return FirePlan(waves, "auto")
+    try:
+        waves = parse_plan(spec)
+    except ValueError as e:
+        # 정각 직전(로그인 후)에 실행을 멈추지 않도록 경고만 하고 정각 일괄 발사로 대체
+        print(f"[WARN] {e}\n  → 정각 일괄 발사로 대체")
+        return FirePlan([(0.0, None)], "config-fallback")
+    return FirePlan(waves, "config")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+정각 발사 헤징 — 느린 apply/proc 응답 하나가 예약 전체를 붙잡지 않게 한다.
+
+_request_with_retry는 타임아웃·오류가 난 뒤에야 재시도한다. 헤징 모드에서는
+주 세션의 apply.php / proc.php 요청이 지연 임계값(최근 응답 시간의 백분위수)
+안에 응답하지 않으면, 미리 로그인·프리페치해 둔 그림자 세션으로 같은 예약을
+한 번 더 진행하고 먼저 성공한 쪽을 채택한 뒤 나머지를 취소한다.
+
+요청 단위가 아니라 예약 체인 단위로 헤징하는 이유:
+  apply.php가 PHP 세션에 신청 상태를 남기고 proc.php가 그 상태를 읽는다.
+  같은 세션으로 같은 요청을 두 번 보내면 세션 상태가 덮어쓰여
+  "(1-1) 정상적인 방법으로 신청" 오류가 나므로(run_reservation_async 참조),
+  헤지는 반드시 독립 로그인 세션에서 apply → proc 전체를 다시 밟는다.
+
+예산: HedgeBudget이 실행당 헤지 총량을 제한해 단일 IP 요청 폭주를 막는다.
+
+설정: config.HEDGE, HEDGE_PERCENTILE, HEDGE_DELAY_MS, HEDGE_MIN_SAMPLES, HEDGE_MAX
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import config
+
+CRITICAL_PATHS = ("/rent/rent_period_apply.php", "/rent/rent_period_proc.php")
+
+_POLL_INTERVAL = 0.005  # 주 세션의 진행 중 요청 확인 간격 (초)
+
+
+class LatencyTracker:
+    """경로별 최근 응답 시간으로 헤지 지연 임계값을 정한다.
+
+    표본이 HEDGE_MIN_SAMPLES개 미만이면 고정값 HEDGE_DELAY_MS를 쓴다
+    (정각 첫 웨이브는 아직 관측값이 없다).
+    """
+
+    def __init__(self, percentile=None, fallback_ms=None, min_samples=None,
+                 window=200):
+        self.percentile = percentile if percentile is not None else config.HEDGE_PERCENTILE
+        self.fallback_ms = fallback_ms if fallback_ms is not None else config.HEDGE_DELAY_MS
+        self.min_samples = min_samples if min_samples is not None else config.HEDGE_MIN_SAMPLES
+        self._samples = {}
+        self._window = window
+
+    def observe(self, path, elapsed_ms):
+        if path in CRITICAL_PATHS:
+            self._samples.setdefault(path, deque(maxlen=self._window)).append(elapsed_ms)
+
+    def delay_ms(self, path):
+        samples = self._samples.get(path)
+        if not samples or len(samples) < self.min_samples:
+            return self.fallback_ms
+        ordered = sorted(samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[idx]
+
+
+class HedgeBudget:
+    """실행 전체에서 보낼 수 있는 헤지 체인 수 상한."""
+
+    def __init__(self, limit=None):
+        self.limit = limit if limit is not None else config.HEDGE_MAX
+        self.used = 0
+
+    def try_acquire(self):
+        if self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+
+async def _wait_slow_request(bot, tracker):
+    """bot의 apply/proc 요청이 임계값을 넘겨 진행 중이면 (path, 임계 ms)를 반환한다."""
+    while True:
+        inflight = bot.inflight
+        if inflight is None or inflight[0] not in CRITICAL_PATHS:
+            await asyncio.sleep(_POLL_INTERVAL)
+            continue
+        path, t_start = inflight
+        delay_ms = tracker.delay_ms(path)
+        remaining = t_start + delay_ms / 1000 - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        if bot.inflight is inflight:
+            return path, delay_ms
+
+
+async def _cancel(*tasks):
+    for t in tasks:
+        if t is not None and not t.done():
+            t.cancel()
+    await asyncio.gather(*[t for t in tasks if t is not None],
+                         return_exceptions=True)
+
+
+async def hedged_reserve(primary, shadow, tracker, budget, target_date, target_hour,
+                         court_number, test_mode=False, worker_id=None):
+    """primary.reserve()를 실행하고, 느리면 shadow로 같은 예약을 헤징한다.
+
+    Returns:
+        (success, message, info): info = {"hedged", "winner", "trigger_path",
+                                          "trigger_ms", "wait_ms"}
+    """
+    args = (target_date, target_hour, court_number, test_mode, worker_id)
+    info = {"hedged": False, "winner": "primary"}
+    primary_task = asyncio.create_task(primary.reserve(*args))
+    trigger = asyncio.create_task(_wait_slow_request(primary, tracker))
+    hedge_task = None
+    t_fire = time.monotonic()
+    try:
+        await asyncio.wait({primary_task, trigger}, return_when=asyncio.FIRST_COMPLETED)
+        if primary_task.done() or not budget.try_acquire():
+            success, message = await primary_task
+            return success, message, info
+
+        info["trigger_path"], info["trigger_ms"] = trigger.result()
+        info["hedged"] = True
+        info["wait_ms"] = round((time.monotonic() - t_fire) * 1000, 1)
+        primary._log(f"[HEDGE] {info['trigger_path']} 응답 지연 "
+                     f"(>{info['trigger_ms']:.0f}ms) — 그림자 세션으로 헤지 발사", worker_id)
+        shadow.fire_window = True
+        hedge_task = asyncio.create_task(shadow.reserve(*args))
+
+        # 먼저 성공한 쪽 채택. 한쪽이 실패해도 다른 쪽 결과를 기다린다 —
+        # 헤지의 "이미 예약 있음"은 주 세션이 서버에서 이미 성공했다는 뜻일 수 있다.
+        outcomes = {}
+        pending = {primary_task, hedge_task}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                try:
+                    outcomes[t] = t.result()
+                except Exception as e:
+                    outcomes[t] = (False, f"예외 발생: {e}")
+                if outcomes[t][0]:
+                    info["winner"] = "primary" if t is primary_task else "hedge"
+                    return (*outcomes[t], info)
+
+        info["winner"] = None
+        return (*outcomes[primary_task], info)
+    finally:
+        await _cancel(trigger, primary_task, hedge_task)
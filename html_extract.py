@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+예약 페이지 HTML 추출 엔진
+
+정각 직후 크리티컬 경로에서 필요한 정보는 세 가지뿐이다:
+  - tennis_rent.php 의 rent_chk[] 체크박스 (예약 가능 시간대)
+  - tennis_rent.php 의 DocumentForm 필드
+  - rent_period_apply.php 의 useForm 필드
+
+BeautifulSoup은 페이지 전체를 트리로 만들어 이벤트 루프를 수 ms씩 붙잡는다.
+"fast" 엔진은 필요한 태그(tr/input/form/select/option/textarea)만 정규식으로
+훑어 같은 결과를 만든다. 파싱 중 예외가 나거나 폼을 찾지 못하면
+BeautifulSoup("bs4" 엔진)으로 폴백한다.
+
+엔진 선택: config.HTML_PARSER ("fast" | "bs4", 환경변수 TENNIS_HTML_PARSER)
+"""
+
+import re
+from html import unescape
+
+from bs4 import BeautifulSoup
+
+import config
+
+# 관심 태그만 매칭. 속성 값 안의 '>'는 이 사이트에서 쓰이지 않는다.
+_TAG_RE = re.compile(
+    r"<(/?)(tr|input|form|select|option|textarea)\b([^>]*)>", re.IGNORECASE
+)
+_ATTR_RE = re.compile(
+    r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+)))?"""
+)
+_STRIP_TAGS_RE = re.compile(r"<[^>]*>")
+_FORM_END_RE = re.compile(r"</form\s*>", re.IGNORECASE)
+_TEXTAREA_END_RE = re.compile(r"</textarea\s*>", re.IGNORECASE)
+
+SLOT_TAKEN_MARK = "일정있음"
+
+
+def _attrs(raw):
+    """태그 속성 문자열을 dict로 변환한다 (html.parser와 같이 이름 소문자화,
+    값 없는 속성은 "", 중복 속성은 마지막 값 우선)."""
+    attrs = {}
+    for m in _ATTR_RE.finditer(raw):
+        value = m.group(2)
+        if value is None:
+            value = m.group(3)
+        if value is None:
+            value = m.group(4)
+        if value is None:
+            value = ""
+        elif "&" in value:
+            value = unescape(value)
+        attrs[m.group(1).lower()] = value
+    return attrs
+
+
+def _slot_entry(value):
+    return {
+        "value": value,
+        "start": f"{value[:2]}:{value[2:4]}",
+        "end": f"{value[4:6]}:{value[6:8]}",
+        "start_hour": int(value[:2]),
+    }
+
+
+# ============================================================
+# fast 엔진 (정규식 태그 스캐너)
+# ============================================================
+
+def _slots_fast(html):
+    """<tr>마다 첫 rent_chk[] 체크박스와 행 범위를 구해 슬롯 목록을 만든다.
+
+    BeautifulSoup 경로와 같은 의미를 유지한다: 레이아웃용 바깥 <tr>도
+    하나의 행으로 취급하고(중첩 테이블), 행의 첫 체크박스만 본다.
+    """
+    rows = []    # [start, end, checkbox_attrs] — <tr> 시작 순서
+    stack = []
+    for m in _TAG_RE.finditer(html):
+        tag = m.group(2).lower()
+        if tag == "tr":
+            if m.group(1):
+                if stack:
+                    stack.pop()[1] = m.start()
+            else:
+                row = [m.start(), None, None]
+                rows.append(row)
+                stack.append(row)
+        elif tag == "input" and not m.group(1) and stack and "rent_chk" in m.group(3):
+            attrs = _attrs(m.group(3))
+            if attrs.get("name") != "rent_chk[]":
+                continue
+            for row in stack:
+                if row[2] is None:
+                    row[2] = attrs
+
+    available = []
+    for start, end, checkbox in rows:
+        if checkbox is None or checkbox.get("disabled"):
+            continue
+        segment = html[start:end]
+        # 원문에 표식이 있을 때만 태그를 벗겨 텍스트 기준으로 재확인
+        if (SLOT_TAKEN_MARK in segment
+                and SLOT_TAKEN_MARK in unescape(_STRIP_TAGS_RE.sub("", segment))):
+            continue
+        value = checkbox.get("value", "")
+        if len(value) >= 8:
+            available.append(_slot_entry(value))
+    return available
+
+
+def _form_span(html, form_name):
+    """name이 form_name인 첫 <form>의 본문 범위 (start, end). 없으면 None."""
+    for m in _TAG_RE.finditer(html):
+        if m.group(1) or m.group(2).lower() != "form":
+            continue
+        if _attrs(m.group(3)).get("name") == form_name:
+            close = _FORM_END_RE.search(html, m.end())
+            return m.end(), close.start() if close else len(html)
+    return None
+
+
+def _document_form_fast(html):
+    span = _form_span(html, "DocumentForm")
+    if span is None:
+        return None
+    start, end = span
+
+    form_data = {}
+    selects = []          # [name, selected_value or None]
+    current = None
+    for m in _TAG_RE.finditer(html, start, end):
+        closing, tag = m.group(1), m.group(2).lower()
+        if tag == "input" and not closing:
+            attrs = _attrs(m.group(3))
+            if attrs.get("name"):
+                form_data[attrs["name"]] = attrs.get("value", "")
+        elif tag == "select":
+            if closing:
+                current = None
+            else:
+                current = [_attrs(m.group(3)).get("name"), None]
+                selects.append(current)
+        elif tag == "option" and not closing and current is not None and current[1] is None:
+            attrs = _attrs(m.group(3))
+            if "selected" in attrs:
+                current[1] = attrs.get("value", "")
+
+    # BeautifulSoup 경로와 같이 input 수집 후 select 값으로 덮어쓴다
+    for name, value in selects:
+        if name and value is not None:
+            form_data[name] = value
+    return form_data
+
+
+def _use_form_fast(html):
+    span = _form_span(html, "useForm")
+    if span is None:
+        return None
+    start, end = span
+
+    fields = {}
+    for m in _TAG_RE.finditer(html, start, end):
+        if m.group(1):
+            continue
+        tag = m.group(2).lower()
+        if tag == "input":
+            attrs = _attrs(m.group(3))
+            name, value = attrs.get("name"), attrs.get("value", "")
+        elif tag == "textarea":
+            name = _attrs(m.group(3)).get("name")
+            close = _TEXTAREA_END_RE.search(html, m.end(), end)
+            value = html[m.end():close.start() if close else end]
+            if "&" in value:
+                value = unescape(value)
+        else:
+            continue
+        if name and value:
+            fields[name] = value
+    return fields
+
+
+# ============================================================
+# bs4 엔진 (폴백 / 기준 구현)
+# ============================================================
+
+def _slots_bs4(html):
+    available = []
+    soup = BeautifulSoup(html, "html.parser")
+    for row in soup.find_all("tr"):
+        checkbox = row.find("input", {"name": "rent_chk[]"})
+        if not checkbox or checkbox.get("disabled"):
+            continue
+        if SLOT_TAKEN_MARK in row.get_text():
+            continue
+        value = checkbox.get("value", "")
+        if len(value) >= 8:
+            available.append(_slot_entry(value))
+    return available
+
+
+def _document_form_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    doc_form = soup.find("form", {"name": "DocumentForm"})
+    if not doc_form:
+        return None
+
+    form_data = {
+        inp["name"]: inp.get("value", "")
+        for inp in doc_form.find_all("input")
+        if inp.get("name")
+    }
+    for select in doc_form.find_all("select"):
+        if select.get("name"):
+            selected = select.find("option", selected=True)
+            if selected:
+                form_data[select["name"]] = selected.get("value", "")
+    return form_data
+
+
+def _use_form_bs4(html):
+    soup = BeautifulSoup(html, "html.parser")
+    use_form = soup.find("form", {"name": "useForm"})
+    if not use_form:
+        return None
+
+    fields = {}
+    for inp in use_form.find_all(["input", "textarea"]):
+        if inp.get("name"):
+            val = (inp.get("value", "")
+                   if inp.name != "textarea" else inp.get_text())
+            if val:
+                fields[inp["name"]] = val
+    return fields
+
+
+ENGINES = {
+    "fast": (_slots_fast, _document_form_fast, _use_form_fast),
+    "bs4": (_slots_bs4, _document_form_bs4, _use_form_bs4),
+}
+
+
+def _run(kind, html, engine):
+    """engine으로 추출하고, fast 엔진이 실패(예외·폼 없음)하면 bs4로 재시도한다."""
+    funcs = ENGINES.get(engine or config.HTML_PARSER, ENGINES["fast"])
+    if funcs is ENGINES["bs4"]:
+        return funcs[kind](html)
+    try:
+        result = funcs[kind](html)
+    except Exception:
+        result = None
+    if result is None:
+        return ENGINES["bs4"][kind](html)
+    return result
+
+
+# ============================================================
+# 공개 API
+# ============================================================
+
+def extract_slots(html, engine=None):
+    """예약 가능 시간대 목록.
+
+    Returns:
+        list of dict: [{"value", "start", "end", "start_hour"}, ...]
+    """
+    return _run(0, html, engine)
+
+
+def extract_document_form(html, engine=None):
+    """DocumentForm 필드 dict (input 값 + select의 selected option). 폼이 없으면 None."""
+    return _run(1, html, engine)
+
+
+def extract_use_form(html, engine=None):
+    """useForm에서 값이 있는 input/textarea 필드 dict. 폼이 없으면 None."""
+    return _run(2, html, engine)
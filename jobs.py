@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+API 서버 비동기 작업(job) 관리
+
+/reserve(즉시 실행)나 한 달 치 /search-all은 수 분 걸릴 수 있어 HTTP 요청을 그동안
+열어 두면 n8n 타임아웃에 실행이 끊긴다. 요청 본문에 "async": true를 주면
+api_server가 작업을 여기에 넘기고 job id를 바로 돌려준다.
+
+  - 실행: 이벤트 루프 위 백그라운드 태스크. 동시에 도는 작업은 최대
+    API_MAX_RUNNING_JOBS개이고 나머지는 "queued"로 기다린다.
+  - 계정 제한: user_id별 대기·실행 중 작업은 API_JOBS_PER_ACCOUNT개까지
+    (초과 제출은 JobLimitError → 429).
+  - 조회: GET /jobs/<id> (상태·결과), GET /jobs/<id>/events (Server-Sent Events로
+    진행 이벤트 스트리밍, 지난 이벤트부터 재생).
+  - 보관: 끝난 작업은 최근 API_JOB_KEEP개만 남긴다.
+
+작업 함수는 job을 인자로 받는 코루틴 함수이며, job.emit()으로 진행 이벤트를 남긴다.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+import config
+
+ACTIVE = ("queued", "running")
+
+
+class JobLimitError(Exception):
+    """계정별 동시 작업 한도 초과."""
+
+
+class Job:
+    def __init__(self, kind, user_id, params=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.user_id = user_id
+        self.params = params or {}
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.events = []
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def emit(self, event_type, **data):
+        """진행 이벤트를 남기고 SSE 구독자를 깨운다."""
+        self.events.append({"seq": len(self.events), "type": event_type,
+                            "ts": round(time.time(), 3), **data})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_events(self, after, timeout):
+        """events[after:]가 생기거나 timeout초가 지날 때까지 기다린다."""
+        if len(self.events) > after:
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    @property
+    def done(self):
+        return self.status not in ACTIVE
+
+    def to_dict(self, with_result=True):
+        out = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "user_id": self.user_id,
+            "params": self.params,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "events": len(self.events),
+        }
+        if with_result:
+            out["result"] = self.result
+            out["error"] = self.error
+        return out
+
+
+class JobManager:
+    def __init__(self, max_running=None, per_account=None, keep=None):
+        self.max_running = max_running or config.API_MAX_RUNNING_JOBS
+        self.per_account = per_account or config.API_JOBS_PER_ACCOUNT
+        self.keep = keep or config.API_JOB_KEEP
+        self._slots = asyncio.Semaphore(self.max_running)
+        self._jobs = OrderedDict()
+
+    def active_for(self, user_id):
+        return sum(1 for j in self._jobs.values() if j.user_id == user_id and not j.done)
+
+    def submit(self, kind, user_id, func, params=None):
+        """작업을 등록하고 바로 돌려준다. func(job)은 결과 dict를 반환하는 코루틴 함수."""
+        if self.active_for(user_id) >= self.per_account:
+            raise JobLimitError(
+                f"계정 {user_id}의 진행 중 작업이 {self.per_account}개입니다. 끝난 뒤 다시 요청하세요.")
+        job = Job(kind, user_id, params)
+        self._jobs[job.id] = job
+        job.emit("queued")
+        job.task = asyncio.create_task(self._run(job, func))
+        job.task.add_done_callback(lambda _task, job=job: self._settle(job))
+        self._prune()
+        return job
+
+    async def _run(self, job, func):
+        try:
+            async with self._slots:
+                job.status = "running"
+                job.started = time.time()
+                job.emit("running")
+                job.result = await func(job)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+            print(f"[WARN] 작업 {job.id} ({job.kind}) 실패: {job.error}")
+        finally:
+            job.finished = time.time()
+            job.emit(job.status, **({"error": job.error} if job.error else {}))
+
+    @staticmethod
+    def _settle(job):
+        # 시작 전에 취소된 태스크는 _run 본문을 거치지 않는다
+        if not job.done:
+            job.status = "cancelled"
+            job.finished = time.time()
+            job.emit(job.status)
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.done]
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def list(self):
+        return [j.to_dict(with_result=False) for j in reversed(self._jobs.values())]
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.task.cancel()
+        return True
+
+    def stats(self):
+        statuses = {}
+        for job in self._jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {"max_running": self.max_running, "per_account": self.per_account,
+                "jobs": statuses}
+
+    async def close(self):
+        tasks = [j.task for j in self._jobs.values() if not j.done]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+연결 유지 — 서버 유휴 연결 종료 시간을 측정해 정각에 모든 봇의 연결이 살아 있게 한다
+
+고정 재예열 시점(남은 20초/4초)은 "서버 keep-alive는 수 초"라는 가정에 기대고
+있어, 서버가 2초 만에 닫으면 4초 예열 연결은 정각에 이미 죽어 있고(발사 요청이
+새 핸드셰이크부터 시작), 30초를 유지하면 예열이 불필요하게 잦다.
+
+  1. 측정: 연결 1개짜리 익명 세션으로 정적 경로에 HEAD를 보내며 간격을
+     1, 2, 4 … 초로 늘린다. 커넥터 트레이스(on_connection_reuseconn /
+     on_connection_create_end)로 매 요청이 기존 연결을 재사용했는지 보고,
+     처음 새 연결이 생긴 간격과 직전 재사용 간격 사이를 이분 탐색한다.
+     (서버가 닫은 유휴 연결은 커넥터가 풀에서 버리고 새로 연결한다.)
+  2. 유지: 정각 − lead 시각에 마지막 핑이 끝나도록, 그 앞으로 유휴 종료
+     추정값 × KEEPALIVE_SAFETY 간격의 핑을 모든 봇 세션에서 보낸다.
+     핑은 PHP 세션 상태를 건드리지 않도록 정적 경로(KEEPALIVE_PING_PATH) HEAD.
+  3. 보고: 봇 요청마다 재사용/새 연결 여부를 타이밍 이벤트("conn")에 남기고,
+     발사 요청 중 재사용 비율을 요약한다.
+
+설정: config.KEEPALIVE, KEEPALIVE_PING_PATH, KEEPALIVE_DEFAULT_IDLE_S,
+      KEEPALIVE_SAFETY, KEEPALIVE_WINDOW_S
+"""
+
+import asyncio
+import math
+import time
+from urllib.parse import urljoin
+
+import aiohttp
+
+import config
+
+PROBE_MAX_IDLE_S = 30.0    # 이보다 오래 유지되면 핑 간격 결정에 영향 없음
+PROBE_GAPS_S = (1.0, 2.0, 4.0, 8.0, 16.0, PROBE_MAX_IDLE_S)
+PROBE_BISECT_STEPS = 3
+PING_TIMEOUT_S = 3.0
+
+
+def connection_trace():
+    """요청의 trace_request_ctx(dict)에 "conn": "reused" | "new"를 기록하는 TraceConfig."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_reuse(session, ctx, params):
+        if isinstance(ctx.trace_request_ctx, dict):
+            ctx.trace_request_ctx["conn"] = "reused"
+
+    async def on_create(session, ctx, params):
+        if isinstance(ctx.trace_request_ctx, dict):
+            ctx.trace_request_ctx["conn"] = "new"
+
+    trace.on_connection_reuseconn.append(on_reuse)
+    trace.on_connection_create_end.append(on_create)
+    return trace
+
+
+def ping_url():
+    return urljoin(config.MAIN_URL + "/", config.KEEPALIVE_PING_PATH.lstrip("/"))
+
+
+async def _head(session, url, timeout=PING_TIMEOUT_S):
+    """HEAD 1회. 재사용 여부("reused" | "new" | None)를 반환한다. 상태 코드는 따지지 않는다."""
+    ctx = {}
+    async with session.head(url, allow_redirects=False, trace_request_ctx=ctx,
+                            timeout=aiohttp.ClientTimeout(total=timeout)):
+        pass
+    return ctx.get("conn")
+
+
+def fire_conn_summary(events):
+    """발사 이후 요청 이벤트의 연결 재사용 집계 {"reused", "new"}."""
+    out = {"reused": 0, "new": 0}
+    for e in events:
+        if e.get("conn") in out:
+            out[e["conn"]] += 1
+    return out
+
+
+class KeepAlive:
+    """서버 유휴 종료 시간 추정 + 정각 전 핑 스케줄.
+
+    idle_lower_s: 재사용이 확인된 가장 긴 유휴 간격 (서버는 최소 이만큼 유지)
+    idle_upper_s: 새 연결이 관측된 가장 짧은 유휴 간격 (None = 상한 미관측)
+    """
+
+    def __init__(self, resolver=None):
+        self.resolver = resolver   # dns_pin.PinnedResolver (측정 연결도 고정 주소로)
+        self.idle_lower_s = None
+        self.idle_upper_s = None
+        self.probes = 0
+        self.pings = 0
+        self.ping_rounds = 0
+        self.ping_new = 0          # 핑이 새 연결을 맺은 횟수 (유휴 종료로 끊긴 연결)
+        self.ping_failed = 0
+
+    # ── 측정 ─────────────────────────────────────────────────
+
+    def observe(self, idle_s, conn):
+        if conn == "reused":
+            self.idle_lower_s = max(self.idle_lower_s or 0.0, idle_s)
+        elif conn == "new":
+            if self.idle_upper_s is None or idle_s < self.idle_upper_s:
+                self.idle_upper_s = idle_s
+
+    def idle_timeout_s(self):
+        """핑 간격 계산에 쓸 유휴 종료 추정값 (보수적으로 하한 쪽)."""
+        if self.idle_lower_s is not None:
+            return self.idle_lower_s
+        if self.idle_upper_s is not None:
+            return self.idle_upper_s * 0.5
+        return config.KEEPALIVE_DEFAULT_IDLE_S
+
+    async def measure(self, deadline=None):
+        """유휴 종료 시간을 측정한다. deadline(로컬 epoch 초)을 넘길 간격은 시도하지 않는다."""
+        url = ping_url()
+        connector = aiohttp.TCPConnector(ssl=False, limit=1, resolver=self.resolver,
+                                         keepalive_timeout=PROBE_MAX_IDLE_S * 2)
+        async with aiohttp.ClientSession(connector=connector,
+                                         trace_configs=[connection_trace()]) as session:
+
+            async def probe(gap):
+                if deadline is not None and time.time() + gap + PING_TIMEOUT_S > deadline:
+                    return False
+                await asyncio.sleep(gap)
+                self.observe(gap, await _head(session, url))
+                self.probes += 1
+                return True
+
+            try:
+                await _head(session, url)     # 첫 연결
+                for gap in PROBE_GAPS_S:
+                    if not await probe(gap) or self.idle_upper_s is not None:
+                        break
+                # 1초에도 끊기면 더 짧은 간격으로 하한을 찾는다
+                for gap in (0.5, 0.25):
+                    if self.idle_lower_s is not None or not await probe(gap):
+                        break
+                for _ in range(PROBE_BISECT_STEPS):
+                    if self.idle_upper_s is None or self.idle_lower_s is None:
+                        break
+                    if self.idle_upper_s - self.idle_lower_s < 0.25:
+                        break
+                    if not await probe((self.idle_lower_s + self.idle_upper_s) / 2):
+                        break
+            except Exception as e:
+                print(f"[WARN] keep-alive 유휴 종료 측정 실패: {e}")
+        return self.summary()
+
+    # ── 유지 ─────────────────────────────────────────────────
+
+    def ping_interval_s(self):
+        return min(max(self.idle_timeout_s() * config.KEEPALIVE_SAFETY, 0.2), PROBE_MAX_IDLE_S)
+
+    def final_lead_s(self):
+        """마지막 핑 시작 시각 = 정각 − lead. 정각 전에 끝나고 정각까지 유휴 종료 전."""
+        return min(max(self.idle_timeout_s() * 0.5, 0.3), 1.5)
+
+    async def _ping_all(self, sessions):
+        url = ping_url()
+        results = await asyncio.gather(*[_head(s, url) for s in sessions if not s.closed],
+                                       return_exceptions=True)
+        self.ping_rounds += 1
+        for r in results:
+            self.pings += 1
+            if isinstance(r, BaseException):
+                self.ping_failed += 1
+            elif r == "new":
+                self.ping_new += 1
+
+    async def maintain(self, sessions, target_ts, window_s=None):
+        """target_ts(로컬 epoch 초) 정각에 모든 세션의 연결이 살아 있도록 핑한다.
+
+        핑 시각은 정각에서 거꾸로 정한다: 정각 − lead − k × 간격 (k = 0이 마지막).
+        정각 전 window_s초 안에서만 핑한다 (그 전에는 죽어도 정각과 무관).
+        간격·lead는 측정이 진행되는 동안 매 회 다시 계산한다.
+        """
+        window_s = config.KEEPALIVE_WINDOW_S if window_s is None else window_s
+        while True:
+            remaining = target_ts - time.time()
+            if remaining > window_s:
+                await asyncio.sleep(min(remaining - window_s, 5.0))
+                continue
+            lead, interval = self.final_lead_s(), self.ping_interval_s()
+            if remaining <= lead:
+                return
+            k = math.floor((remaining - lead) / interval)
+            next_at = target_ts - lead - k * interval
+            await asyncio.sleep(max(0.0, next_at - time.time()))
+            await self._ping_all(sessions)
+            if k == 0:
+                return
+
+    def summary(self):
+        return {
+            "idle_timeout_s": round(self.idle_timeout_s(), 2),
+            "idle_lower_s": None if self.idle_lower_s is None else round(self.idle_lower_s, 2),
+            "idle_upper_s": None if self.idle_upper_s is None else round(self.idle_upper_s, 2),
+            "probes": self.probes,
+            "ping_interval_s": round(self.ping_interval_s(), 2),
+            "ping_rounds": self.ping_rounds,
+            "pings": self.pings,
+            "ping_new": self.ping_new,
+            "ping_failed": self.ping_failed,
+        }
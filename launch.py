@@ -13,11 +13,13 @@ GROUP_SIZE(기본 4)개씩 묶어 그룹마다 새 터미널 창을 열고
   Linux  + tmux     : tmux 세션 → 감지된 터미널 에뮬레이터 창
   Linux  + --no-tmux: 계정마다 개별 터미널 창 (분할 없음)
   --background      : 터미널 창 없이 subprocess + 로그 파일
+  --single-process  : 전 계정을 이 프로세스의 이벤트 루프 하나에서 실행
 
 사용법:
     python3 launch.py                  # tmux 세션 + 새 터미널 창 (기본)
     python3 launch.py --no-tmux        # 터미널 네이티브 분할 (tmux 없이)
     python3 launch.py --background     # 백그라운드 subprocess + 로그 파일
+    python3 launch.py --single-process # 단일 프로세스 (로그인·발사 공유)
     python3 launch.py --group-size 2   # 창당 최대 2개
     python3 launch.py --test           # 테스트 모드 (대관신청 전 중단)
     python3 launch.py --check          # 로그인 테스트만
@@ -584,6 +586,41 @@ def run_background_fallback(accounts, extra_flags):
             proc.terminate()
 
 
+# ─── 실행 모드 4: single-process ─────────────────────────────────────────────
+
+def run_single_process(accounts, test_mode=False, rehearse_target=None):
+    """--single-process: 전 계정을 한 이벤트 루프에서 실행한다.
+
+    계정당 main.py 프로세스를 띄우는 대신 reservation_async.run_accounts_async로
+    로그인·프리페치·정각 발사 웨이브를 공유한다. 결과는 계정별 요약 1회,
+    타이밍 로그는 logs/timing_*_all.jsonl 1개로 모인다.
+
+    Returns: 종료 코드 (1건 이상 성공 시 0)
+    """
+    import asyncio
+
+    import config
+    from reservation_async import run_accounts_async
+
+    nums = {a["num"] for a in accounts}
+    full = [a for a in config.load_accounts() if a["num"] in nums]
+
+    if rehearse_target is not None:
+        config.RESERVATION_DAY = rehearse_target.day
+        config.RESERVATION_HOUR = rehearse_target.hour
+        config.RESERVATION_MINUTE = rehearse_target.minute
+        test_mode = True  # 리허설은 항상 실제 신청 전에 멈춘다
+
+    print(f"[launch] {len(full)}개 계정을 단일 프로세스로 실행합니다.")
+    print()
+    try:
+        result = asyncio.run(run_accounts_async(full, test_mode=test_mode))
+    except KeyboardInterrupt:
+        print("\n[launch] 중단되었습니다.")
+        return 130
+    return 0 if result.get("success") else 1
+
+
 # ─── 진입점 ──────────────────────────────────────────────────────────────────
 
 def main():
@@ -598,6 +635,8 @@ def main():
                   macOS/Terminal: 탭
                   Linux         : 계정당 개별 창
   --background  백그라운드 subprocess + 로그 파일
+  --single-process
+                단일 프로세스·단일 이벤트 루프 (로그인·발사 공유)
 
 .env 설정 예시:
   TENNIS_ACCOUNT_1_ID=user1
@@ -615,6 +654,9 @@ def main():
                         help="터미널 네이티브 분할로 실행 (tmux 없이)")
     parser.add_argument("--background", action="store_true",
                         help="백그라운드 subprocess + 로그 파일로 실행")
+    parser.add_argument("--single-process", action="store_true",
+                        help="전 계정을 단일 프로세스 이벤트 루프 하나에서 실행 "
+                             "(계정별 프로세스 대신 로그인·정각 발사 공유)")
     parser.add_argument("--group-size", type=int, default=GROUP_SIZE,
                         metavar="N",
                         help=f"터미널 창당 최대 계정(pane) 수 (기본값: {GROUP_SIZE})")
@@ -674,6 +716,7 @@ def main():
     else:
         print("  모드: 실제 예약")
 
+    rehearse_target = None
     if args.rehearse is not None:
         # 상대 초는 여기서 한 번만 절대 시각으로 변환해
         # 모든 계정 프로세스가 동일한 오픈 시각을 공유하게 한다
@@ -691,6 +734,7 @@ def main():
                 if t.second or t.microsecond:
                     t = t.replace(second=0, microsecond=0) + timedelta(minutes=1)
             rehearse_at = t.strftime("%H:%M")
+            rehearse_target = t
         except ValueError:
             print(f"[ERROR] --rehearse: 잘못된 값입니다 (초 또는 HH:MM): {rehearse_at}")
             sys.exit(1)
@@ -698,8 +742,22 @@ def main():
         print(f"  리허설: 오픈 {rehearse_at} (전 계정 공통, 신청 직전 중단)")
     print()
 
-    # 실행 모드 결정 (우선순위: --background > --no-tmux > tmux > no-tmux fallback)
-    if args.background:
+    # 실행 모드 결정
+    # (우선순위: --single-process > --background > --no-tmux > tmux > no-tmux fallback)
+    if args.single_process:
+        if args.check:
+            print("[ERROR] --single-process는 --check를 지원하지 않습니다. "
+                  "--background 등 계정별 프로세스 모드를 사용하세요.")
+            sys.exit(1)
+        if args.dry_run:
+            print("[dry-run] 단일 프로세스로 실행될 계정:")
+            for a in accounts:
+                print(f"  계정 {a['num']:2d} ({a['user_id']})")
+        else:
+            sys.exit(run_single_process(accounts, test_mode=args.test,
+                                        rehearse_target=rehearse_target))
+
+    elif args.background:
         if args.dry_run:
             print("[dry-run] 실행될 명령:")
             for a in accounts:
@@ -33,6 +33,7 @@ from reservation_async import (
     search_all_slots_async,
 )
 from reservation_http import TennisReservationHTTP
+from watcher import watch_async
 
 
 def get_credentials():
@@ -332,6 +333,12 @@ def main():
                         help="주말 예약 가능 시간 검색 (예: 2 또는 2026-02)")
     parser.add_argument("--search2", metavar="MONTH",
                         help="전체 날짜/시간 예약 가능 시간 검색 (예: 2 또는 2026-02)")
+    parser.add_argument("--watch", nargs="?", const=0, type=float, metavar="분",
+                        help="취소분 감시: 예약 조건의 슬롯이 비면 즉시 신청 "
+                             "(N분 후 종료, 생략 시 대상이 끝날 때까지; --test와 함께 쓰면 신청 직전 중단)")
+    parser.add_argument("--max-age", type=int, metavar="SEC",
+                        help="검색 시 이보다 새(초) 캐시 결과 재사용 (0 = 모두 새로 조회, "
+                             "기본 TENNIS_AVAIL_CACHE_MAX_AGE_S)")
     parser.add_argument("--account", type=int, metavar="N",
                         help="실행할 계정 번호 (launch.py 다중 계정 모드에서 자동 호출)")
     parser.add_argument("--rehearse", nargs="?", const="90", metavar="초|HH:MM",
@@ -380,7 +387,8 @@ def main():
         try:
             year, month = parse_search_month(args.search)
             result = asyncio.run(
-                search_available_slots_async(year, month, user_id=user_id, user_pw=user_pw)
+                search_available_slots_async(year, month, user_id=user_id, user_pw=user_pw,
+                                             max_age=args.max_age)
             )
             sys.exit(0 if result.get("total", 0) > 0 else 1)
         except ValueError:
@@ -393,7 +401,8 @@ def main():
         try:
             year, month = parse_search_month(args.search2)
             result = asyncio.run(
-                search_all_slots_async(year, month, user_id=user_id, user_pw=user_pw)
+                search_all_slots_async(year, month, user_id=user_id, user_pw=user_pw,
+                                       max_age=args.max_age)
             )
             sys.exit(0 if result.get("total", 0) > 0 else 1)
         except ValueError:
@@ -423,6 +432,16 @@ def main():
             success = test_login(user_id, user_pw)
         sys.exit(0 if success else 1)
 
+    # 취소분 감시 모드
+    if args.watch is not None:
+        result = asyncio.run(watch_async(
+            user_id=user_id, user_pw=user_pw, test_mode=args.test,
+            duration_s=args.watch * 60,
+        ))
+        # 테스트 모드의 "성공"(신청 직전 중단)은 tested에만 있다
+        done = result.get("tested") if args.test else result.get("reserved")
+        sys.exit(0 if done else 1)
+
     # 테스트 모드
     if args.test:
         print("[TEST MODE] 테스트 모드로 실행합니다.")
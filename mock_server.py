@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 모의 예약 서버 (부하·지연 벤치마크용)
+
+실제 사이트는 한 달에 한 번만 열리므로 엔진(reservation_async, reservation_http,
+api_server)을 재현 가능하게 측정할 대상이 없다. 이 서버는 엔진이 쓰는 경로를
+같은 페이지 구조(EUC-KR)·폼 필드·alert 문구로 흉내 낸다.
+
+  GET  /                              메인 (로그인 시 "로그아웃" 링크)
+  POST /member/login_process.php      로그인 (id/pw 비어 있지 않으면 성공)
+  GET  /rent/tennis_rent.php          DocumentForm + rent_chk[] 시간대 표
+  POST /rent/rent_period_apply.php    useForm (신청서) — 세션에 신청 상태 저장
+  POST /rent/rent_period_proc.php     최종 접수 — 세션의 신청 상태와 일치해야 함
+  GET  /css/common.css                정적 파일 (PHP 세션 무관, keep-alive 핑 대상)
+
+PHP 세션 의미를 그대로 따른다:
+  - PHPSESSID 쿠키로 세션 식별, 세션 파일 잠금처럼 같은 세션의 요청은 직렬 처리
+  - apply.php가 세션에 (날짜, 코트, 시간) 신청 상태를 쓰고 proc.php가 읽는다.
+    같은 세션으로 apply를 겹쳐 보내면 나중 요청이 덮어써 앞선 proc는
+    "(1-1) 정상적인 방법으로 신청" 오류가 난다.
+  - 오픈 전에는 체크박스 없는 페이지, apply는 useForm 없는 alert
+  - 1일 1건 제한(--no-daily-limit로 해제), 먼저 proc에 도달한 요청만 접수
+
+장애 주입: 고정·무작위 지연, 5xx 확률, 오픈 기준 5xx 버스트 구간,
+연결 끊김 확률, 서버 시계 오차(Date 헤더 포함), 짧은 keep-alive 유휴 종료.
+계측: GET /__stats (경로·상태별 요청 수, 새 연결 수, 최대 동시 처리, 접수 목록),
+      POST /__reset (예약·세션·통계 초기화)
+
+사용법:
+    python3 mock_server.py                          # 즉시 오픈 상태, :18080
+    python3 mock_server.py --open-in 30             # 30초 뒤 오픈
+    python3 mock_server.py --latency 80 --jitter 40 --burst 0:500:0.7
+    TENNIS_BASE_URL=http://localhost:18080 python3 main.py
+
+쿠키는 호스트명 기준으로 저장되므로 127.0.0.1 대신 localhost로 접속한다
+(aiohttp 쿠키 저장소는 IP 주소 호스트의 쿠키를 버린다).
+"""
+
+import argparse
+import asyncio
+import calendar
+import json
+import random
+import secrets
+import time
+import weakref
+import zlib
+from datetime import datetime
+from email.utils import formatdate
+from urllib.parse import parse_qsl
+
+from aiohttp import web
+
+DEFAULT_PORT = 18080
+
+COURTS = {"2": "테니스장 1코트", "7": "테니스장 2코트", "8": "테니스장 3코트", "9": "테니스장 4코트"}
+SLOT_HOURS = (6, 8, 10, 12, 14, 16, 18, 20)   # 2시간 단위 시간대 시작
+STATIC_PREFIXES = ("/css/", "/js/", "/img/")
+
+MSG_SUCCESS = "대관접수가 정상적으로 완료되었습니다.."
+MSG_TAKEN = "예약이 완료된 시간입니다.(3)"
+MSG_ONE_PER_DAY = "한 건 이상 예약이 완료되어 있습니다."
+MSG_NO_SLOT = "존재하지않는 시간데이터"
+MSG_BAD_FLOW = "(1-1) 정상적인 방법으로 신청하여 주십시오."
+MSG_NOT_OPEN = "접수기간이 아닙니다."
+MSG_LOGIN = "로그인 후 이용하세요."
+
+_HEAD = """<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
+<html xmlns="http://www.w3.org/1999/xhtml">
+<head>
+<meta http-equiv="Content-Type" content="text/html; charset=euc-kr" />
+<title>고양시 대화문화체육센터 - 테니스장 대관</title>
+<link rel="stylesheet" type="text/css" href="/css/common.css" />
+<script type="text/javascript" src="/js/jquery-1.8.3.min.js"></script>
+<script type="text/javascript">
+function checkIt() {
+  var f = document.DocumentForm;
+  if (!f.rent_chk) { alert("시간을 선택하세요."); return false; }
+  f.action = "rent_period_apply.php";
+  f.submit();
+}
+function goDay(y, m, d) {
+  location.href = "tennis_rent.php?place_opt=" + document.DocumentForm.place_opt.value + "&nyear=" + y + "&nmonth=" + m + "&nday=" + d;
+}
+</script>
+</head>
+<body>
+<div id="wrap">
+"""
+
+# 실제 페이지와 비슷한 크기가 되도록 전체 메뉴(12×6)를 싣는다
+_GNB = '<ul id="gnb">' + "".join(
+    f'<li><a href="/sub/menu{i}.php?code={i:03d}">체육시설 안내 {i}</a><ul>'
+    + "".join(f'<li><a href="/sub/menu{i}_{j}.php">세부 메뉴 {i}-{j}</a></li>' for j in range(6))
+    + "</ul></li>"
+    for i in range(12)
+) + "</ul>"
+
+_FOOT = """<div id="footer"><p>경기도 고양시 일산서구 대화동 &copy; 고양도시관리공사. All rights reserved.</p>
+<p>문의: 031-000-0000 &nbsp; 운영시간 06:00~22:00</p></div>
+</div>
+</body>
+</html>"""
+
+
+def _header(logged_in):
+    util = ('<a href="/member/logout.php">로그아웃</a> | <a href="/member/mypage.php">마이페이지</a>'
+            if logged_in else '<a href="/member/login.php">로그인</a> | <a href="/member/join.php">회원가입</a>')
+    return ('<div id="header">\n'
+            '  <h1><a href="/"><img src="/img/logo.gif" alt="고양시 대화문화체육센터" /></a></h1>\n'
+            f'  <div class="util"><a href="/">HOME</a> | {util}</div>\n'
+            f"  {_GNB}\n</div>\n")
+
+
+def _alert(message, then="history.back();"):
+    return f'<script type="text/javascript">alert("{message}");{then}</script>'
+
+
+def parse_burst(spec):
+    """"시작ms:길이ms:확률" (오픈 기준) → (start_s, end_s, rate). 빈 값이면 None."""
+    if not spec:
+        return None
+    try:
+        start, length, rate = spec.split(":")
+        start_s = float(start) / 1000
+        return start_s, start_s + float(length) / 1000, float(rate)
+    except ValueError:
+        raise ValueError(f"--burst 형식 오류: '{spec}' (예: 0:500:0.7)")
+
+
+class MockSite:
+    """모의 사이트 상태: 세션, 접수 내역, 장애 주입 설정, 요청 통계."""
+
+    def __init__(self, open_at=None, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 burst=None, drop_rate=0.0, clock_skew_ms=0.0, booked_ratio=0.0, seed=0,
+                 daily_limit=True):
+        self.clock_skew = clock_skew_ms / 1000
+        self.open_at = open_at          # 서버 시계 epoch 초 (None = 항상 열림)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.burst = burst              # (start_s, end_s, rate) — 오픈 기준
+        self.drop_rate = drop_rate
+        self.booked_ratio = booked_ratio
+        self.seed = seed
+        self.daily_limit = daily_limit  # 1일 1건 제한 (벤치마크에서는 끌 수 있음)
+        self._rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.sessions = {}              # sid → {"user", "apply", "lock"}
+        self.bookings = {}              # (rent_date, place_opt, value) → user
+        self.user_days = set()          # (user, rent_date)
+        self.counts = {}                # path → {status: n}
+        self.drops = 0
+        self.connections = 0            # 새 TCP 연결 수 (keep-alive 재사용 확인용)
+        self._transports = weakref.WeakSet()
+        self.inflight = 0
+        self.max_inflight = 0
+        self.started = time.time()
+
+    def now(self):
+        """서버 시계 (로컬 + 오차)."""
+        return time.time() + self.clock_skew
+
+    def is_open(self):
+        return self.open_at is None or self.now() >= self.open_at
+
+    # ── 시간대 ───────────────────────────────────────────────
+
+    def slot_value(self, rent_date, place_opt, idx):
+        """rent_chk[] 값: 시작HHMM + 종료HHMM + 2자리 레코드 ID (날짜·코트별 고정)."""
+        hour = SLOT_HOURS[idx]
+        day = int(rent_date[-2:])
+        record_id = 10 + (day * 8 + int(place_opt) * 3 + idx) % 90
+        return f"{hour:02d}00{hour + 2:02d}00{record_id:02d}"
+
+    def slot_taken(self, rent_date, place_opt, idx):
+        if (rent_date, place_opt, self.slot_value(rent_date, place_opt, idx)) in self.bookings:
+            return True
+        if not self.booked_ratio:
+            return False
+        # 시드 고정 사전 예약 — 재시작해도 같은 시간대가 막혀 있다
+        return random.Random(f"{self.seed}:{rent_date}:{place_opt}:{idx}").random() < self.booked_ratio
+
+    def find_slot(self, rent_date, place_opt, value):
+        """rent_chk[] 값의 시간대 인덱스. 프리페치 예측값(앞 8자리)도 허용한다."""
+        for idx in range(len(SLOT_HOURS)):
+            full = self.slot_value(rent_date, place_opt, idx)
+            if value == full or (len(value) == 8 and full.startswith(value)):
+                return idx
+        return None
+
+    # ── 페이지 ───────────────────────────────────────────────
+
+    def rent_page(self, logged_in, place_opt, year, month, day):
+        rent_date = f"{year:04d}-{month:02d}-{day:02d}"
+        is_open = self.is_open()
+        ym = f"{year},{month:02d}"
+
+        selected = ' selected="selected"'
+        options = "\n".join(
+            f'<option value="{v}"{selected if v == place_opt else ""}>{name}</option>'
+            for v, name in COURTS.items())
+
+        cal = ['<table class="cal" summary="달력"><tr>'
+               + "".join(f"<th>{d}</th>" for d in "일월화수목금토") + "</tr>"]
+        for week in calendar.Calendar(firstweekday=6).monthdayscalendar(year, month):
+            cells = []
+            for d in week:
+                if not d:
+                    cells.append("<td>&nbsp;</td>")
+                    continue
+                sel = ' class="sel"' if d == day else ""
+                cells.append(f'<td{sel}><a href="javascript:goDay({ym},{d:02d})">{d}</a></td>')
+            cal.append("<tr>" + "".join(cells) + "</tr>")
+        cal.append("</table>")
+
+        rows = []
+        for idx, hour in enumerate(SLOT_HOURS):
+            value = self.slot_value(rent_date, place_opt, idx)
+            if not is_open:
+                chk, state = "&nbsp;", "접수기간 아님"
+            elif self.slot_taken(rent_date, place_opt, idx):
+                chk = (f'<input type="checkbox" name="rent_chk[]" id="rent_chk{idx}" '
+                       f'value="{value}" disabled="disabled" />')
+                state = "일정있음"
+            else:
+                chk = (f'<input type="checkbox" name="rent_chk[]" id="rent_chk{idx}" '
+                       f'value="{value}" onclick="chkTime(this)" />')
+                state = "예약가능"
+            rows.append(f'<tr>\n<td class="chk">{chk}</td>\n'
+                        f"<td>{hour:02d}:00 ~ {hour + 2:02d}:00</td>\n<td>2시간</td>\n"
+                        f'<td class="pay">8,000원</td>\n<td class="state">{state}</td>\n</tr>')
+
+        return (
+            _HEAD + _header(logged_in)
+            + '\n<table width="100%" border="0" cellspacing="0" cellpadding="0" class="layout">\n<tr>\n'
+            '<td class="lnb" valign="top"><ul><li><a href="tennis_rent.php">테니스장</a></li>'
+            '<li><a href="futsal_rent.php">풋살장</a></li></ul></td>\n'
+            '<td class="content" valign="top">\n<h2>테니스장 대관신청</h2>\n'
+            '<form name="DocumentForm" method="post" action="">\n'
+            '<input type="hidden" name="mode" value="apply" />\n'
+            f'<input type="hidden" name="nyear" value="{year:04d}" />\n'
+            f'<input type="hidden" name="nmonth" value="{month:02d}" />\n'
+            f'<input type="hidden" name="nday" value="{day:02d}" />\n'
+            f'<input type="hidden" name="rent_date" value="{rent_date}" />\n'
+            '<input type="hidden" name="rent_type" value="T" />\n'
+            '<input type="hidden" name="part_cd" value="05" />\n'
+            '<input type="hidden" name="place_cd" value="0501" />\n'
+            '<input type="hidden" name="title" value="테니스장 &amp; 부대시설" />\n'
+            '<p class="sel_place">시설선택 :\n'
+            f'<select name="place_opt" onchange="goDay({ym},{day:02d})">\n{options}\n</select>\n'
+            '<select name="use_gubun"><option value="">선택</option><option value="P">개인</option>'
+            '<option value="G">단체</option></select>\n</p>\n'
+            + "".join(cal) + "\n"
+            '<table class="rent_list" summary="시간대별 대관현황">\n'
+            '<colgroup><col width="10%" /><col width="30%" /><col width="15%" />'
+            '<col width="20%" /><col width="25%" /></colgroup>\n'
+            "<tr><th>선택</th><th>이용시간</th><th>사용시간</th><th>요금</th><th>상태</th></tr>\n"
+            + "\n".join(rows) + "\n</table>\n"
+            '<p class="btn"><a href="javascript:checkIt()"><img src="/img/btn_apply.gif" alt="대관신청" /></a></p>\n'
+            "</form>\n</td>\n</tr>\n</table>\n" + _FOOT
+        )
+
+    def apply_page(self, user, rent_date, place_opt, value):
+        return (
+            _HEAD + _header(True)
+            + '\n<table width="100%" border="0" cellspacing="0" cellpadding="0" class="layout">\n<tr>\n'
+            '<td class="content" valign="top">\n<h2>대관신청서 작성</h2>\n'
+            '<form name="useForm" method="post" action="rent_period_proc.php" onsubmit="return checkIt();">\n'
+            '<input type="hidden" name="mode" value="proc" />\n'
+            f'<input type="hidden" name="rent_date" value="{rent_date}" />\n'
+            f'<input type="hidden" name="place_opt" value="{place_opt}" />\n'
+            f'<input type="hidden" name="rent_chk[]" value="{value}" />\n'
+            '<input type="hidden" name="TotalPay" value="8000" />\n'
+            f'<input type="hidden" name="mem_no" value="{zlib.crc32(user.encode()) % 10**8:08d}" />\n'
+            '<table class="write" summary="신청자 정보">\n'
+            f'<tr><th>신청자</th><td><input type="text" name="user_nm" value="{user}" readonly="readonly" /></td></tr>\n'
+            '<tr><th>연락처</th><td><input type="text" name="hp1" value="010" size="4" />-'
+            '<input type="text" name="hp2" value="1234" size="5" />-'
+            '<input type="text" name="hp3" value="5678" size="5" /></td></tr>\n'
+            '<tr><th>이메일</th><td><input type="text" name="email" value="user&#64;example.com" /></td></tr>\n'
+            '<tr><th>단체명</th><td><input type="text" name="com_nm" value="" /></td></tr>\n'
+            '<tr><th>사업자번호</th><td><input type="text" name="regno" value="" /></td></tr>\n'
+            '<tr><th>인원</th><td><input type="text" name="use_cnt" value="4" /></td></tr>\n'
+            '<tr><th>사용목적</th><td><textarea name="use_purpose" rows="3" cols="60">테니스 &amp; 레슨</textarea></td></tr>\n'
+            '<tr><th>비고</th><td><textarea name="memo" rows="3" cols="60"></textarea></td></tr>\n'
+            '<tr><th>약관동의</th><td><input type="checkbox" name="apply_chk" value="1" /> 동의 '
+            '<input type="checkbox" name="apply_chk2" value="1" /> 환불규정 동의</td></tr>\n'
+            "</table>\n"
+            '<p class="btn"><input type="image" src="/img/btn_submit.gif" alt="신청" /></p>\n'
+            "</form>\n</td>\n</tr>\n</table>\n" + _FOOT
+        )
+
+    # ── 장애 주입 ────────────────────────────────────────────
+
+    def error_probability(self):
+        rate = self.error_rate
+        if self.burst is not None and self.open_at is not None:
+            since_open = self.now() - self.open_at
+            start, end, burst_rate = self.burst
+            if start <= since_open < end:
+                rate = max(rate, burst_rate)
+        return rate
+
+    def delay(self):
+        return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def count(self, path, status):
+        by_status = self.counts.setdefault(path, {})
+        by_status[str(status)] = by_status.get(str(status), 0) + 1
+
+    def stats(self):
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "open": self.is_open(),
+            "open_in_s": None if self.open_at is None else round(self.open_at - self.now(), 3),
+            "requests": sum(sum(s.values()) for s in self.counts.values()) + self.drops,
+            "paths": self.counts,
+            "drops": self.drops,
+            "connections": self.connections,
+            "max_inflight": self.max_inflight,
+            "sessions": len(self.sessions),
+            "bookings": [
+                {"rent_date": d, "place_opt": p, "value": v, "user": u}
+                for (d, p, v), u in sorted(self.bookings.items())
+            ],
+        }
+
+
+# ============================================================
+# 핸들러
+# ============================================================
+
+def _site(request):
+    return request.app["site"]
+
+
+def _html(site, text, status=200):
+    resp = web.Response(body=text.encode("euc-kr", "xmlcharrefreplace"), status=status,
+                        content_type="text/html", charset="euc-kr")
+    resp.headers["Date"] = formatdate(site.now(), usegmt=True)
+    return resp
+
+
+async def _form(request):
+    """폼 본문 파싱. 사이트처럼 EUC-KR로 읽되, UTF-8로 보낸 클라이언트도 받아 준다."""
+    raw = await request.read()
+    for enc in ("euc-kr", "utf-8"):
+        try:
+            text = raw.decode(enc)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = raw.decode("latin-1")
+    return dict(parse_qsl(text, keep_blank_values=True))
+
+
+@web.middleware
+async def _site_middleware(request, handler):
+    """계측 → 지연 → 연결 끊김/5xx → PHP 세션 잠금 → 핸들러."""
+    site = _site(request)
+    if request.path.startswith("/__"):
+        return await handler(request)
+
+    transport = request.transport
+    if transport is not None and transport not in site._transports:
+        site._transports.add(transport)
+        site.connections += 1
+    site.inflight += 1
+    site.max_inflight = max(site.max_inflight, site.inflight)
+    try:
+        delay = site.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if site.drop_rate and site._rng.random() < site.drop_rate:
+            site.drops += 1
+            if request.transport is not None:
+                request.transport.abort()
+            raise asyncio.CancelledError()
+
+        if site._rng.random() < site.error_probability():
+            site.count(request.path, 503)
+            return _html(site, "<html><body><h1>503 Service Unavailable</h1></body></html>", 503)
+
+        if request.path.startswith(STATIC_PREFIXES):
+            # 정적 파일은 PHP를 거치지 않는다 (세션 생성·잠금 없음)
+            resp = await handler(request)
+            site.count(request.path, resp.status)
+            return resp
+
+        sid = request.cookies.get("PHPSESSID")
+        new_sid = None
+        if sid not in site.sessions:
+            sid = new_sid = secrets.token_hex(13)
+            site.sessions[sid] = {"user": None, "apply": None, "lock": asyncio.Lock()}
+        request["session"] = site.sessions[sid]
+
+        # PHP 파일 세션: session_start()가 세션 파일을 잠가 같은 세션 요청은 한 번에 하나
+        async with request["session"]["lock"]:
+            resp = await handler(request)
+        if new_sid:
+            resp.set_cookie("PHPSESSID", new_sid, path="/")
+        site.count(request.path, resp.status)
+        return resp
+    finally:
+        site.inflight -= 1
+
+
+async def handle_main(request):
+    site = _site(request)
+    session = request["session"]
+    body = (_HEAD + _header(session["user"] is not None)
+            + '<div id="container"><h2>대화문화체육센터</h2></div>\n' + _FOOT)
+    return _html(site, body)
+
+
+async def handle_login(request):
+    site = _site(request)
+    form = await _form(request)
+    if not form.get("id") or not form.get("pw"):
+        return _html(site, _alert("아이디 또는 비밀번호가 올바르지 않습니다."))
+    session = request["session"]
+    session["user"] = form["id"]
+    session["apply"] = None
+    return _html(site, _alert("로그인되었습니다.", "location.href='/';"))
+
+
+async def handle_rent(request):
+    site = _site(request)
+    q = request.query
+    now = datetime.fromtimestamp(site.now())
+    try:
+        year = int(q.get("nyear", now.year))
+        month = int(q.get("nmonth", now.month))
+        day = int(q.get("nday", now.day))
+        datetime(year, month, day)
+    except ValueError:
+        return _html(site, _alert(MSG_NO_SLOT))
+    place_opt = q.get("place_opt", "2")
+    if place_opt not in COURTS:
+        place_opt = "2"
+    return _html(site, site.rent_page(request["session"]["user"] is not None,
+                                      place_opt, year, month, day))
+
+
+async def handle_apply(request):
+    site = _site(request)
+    session = request["session"]
+    if session["user"] is None:
+        return _html(site, _alert(MSG_LOGIN, "location.href='/member/login.php';"))
+    if not site.is_open():
+        return _html(site, _alert(MSG_NOT_OPEN))
+
+    form = await _form(request)
+    rent_date = form.get("rent_date", "")
+    place_opt = form.get("place_opt", "")
+    value = form.get("rent_chk[]", "")
+    idx = site.find_slot(rent_date, place_opt, value) if place_opt in COURTS and rent_date else None
+    if idx is None:
+        return _html(site, _alert(MSG_NO_SLOT))
+
+    full = site.slot_value(rent_date, place_opt, idx)
+    # 세션당 신청 상태는 하나 — 겹친 apply는 앞선 신청을 덮어쓴다
+    session["apply"] = (rent_date, place_opt, full)
+    return _html(site, site.apply_page(session["user"], rent_date, place_opt, full))
+
+
+async def handle_proc(request):
+    site = _site(request)
+    session = request["session"]
+    if session["user"] is None:
+        return _html(site, _alert(MSG_LOGIN, "location.href='/member/login.php';"))
+
+    form = await _form(request)
+    target = (form.get("rent_date", ""), form.get("place_opt", ""), form.get("rent_chk[]", ""))
+    pending, session["apply"] = session["apply"], None
+    if pending is None or pending != target:
+        return _html(site, _alert(MSG_BAD_FLOW))
+
+    rent_date, place_opt, value = target
+    idx = site.find_slot(rent_date, place_opt, value)
+    if idx is None or value != site.slot_value(rent_date, place_opt, idx):
+        return _html(site, _alert(MSG_NO_SLOT))
+    if site.slot_taken(rent_date, place_opt, idx):
+        return _html(site, _alert(MSG_TAKEN))
+    if site.daily_limit and (session["user"], rent_date) in site.user_days:
+        return _html(site, _alert(MSG_ONE_PER_DAY))
+
+    site.bookings[target] = session["user"]
+    site.user_days.add((session["user"], rent_date))
+    return _html(site, _alert(MSG_SUCCESS, "location.href='/member/mypage.php';"))
+
+
+async def handle_static(request):
+    resp = web.Response(body=b"body{margin:0}", content_type="text/css")
+    resp.headers["Date"] = formatdate(_site(request).now(), usegmt=True)
+    return resp
+
+
+async def handle_stats(request):
+    return web.json_response(_site(request).stats(),
+                             dumps=lambda o: json.dumps(o, ensure_ascii=False))
+
+
+async def handle_reset(request):
+    _site(request).reset()
+    return web.json_response({"reset": True})
+
+
+def create_app(site):
+    app = web.Application(middlewares=[_site_middleware])
+    app["site"] = site
+    app.router.add_get("/", handle_main)
+    app.router.add_post("/member/login_process.php", handle_login)
+    app.router.add_get("/rent/tennis_rent.php", handle_rent)
+    app.router.add_post("/rent/rent_period_apply.php", handle_apply)
+    app.router.add_post("/rent/rent_period_proc.php", handle_proc)
+    app.router.add_get("/css/common.css", handle_static)   # keep-alive 핑 대상
+    app.router.add_get("/__stats", handle_stats)
+    app.router.add_post("/__reset", handle_reset)
+    return app
+
+
+def _resolve_open_at(args, skew_s):
+    """--open-in / --open-at → 서버 시계 epoch 초 (미지정 시 None = 항상 열림)."""
+    if args.open_in is not None:
+        return time.time() + skew_s + args.open_in
+    if args.open_at:
+        now = datetime.fromtimestamp(time.time() + skew_s)
+        hh, mm, *ss = (int(x) for x in args.open_at.split(":"))
+        target = now.replace(hour=hh, minute=mm, second=ss[0] if ss else 0, microsecond=0)
+        return target.timestamp()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 모의 예약 서버 (벤치마크용)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--open-in", type=float, help="N초 뒤 오픈 (서버 시계 기준)")
+    parser.add_argument("--open-at", help="오늘 HH:MM[:SS]에 오픈 (서버 시계 기준)")
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 고정 지연 ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="요청당 추가 무작위 지연 [0, N] ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 확률 (0~1)")
+    parser.add_argument("--burst", help="오픈 기준 503 버스트 '시작ms:길이ms:확률' (예: 0:500:0.7)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="응답 없이 연결을 끊을 확률 (0~1)")
+    parser.add_argument("--clock-skew-ms", type=float, default=0.0,
+                        help="서버 시계 − 로컬 시계 (Date 헤더·오픈 판정에 반영)")
+    parser.add_argument("--booked-ratio", type=float, default=0.0,
+                        help="미리 예약된 시간대 비율 (0~1, --seed로 고정)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keepalive", type=float, default=5.0,
+                        help="유휴 keep-alive 연결을 닫기까지 초 (실제 사이트처럼 짧게)")
+    parser.add_argument("--no-daily-limit", action="store_true",
+                        help="1일 1건 제한 해제 (한 계정으로 N건 벤치마크할 때)")
+    args = parser.parse_args()
+
+    try:
+        burst = parse_burst(args.burst)
+    except ValueError as e:
+        parser.error(str(e))
+    site = MockSite(
+        open_at=_resolve_open_at(args, args.clock_skew_ms / 1000),
+        latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+        burst=burst, drop_rate=args.drop_rate, clock_skew_ms=args.clock_skew_ms,
+        booked_ratio=args.booked_ratio, seed=args.seed,
+        daily_limit=not args.no_daily_limit,
+    )
+
+    if site.open_at is None:
+        print("[INFO] 오픈 상태로 시작")
+    else:
+        print(f"[INFO] 오픈 시각(서버 시계): {datetime.fromtimestamp(site.open_at):%H:%M:%S.%f}"[:-3])
+    print(f"[INFO] 모의 서버: http://{args.host}:{args.port}/  (통계: /__stats)")
+    web.run_app(create_app(site), host=args.host, port=args.port, print=None,
+                keepalive_timeout=args.keepalive)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,15 +16,34 @@ import calendar
 import json
 import random
 import time
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 import config
-from utils import wait_before_login_async, wait_for_reservation_open_async
+import html_extract
+from submit_payload import (
+    FORM_HEADERS, CompiledSubmit, build_apply_fields, build_proc_fields,
+    encode_fields,
+)
+from fire_plan import build_fire_plan
+from hedge import HedgeBudget, LatencyTracker, hedged_reserve
+from session_pool import SessionPool, assign_slots
+from search_pipeline import fetch_by_date
+from slot_bitmap import DAY_NAMES, SlotBitmap, hours_of, is_closure, mask_of_hours
+from stream_scan import PROC_RESULT, USE_FORM, read_until
+from codec_cache import decode_body
+from clock_sync import fire_shift_seconds, measure_server_clock
+from dns_pin import PinnedResolver
+from keepalive import KeepAlive, connection_trace, fire_conn_summary
+from utils import (
+    FireScheduler, reservation_open_time, wait_before_login_async,
+    wait_for_reservation_open_async,
+)
 
 LOGS_DIR = Path(__file__).resolve().parent / "logs"
 
@@ -51,6 +70,72 @@ def _dump_timing(log_path, record):
         print(f"[WARN] 타이밍 로그 기록 실패: {e}")
 
 
+_parse_executor = None
+_parse_executor_users = 0   # 풀을 쓰는 중인 실행(_fire_jobs) 수
+
+
+def _acquire_parse_executor():
+    """config.PARSE_OFFLOAD에 맞는 파싱 풀(모듈 공용)을 빌린다. "off"면 None.
+
+    API 서버처럼 한 프로세스에서 실행이 겹치면 풀을 함께 쓰고, 마지막 실행이
+    _release_parse_executor()로 반납할 때 닫는다 (먼저 끝난 실행이 다른 실행의
+    파싱을 취소하지 않게).
+    """
+    global _parse_executor, _parse_executor_users
+    _parse_executor_users += 1
+    if _parse_executor is None:
+        if config.PARSE_OFFLOAD == "thread":
+            _parse_executor = ThreadPoolExecutor(
+                max_workers=config.PARSE_WORKERS, thread_name_prefix="parse")
+        elif config.PARSE_OFFLOAD == "process":
+            _parse_executor = ProcessPoolExecutor(max_workers=config.PARSE_WORKERS)
+    return _parse_executor
+
+
+async def _warm_parse_executor():
+    """파싱 풀을 정각 전에 띄워 둔다 (프로세스 풀은 첫 작업 때 워커를 생성한다)."""
+    executor = _parse_executor
+    if executor is None:
+        return
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[
+        loop.run_in_executor(executor, html_extract.extract_slots, "")
+        for _ in range(config.PARSE_WORKERS)
+    ])
+
+
+def _release_parse_executor():
+    global _parse_executor, _parse_executor_users
+    _parse_executor_users -= 1
+    if _parse_executor_users == 0 and _parse_executor is not None:
+        _parse_executor.shutdown(wait=False, cancel_futures=True)
+        _parse_executor = None
+
+
+def _fire_breakdown(events):
+    """발사 이후 타이밍 이벤트를 네트워크 대기·파싱·본문 조립(ms) 합계로 요약한다."""
+    net_ms = sum(e["elapsed_ms"] for e in events if "path" in e)
+    parse_ms = sum(e["elapsed_ms"] for e in events if e.get("kind") == "parse")
+    client_ms = sum(e["elapsed_ms"] for e in events if e.get("kind") == "client")
+    return round(net_ms, 1), round(parse_ms, 1), round(client_ms, 3)
+
+
+def _make_connector(limit, limit_per_host, resolver=None):
+    return aiohttp.TCPConnector(
+        ssl=False,
+        limit=limit,
+        limit_per_host=limit_per_host,
+        resolver=resolver,
+        keepalive_timeout=30,
+        enable_cleanup_closed=True,
+    )
+
+
+def _predict_time_value(hour):
+    """rent_chk[] 값 예측: "시작HHMM+2시간" (예: 10시 → "10001200")."""
+    return f"{hour:02d}00{hour + 2:02d}00"
+
+
 class TennisReservationAsync:
     """단일 aiohttp.ClientSession으로 비동기 테니스장 예약.
 
@@ -58,36 +143,48 @@ class TennisReservationAsync:
         async with TennisReservationAsync() as bot:
             await bot.login(user_id, user_pw)
             ...
+
+    connector를 주면 그 연결 풀을 공유한다 (API 서버의 프로세스 공용 커넥터).
     """
 
-    def __init__(self):
+    def __init__(self, connector=None):
+        self._connector = connector
         self.session: aiohttp.ClientSession | None = None
         self.logged_in = False
         self.timing = []  # 요청 단위 타이밍 이벤트 (정각 지연 분석용)
         self.prefetched_form = None  # 정각 전 캐시한 DocumentForm 필드
+        self.compiled_submit = None  # 정각 전 만들어 둔 apply/proc 본문 (CompiledSubmit)
+        self.fire_window = False     # True 동안 HTML 파싱을 파싱 풀로 오프로드
+        self.session_source = None   # "reused"(세션 풀) | "login"(새 로그인)
+        self.session_lease = None    # 세션 풀 파일 임대 (close()에서 푼다)
+        self.inflight = None         # 진행 중 요청 (path, 시작 monotonic) — 헤징 트리거용
+        self.latency_observer = None  # 성공 응답마다 (path, elapsed_ms)로 호출 (hedge.LatencyTracker)
 
     async def __aenter__(self):
-        await self._create_session()
+        await self._create_session(self._connector)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
 
-    async def _create_session(self):
-        connector = aiohttp.TCPConnector(
-            ssl=False,
-            limit=config.SESSION_POOL_SIZE * 4,
-            limit_per_host=config.SESSION_POOL_SIZE,
-            keepalive_timeout=30,
-            enable_cleanup_closed=True,
-        )
+    async def _create_session(self, connector=None, resolver=None):
+        """세션 생성. connector가 주어지면 연결 풀만 공유한다 (쿠키 저장소는 세션별).
+
+        resolver(dns_pin.PinnedResolver)는 자체 커넥터를 만들 때만 쓴다.
+        """
+        shared = connector is not None
+        if not shared:
+            connector = _make_connector(config.SESSION_POOL_SIZE * 4, config.SESSION_POOL_SIZE,
+                                        resolver)
         timeout = aiohttp.ClientTimeout(
             connect=config.CONNECTION_TIMEOUT,
             total=config.CONNECTION_TIMEOUT + config.READ_TIMEOUT,
         )
         self.session = aiohttp.ClientSession(
             connector=connector,
+            connector_owner=not shared,
             timeout=timeout,
+            trace_configs=[connection_trace()],  # 요청별 연결 재사용 여부 (keepalive.py)
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -105,7 +202,7 @@ class TennisReservationAsync:
         print(f"{ts} {prefix} {msg}")
 
     def _record(self, start_mono, method, url, attempt, outcome,
-                status=None, size=None):
+                status=None, size=None, conn=None, early=False):
         """요청 1회 시도의 타이밍 이벤트를 기록한다 (JSONL 분석 로그용)."""
         try:
             event = {
@@ -120,55 +217,120 @@ class TennisReservationAsync:
                 event["status"] = status
             if size is not None:
                 event["bytes"] = size
+            if conn is not None:
+                event["conn"] = conn   # "reused" | "new" (keep-alive 연결 재사용 여부)
+            if early:
+                event["early"] = True  # 판정 부분만 읽고 나머지는 백그라운드 드레인
             self.timing.append(event)
+            if outcome == "ok" and self.latency_observer is not None:
+                self.latency_observer(event["path"], event["elapsed_ms"])
         except Exception:
             pass
 
-    async def _request_with_retry(self, method, url, max_retries=None, **kwargs):
-        """재시도 포함 비동기 HTTP 요청. 성공 시 응답 텍스트 반환."""
+    async def _parse(self, extract, html):
+        """html_extract 함수를 실행하고 파싱 시간을 타이밍 이벤트로 기록한다.
+
+        발사 구간(fire_window)이고 PARSE_OFFLOAD가 켜져 있으면 파싱 풀에서 실행해
+        한 워커의 파싱이 다른 워커의 소켓 읽기를 막지 않게 한다.
+        """
+        executor = _parse_executor if self.fire_window else None
+        t_start = time.monotonic()
+        try:
+            if executor is not None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(executor, extract, html)
+            return extract(html)
+        finally:
+            try:
+                self.timing.append({
+                    "ts": datetime.now().isoformat(timespec="milliseconds"),
+                    "elapsed_ms": round((time.monotonic() - t_start) * 1000, 1),
+                    "kind": "parse",
+                    "fn": extract.__name__,
+                    "offloaded": executor is not None,
+                })
+            except Exception:
+                pass
+
+    def _record_client(self, stage, t_start, compiled):
+        """요청 본문 조립 등 클라이언트 측 오버헤드 이벤트를 기록한다 (µs 단위 정밀도)."""
+        try:
+            self.timing.append({
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "elapsed_ms": round((time.perf_counter() - t_start) * 1000, 3),
+                "kind": "client",
+                "stage": stage,
+                "compiled": compiled,
+            })
+        except Exception:
+            pass
+
+    async def _request_with_retry(self, method, url, max_retries=None, scan=None, **kwargs):
+        """재시도 포함 비동기 HTTP 요청. 성공 시 응답 텍스트 반환.
+
+        scan(stream_scan.ScanSpec)이 주어지면 본문을 스트리밍으로 읽다가 판정에
+        필요한 부분이 오면 그 앞부분만 디코드해 반환한다 (config.STREAM_SCAN일 때).
+        """
         if max_retries is None:
             max_retries = config.MAX_RETRIES
+        if not config.STREAM_SCAN:
+            scan = None
 
         last_error = None
+        path = urlparse(url).path
         for attempt in range(max_retries):
             t_start = time.monotonic()
+            self.inflight = (path, t_start)
+            trace_ctx = {}
             try:
-                async with self.session.request(method, url, **kwargs) as resp:
+                resp = await self.session.request(method, url, trace_request_ctx=trace_ctx,
+                                                  **kwargs)
+                early = False
+                try:
                     resp.raise_for_status()
-                    # 서버가 EUC-KR 선언이지만 UTF-8 바이트를 혼용하는 경우 대응:
-                    # 바이트를 직접 읽어 euc-kr → cp949 → utf-8 → replace 순으로 시도
-                    raw = await resp.read()
-                    self._record(t_start, method, url, attempt + 1, "ok",
-                                 status=resp.status, size=len(raw))
-                    for enc in ("euc-kr", "cp949", "utf-8"):
-                        try:
-                            return raw.decode(enc)
-                        except UnicodeDecodeError:
-                            continue
-                    return raw.decode("utf-8", errors="replace")
+                    if scan is None:
+                        raw = await resp.read()
+                    else:
+                        raw, early = await read_until(resp, scan)
+                finally:
+                    if not early:   # early면 드레인 태스크가 release한다
+                        resp.release()
+                self._record(t_start, method, url, attempt + 1, "ok",
+                             status=resp.status, size=len(raw),
+                             conn=trace_ctx.get("conn"), early=early)
+                # 서버가 EUC-KR 선언이지만 UTF-8 바이트를 혼용하는 경우 대응:
+                # 경로별로 맞았던 코덱부터 디코드 (codec_cache.py)
+                return decode_body(path, raw)
 
             except aiohttp.ClientResponseError as e:
                 last_error = e
-                self._record(t_start, method, url, attempt + 1, f"http_{e.status}")
+                self._record(t_start, method, url, attempt + 1, f"http_{e.status}",
+                             conn=trace_ctx.get("conn"))
                 self._log(f"[RETRY {attempt+1}/{max_retries}] HTTP {e.status}: {url}")
                 if 400 <= e.status < 500:
                     raise
 
             except asyncio.TimeoutError as e:
                 last_error = e
-                self._record(t_start, method, url, attempt + 1, "timeout")
+                self._record(t_start, method, url, attempt + 1, "timeout",
+                             conn=trace_ctx.get("conn"))
                 self._log(f"[RETRY {attempt+1}/{max_retries}] 타임아웃: {url}")
 
             except aiohttp.ClientConnectionError as e:
                 last_error = e
-                self._record(t_start, method, url, attempt + 1, "conn_error")
+                self._record(t_start, method, url, attempt + 1, "conn_error",
+                             conn=trace_ctx.get("conn"))
                 self._log(f"[RETRY {attempt+1}/{max_retries}] 연결 오류: {url}")
 
             except Exception as e:
                 last_error = e
-                self._record(t_start, method, url, attempt + 1, "error")
+                self._record(t_start, method, url, attempt + 1, "error",
+                             conn=trace_ctx.get("conn"))
                 self._log(f"[RETRY {attempt+1}/{max_retries}] 오류: {e}")
 
+            finally:
+                self.inflight = None
+
             if attempt < max_retries - 1:
                 await asyncio.sleep(_backoff_delay(attempt))
 
@@ -208,6 +370,34 @@ class TennisReservationAsync:
         self._log("[ERROR] 로그인 최종 실패")
         return False
 
+    async def verify_login(self):
+        """메인 GET 1회로 로그인 상태("로그아웃" 링크)를 확인한다. 유지 중이면 True."""
+        try:
+            text = await self._request_with_retry("GET", config.MAIN_URL, max_retries=2)
+        except Exception as e:
+            self._log(f"[WARN] 로그인 상태 확인 실패: {e}")
+            text = ""
+        self.logged_in = "로그아웃" in text
+        return self.logged_in
+
+    async def resume_session(self, pool, user_id, slot):
+        """세션 풀에 저장된 쿠키로 로그인 상태를 이어받는다. 성공 시 True.
+
+        메인 GET 1회로 "로그아웃" 링크를 확인한다 (연결 예열 겸용).
+        만료됐으면 쿠키를 비우고 False — 호출 측이 login()으로 폴백한다.
+        """
+        if not pool.load(self.session, user_id, slot):
+            return False
+        if await self.verify_login():
+            pool.mark_reused()
+            self._log("[SUCCESS] 저장 세션 재사용")
+            return True
+
+        self.session.cookie_jar.clear()
+        pool.mark_expired(user_id, slot)
+        self._log("[INFO] 저장 세션 만료 — 새로 로그인")
+        return False
+
     async def warmup_connection(self, max_retries=2, total_timeout=None):
         """연결 예열 (로그인 직후 + 오픈 직전 재예열 호출).
 
@@ -253,55 +443,29 @@ class TennisReservationAsync:
             return None
 
     def get_available_slots(self, html_content):
-        """예약 가능 시간대 파싱. BeautifulSoup은 동기 유지 (빠른 CPU 작업)."""
-        available = []
+        """예약 가능 시간대 파싱 (html_extract 엔진, 동기 CPU 작업)."""
         try:
-            soup = BeautifulSoup(html_content, "html.parser")
-            for row in soup.find_all("tr"):
-                checkbox = row.find("input", {"name": "rent_chk[]"})
-                if not checkbox or checkbox.get("disabled"):
-                    continue
-                if "일정있음" in row.get_text():
-                    continue
-                value = checkbox.get("value", "")
-                if len(value) >= 8:
-                    available.append({
-                        "value": value,
-                        "start": f"{value[:2]}:{value[2:4]}",
-                        "end": f"{value[4:6]}:{value[6:8]}",
-                        "start_hour": int(value[:2]),
-                    })
+            return html_extract.extract_slots(html_content)
         except Exception as e:
             self._log(f"[ERROR] 시간대 파싱 오류: {e}")
-        return available
+            return []
 
     def _collect_document_form(self, html, worker_id=None):
         """페이지 HTML에서 DocumentForm 필드를 수집한다. 실패 시 None."""
-        soup = BeautifulSoup(html, "html.parser")
-        doc_form = soup.find("form", {"name": "DocumentForm"})
-        if not doc_form:
+        form_data = html_extract.extract_document_form(html)
+        if form_data is None:
             self._log("[WARN] DocumentForm을 찾을 수 없음", worker_id)
-            return None
-
-        form_data = {
-            inp["name"]: inp.get("value", "")
-            for inp in doc_form.find_all("input")
-            if inp.get("name")
-        }
-        for select in doc_form.find_all("select"):
-            if select.get("name"):
-                selected = select.find("option", selected=True)
-                if selected:
-                    form_data[select["name"]] = selected.get("value", "")
         return form_data
 
     async def prefetch_form(self, court_number, year, month, day, worker_id=None,
-                            max_retries=2, total_timeout=8):
+                            max_retries=2, total_timeout=8, hour=None):
         """정각 전에 대상 페이지를 조회해 DocumentForm 필드를 캐시한다.
 
         성공 시 reserve()가 정각에 페이지 GET 없이 apply.php POST부터 시작한다.
         연결 예열 효과 겸용. 실패해도 기존 캐시·GET 경로 폴백이 있어 무해하다.
         재시도·타임아웃을 짧게 잡아 정각 전에 반드시 끝나게 한다.
+
+        hour가 주어지면 apply/proc 본문까지 미리 인코딩해 둔다 (CompiledSubmit).
         """
         court_value = config.COURT_VALUE_MAP.get(court_number)
         if not court_value:
@@ -331,6 +495,9 @@ class TennisReservationAsync:
         form_data.setdefault("rent_gubun", "1001")
         form_data.setdefault("TotalPay", "0")
         self.prefetched_form = form_data
+        if hour is not None:
+            self.compiled_submit = CompiledSubmit(
+                form_data, court_number, _predict_time_value(hour))
         self._log("[INFO] 폼 프리페치 완료 — 정각에 apply부터 시작", worker_id)
         return True
 
@@ -355,66 +522,70 @@ class TennisReservationAsync:
 
         for attempt in range(config.SUBMIT_MAX_ATTEMPTS):
             try:
-                # Step 1: DocumentForm 필드 수집
-                # 우선순위: 프리페치 캐시 → reserve()가 조회한 HTML → 재조회
+                # Step 1: apply 본문 준비
+                # 우선순위: 컴파일된 본문 → 프리페치 캐시 → reserve()가 조회한 HTML → 재조회
                 # (캐시·재사용은 1회용 — 실패 후 재시도부터는 항상 재조회)
-                if self.prefetched_form is not None:
-                    form_data = dict(self.prefetched_form)
+                compiled, self.compiled_submit = self.compiled_submit, None
+                if compiled is not None and (
+                        compiled.court_number, compiled.time_value) != (court_number, time_value):
+                    compiled = None
+
+                if compiled is not None:
                     self.prefetched_form = None
-                elif page_html is not None:
-                    html, page_html = page_html, None
-                    form_data = self._collect_document_form(html, worker_id)
+                    t_build = time.perf_counter()
+                    apply_body = compiled.apply_body
+                    self._record_client("apply_body", t_build, compiled=True)
                 else:
-                    html = await self.get_reservation_page(
-                        court_number, year, month, day,
-                        max_retries=config.CRITICAL_MAX_RETRIES
-                    )
-                    form_data = self._collect_document_form(html, worker_id) if html else None
-                if not form_data:
-                    continue
-
-                form_data["place_opt"] = config.COURT_VALUE_MAP[court_number]
-                form_data["rent_chk[]"] = time_value
-                form_data["use_time"] = "2"
+                    if self.prefetched_form is not None:
+                        form_data = self.prefetched_form
+                        self.prefetched_form = None
+                    else:
+                        if page_html is not None:
+                            html, page_html = page_html, None
+                        else:
+                            html = await self.get_reservation_page(
+                                court_number, year, month, day,
+                                max_retries=config.CRITICAL_MAX_RETRIES
+                            )
+                        form_data = None
+                        if html:
+                            form_data = await self._parse(
+                                html_extract.extract_document_form, html)
+                            if form_data is None:
+                                self._log("[WARN] DocumentForm을 찾을 수 없음", worker_id)
+                    if not form_data:
+                        continue
+                    t_build = time.perf_counter()
+                    apply_fields = build_apply_fields(form_data, court_number, time_value)
+                    apply_body = encode_fields(apply_fields)
+                    self._record_client("apply_body", t_build, compiled=False)
 
                 # Step 2: useForm 사용자 정보 수집
                 apply_url = urljoin(config.MAIN_URL, "/rent/rent_period_apply.php")
                 apply_text = await self._request_with_retry(
-                    "POST", apply_url, data=form_data,
-                    max_retries=config.CRITICAL_MAX_RETRIES
+                    "POST", apply_url, data=apply_body, headers=FORM_HEADERS,
+                    max_retries=config.CRITICAL_MAX_RETRIES, scan=USE_FORM
                 )
 
-                soup2 = BeautifulSoup(apply_text, "html.parser")
-                use_form = soup2.find("form", {"name": "useForm"})
-                if not use_form:
+                use_fields = await self._parse(html_extract.extract_use_form, apply_text)
+                if use_fields is None:
                     self._log("[WARN] 신청서 폼(useForm)을 찾을 수 없음", worker_id)
                     continue
 
-                for inp in use_form.find_all(["input", "textarea"]):
-                    if inp.get("name"):
-                        val = (inp.get("value", "")
-                               if inp.name != "textarea" else inp.get_text())
-                        if val:
-                            form_data[inp["name"]] = val
-
-                # 필수 필드 설정
-                form_data["regno"] = "0000000000000"
-                form_data["com_nm"] = form_data.get("com_nm") or "개인"
-                form_data["apply_chk2"] = "1"
-                form_data["apply_chk"] = "1"
-                form_data["stime"] = time_value[:2]
-                form_data["etime"] = time_value[4:6]
-                form_data["rent_stime"] = time_value[:4]
-                form_data["rent_etime"] = time_value[4:8]
-                form_data["rent_p_stime"] = ""
-                form_data["rent_p_etime"] = ""
+                t_build = time.perf_counter()
+                if compiled is not None:
+                    proc_body = compiled.proc_body(use_fields)
+                else:
+                    proc_body = encode_fields(
+                        build_proc_fields(apply_fields, use_fields, time_value))
+                self._record_client("proc_body", t_build, compiled=compiled is not None)
 
                 # Step 3: 최종 제출
                 proc_url = urljoin(config.MAIN_URL, "/rent/rent_period_proc.php")
                 self._log("[INFO] 최종 제출 중...", worker_id)
                 result_text = await self._request_with_retry(
-                    "POST", proc_url, data=form_data,
-                    max_retries=config.CRITICAL_MAX_RETRIES
+                    "POST", proc_url, data=proc_body, headers=FORM_HEADERS,
+                    max_retries=config.CRITICAL_MAX_RETRIES, scan=PROC_RESULT
                 )
 
                 # ── 실패 조건 (먼저 검사) ──────────────────────────────
@@ -470,7 +641,7 @@ class TennisReservationAsync:
                 # 프리페치 경로: 페이지 조회·슬롯 확인을 생략하고 apply부터 시작.
                 # 슬롯 값은 "시작HHMM+2시간" 형식으로 예측 가능하며,
                 # 선점 실패 여부는 proc.php 응답 메시지로 판정된다.
-                time_value = f"{target_hour:02d}00{target_hour + 2:02d}00"
+                time_value = _predict_time_value(target_hour)
                 self._log("[INFO] 프리페치 폼 사용 — 페이지 조회 생략", worker_id)
                 success, message = await self.submit_reservation(
                     court_number, dt.year, dt.month, dt.day,
@@ -491,7 +662,7 @@ class TennisReservationAsync:
                 if not html:
                     return False, "예약 페이지 조회 실패"
 
-                available = self.get_available_slots(html)
+                available = await self._parse(html_extract.extract_slots, html)
                 if not available:
                     self._log("[WARN] 예약 가능 시간대 없음", worker_id)
                     return False, "예약 가능 시간대 없음"
@@ -523,14 +694,22 @@ class TennisReservationAsync:
     async def close(self):
         if self.session and not self.session.closed:
             await self.session.close()
+        if self.session_lease is not None:
+            self.session_lease.release()
+            self.session_lease = None
 
 
-def _build_tasks(dates=None, hours=None, court=None, courts=None, reservations=None):
-    """예약 작업 목록 조립 (config.py 방법 1/2/3 지원)."""
+def _build_tasks(dates=None, hours=None, court=None, courts=None, reservations=None,
+                 cfg=None):
+    """예약 작업 목록 조립 (config.py 방법 1/2/3 지원).
+
+    cfg: 예약 조건 dict (미지정 시 config.RESERVATION_CONFIG). 다중 계정 모드에서
+         계정별 reservation_config를 넘길 때 사용한다.
+    """
     if reservations is not None:
         return [(r["date"], r["hour"], r["court"]) for r in reservations]
 
-    cfg = config.RESERVATION_CONFIG
+    cfg = cfg or config.RESERVATION_CONFIG
 
     if "reservations" in cfg:
         return [(r["date"], r["hour"], r["court"]) for r in cfg["reservations"]]
@@ -558,153 +737,439 @@ def _build_tasks(dates=None, hours=None, court=None, courts=None, reservations=N
     return [(d, h, c) for d in dates for h in hours for c in court_list]
 
 
-async def run_reservation_async(
-    test_mode=False, dates=None, hours=None, court=None, courts=None,
-    reservations=None, user_id=None, user_pw=None, wait_for_open=True
-):
-    """asyncio 기반 예약 실행.
+async def _run_jobs(jobs, test_mode, wait_for_open, log_path, connector=None):
+    """예약 작업(job) 목록을 단일 이벤트 루프에서 로그인 → 대기 → 발사까지 실행한다.
 
-    예약 1건 = 독립 세션(PHPSESSID) 사용.
-    같은 계정으로 동시에 apply.php → proc.php 를 병렬 요청하면
-    서버 PHP 세션 상태가 덮어쓰여져 "(1-1) 정상적인 방법으로 신청" 오류 발생.
-    따라서 각 예약 작업에 독립 세션을 부여하고, 로그인만 asyncio.gather로 병렬화한다.
+    job: {"user_id", "user_pw", "date", "hour", "court", "tag"}
+         tag는 결과 dict에 그대로 합쳐지는 식별 정보 (다중 계정: account/user_id).
 
-    흐름:
-      Phase 1 (pre-login) : N개 봇 생성 → 모두 비동기 병렬 로그인 — O(1) 시간
-      Phase 2 (wait)      : 예약 오픈 시간까지 비동기 대기
-      Phase 3 (reserve)   : Semaphore로 동시 접속 제한하며 asyncio.gather 동시 실행
+    계정이 섞여 있어도 job마다 독립 세션을 쓰므로 run_reservation_async의
+    "예약 1건 = 세션 1개" 제약을 그대로 지킨다.
 
-    Args:
-        wait_for_open: 예약 오픈 시간까지 대기 여부 (API 호출 시 False)
-    """
-    tasks = _build_tasks(dates, hours, court, courts, reservations)
-    uid = user_id or config.USER_ID
-    upw = user_pw or config.USER_PW
+    config.SHARED_CONNECTOR이면 모든 봇(그림자 세션 포함)이 TCPConnector 하나를
+    공유한다. 쿠키는 세션별이고 연결에는 상태가 없으므로 PHP 세션은 그대로 분리되며,
+    재예열·정각 발사가 봇 수가 아니라 동시 요청 수만큼의 연결만 쓴다
+    (핸드셰이크·파일 디스크립터 절감).
 
-    print("=" * 60)
-    print("고양시 테니스장 자동 예약 (asyncio - 독립 세션)")
-    print("=" * 60)
-    print(f"총 {len(tasks)}개 예약 작업 | 동시 접속 제한: {config.MAX_CONCURRENT}개")
-    for i, (d, h, c) in enumerate(tasks):
-        print(f"  [{i+1}] {d} {h:02d}:00~{h+2:02d}:00 / {c}번 코트")
-    print(f"설정: 최대 {config.MAX_RETRIES}회 재시도, 타임아웃 ({config.CONNECTION_TIMEOUT},{config.READ_TIMEOUT})초")
-    print()
+    config.DNS_PIN이면 로그인 전에 사이트 호스트를 한 번 해석해 가장 빠른 주소를
+    고정하고(dns_pin.py), 모든 커넥터가 그 결과를 실행 내내 재사용한다.
+
+    connector가 주어지면(API 서버의 프로세스 공용 커넥터) 그것을 공유하고
+    닫지 않는다. 이때 DNS 고정·실행별 공유 커넥터는 만들지 않는다.
+
+    Returns:
+        (results, error): 성공 시 (결과 list, None), 중단 시 ([], 사유 문자열)
+    """
+    if connector is not None:
+        return await _fire_jobs(jobs, test_mode, wait_for_open, log_path, connector, None)
+
+    resolver = None
+    if config.DNS_PIN:
+        resolver = PinnedResolver()
+        await resolver.pin(config.MAIN_URL)
+    if config.SHARED_CONNECTOR:
+        # 동시 요청 상한 = 전체 봇 수 (로그인·프리페치는 봇 전원이 동시에 보낸다)
+        n_sessions = len(jobs) * (2 if config.HEDGE else 1)
+        connector = _make_connector(n_sessions, n_sessions, resolver)
+        print(f"[INFO] 공유 커넥터 사용 (연결 상한 {n_sessions}개)")
+    try:
+        return await _fire_jobs(jobs, test_mode, wait_for_open, log_path, connector, resolver)
+    finally:
+        if connector is not None:
+            await connector.close()
+        if resolver is not None:
+            await resolver.close()
 
-    # ── Phase 1: 로그인 전 대기 ──────────────────────────────────
-    if wait_for_open:
-        await wait_before_login_async()
 
+async def _fire_jobs(jobs, test_mode, wait_for_open, log_path, connector, resolver):
+    """_run_jobs 본체. connector가 None이면 봇마다 자체 커넥터를 만든다 (resolver 공유)."""
     # ── Phase 2: N개 봇 생성 + 병렬 로그인 (O(1)) ───────────────
-    async def create_bot(task_idx):
+    # 세션 풀: 지난 실행의 쿠키를 (계정, 슬롯)별로 불러와 검증 GET 1회로 재사용.
+    # 만료된 세션만 전체 로그인(3회 왕복) + 예열로 폴백한다.
+    # 세션 파일은 봇이 닫힐 때까지 임대한다 — 다른 실행이 쓰는 중이면 새로 로그인.
+    pool = SessionPool() if config.SESSION_REUSE else None
+    slots = assign_slots(jobs)
+    # 발사 계획은 로그인 전에 만든다 — 설정 경고가 정각 직전이 아니라 시작 시에 보이게
+    plan = build_fire_plan()
+
+    async def create_bot(task_idx, job, slot):
         bot = TennisReservationAsync()
-        await bot._create_session()
+        await bot._create_session(connector, resolver)
         bot.worker_id = task_idx
-        if await bot.login(uid, upw):
+        if pool:
+            bot.session_lease = pool.lease(job["user_id"], slot)
+            if bot.session_lease is None:
+                bot._log(f"[INFO] 저장 세션 {slot}번을 다른 실행이 사용 중 — 새로 로그인")
+        if bot.session_lease and await bot.resume_session(pool, job["user_id"], slot):
+            bot.session_source = "reused"
+            return bot
+        if await bot.login(job["user_id"], job["user_pw"]):
+            bot.session_source = "login"
+            if bot.session_lease:
+                pool.save(bot.session, job["user_id"], slot)
             await bot.warmup_connection()
             return bot
         await bot.close()
         return None
 
-    print(f"[INFO] {len(tasks)}개 세션 병렬 로그인 시작...")
-    bot_list = await asyncio.gather(*[create_bot(i + 1) for i in range(len(tasks))])
-    bots = [(bot, d, h, c)
-            for bot, (d, h, c) in zip(bot_list, tasks)
-            if bot is not None]
-
-    failed_login = len(tasks) - len(bots)
+    # 헤징 모드: job마다 독립 로그인한 그림자 세션을 하나씩 더 준비한다 (hedge.py)
+    n_shadow = len(jobs) if config.HEDGE else 0
+    print(f"[INFO] {len(jobs) + n_shadow}개 세션 병렬 로그인 시작...")
+    t_login = time.monotonic()
+    bot_list = await asyncio.gather(
+        *[create_bot(i + 1, job, slot)
+          for i, (job, slot) in enumerate(zip(jobs, slots))],
+        *[create_bot(i + 1, job, f"h{slot}")
+          for i, (job, slot) in enumerate(zip(jobs[:n_shadow], slots))],
+    )
+    primary_list, shadow_list = bot_list[:len(jobs)], bot_list[len(jobs):]
+    bots = [(bot, job) for bot, job in zip(primary_list, jobs) if bot is not None]
+    shadows = {}
+    for bot, shadow in zip(primary_list, shadow_list):
+        if shadow is None:
+            continue
+        if bot is None:
+            await shadow.close()
+        else:
+            shadows[bot] = shadow
+
+    failed_login = len(jobs) - len(bots)
     if failed_login:
         print(f"[WARN] {failed_login}개 세션 로그인 실패")
     if not bots:
-        return {"success": False, "results": [], "message": "모든 로그인 실패"}
-    print(f"[INFO] {len(bots)}개 세션 준비 완료")
-
-    # ── Phase 3: 예약 오픈 시간까지 비동기 대기 ──────────────────
-    # 로그인 직후 예열한 연결은 keepalive(클라 30초, 서버 수 초)로 정각 전에
-    # 끊기므로, 대기 루프가 오픈 직전(남은 20초/4초)에 재예열을 트리거한다.
-    # 1차(20초): 대상 페이지 프리페치 — 연결 예열 + DocumentForm 캐시
-    # 2차(4초): 같은 대상 페이지 재프리페치 — 연결 재예열 + 캐시 갱신.
-    #   메인 페이지 GET은 프리페치가 만든 PHP 세션 상태(마지막 조회 페이지)를
-    #   덮어쓸 수 있어 쓰지 않는다. 봇별 지터로 동시 핸드셰이크 폭주를 분산한다.
-    if wait_for_open:
-        rewarm_count = 0
-
-        async def _prefetch(bot, idx, d, c, jitter, **kw):
-            await asyncio.sleep(random.uniform(0, jitter))
-            pdt = datetime.strptime(d, "%Y-%m-%d")
-            await bot.prefetch_form(c, pdt.year, pdt.month, pdt.day,
-                                    worker_id=idx, **kw)
-
-        async def rewarm_all():
-            nonlocal rewarm_count
-            rewarm_count += 1
-            if rewarm_count == 1:
-                await asyncio.gather(
-                    *[_prefetch(bot, i + 1, d, c, jitter=1.0)
-                      for i, (bot, d, h, c) in enumerate(bots)],
-                    return_exceptions=True,
-                )
-            else:
-                # 실패해도 1차 캐시가 남아 있으므로 짧게 1회만 시도
-                await asyncio.gather(
-                    *[_prefetch(bot, i + 1, d, c, jitter=0.3,
-                                max_retries=1, total_timeout=3)
-                      for i, (bot, d, h, c) in enumerate(bots)],
-                    return_exceptions=True,
-                )
-
-        if not await wait_for_reservation_open_async(warmup=rewarm_all):
-            for bot, *_ in bots:
-                await bot.close()
-            return {"success": False, "results": [],
-                    "message": "예약일이 아니거나 이미 지났습니다"}
-
-    # ── Phase 4: 동시 예약 실행 (독립 세션) ─────────────────────
+        return [], "모든 로그인 실패"
+    ready = [bot for bot, _ in bots] + list(shadows.values())
+    reused = sum(1 for bot in ready if bot.session_source == "reused")
+    print(f"[INFO] {len(ready)}개 세션 준비 완료 "
+          f"(재사용 {reused}, 새 로그인 {len(ready) - reused}, "
+          f"{time.monotonic() - t_login:.1f}초)")
+    if config.HEDGE:
+        print(f"[INFO] 헤징 활성: 그림자 세션 {len(shadows)}개, "
+              f"실행당 헤지 최대 {config.HEDGE_MAX}회")
+    tracker = LatencyTracker()
+    budget = HedgeBudget()
+    for bot in ready:
+        bot.latency_observer = tracker.observe
+    # 프리페치 대상: 주 세션 + 그림자 세션 (그림자도 컴파일된 본문으로 바로 발사)
+    warm_targets = bots + [(shadows[bot], job) for bot, job in bots if bot in shadows]
+
+    # ── Phase 2.5: 서버 시계 오프셋 추정 (clock_sync.py) ────────
+    # 정각 판단을 사이트 Date 헤더 기준으로 옮긴다. 1차 재예열(남은 20초) 전에 끝낸다.
+    clock, clock_shift = None, 0.0
+    open_time = reservation_open_time()
+
+    # 연결 유지(keepalive.py): 서버 유휴 종료 시간을 시계 동기화와 병렬로 측정해
+    # 정각 직전 핑 간격을 정한다. 고정 재예열(남은 4초)을 대신한다.
+    keeper, keeper_tasks = None, []
+    if wait_for_open and config.KEEPALIVE and open_time is not None:
+        keeper = KeepAlive(resolver)
+        keeper_tasks.append(asyncio.create_task(
+            keeper.measure(deadline=open_time.timestamp() - config.KEEPALIVE_WINDOW_S)))
+
+    if wait_for_open and config.CLOCK_SYNC and open_time is not None:
+        deadline = open_time.timestamp() - 30
+        if time.time() < deadline:
+            clock = await measure_server_clock(deadline=deadline, resolver=resolver)
+            clock_shift = fire_shift_seconds(clock)
+            if clock:
+                clock["applied_ms"] = round(clock_shift * 1000, 1)
+                print(f"[CLOCK] 서버 시계 오프셋 {clock['offset_ms']:+.1f}ms "
+                      f"(±{clock['uncertainty_ms']:.1f}ms, RTT {clock['rtt_ms']:.1f}ms, "
+                      f"샘플 {clock['samples']}개"
+                      f"{'' if clock['consistent'] else ', 구간 불일치'})")
+
+    # ── 발사 워커 준비 (Phase 4에서 실행) ───────────────────────
+    # 워커는 정각 전에 미리 만들어 FireScheduler 이벤트 하나에서 대기한다.
+    # 정각에 이벤트가 set되면 태스크 생성·스케줄링 없이 전원이 바로 출발한다.
     sem = asyncio.Semaphore(config.MAX_CONCURRENT)
-    log_path = LOGS_DIR / f"timing_{datetime.now():%Y%m%d_%H%M%S}_{uid}.jsonl"
-
-    async def worker(bot, task_idx, d, h, c):
+    scheduler = FireScheduler()
+    # 발사 계획(fire_plan.py): 작업 순서(우선순위)대로 웨이브에 배정. 없으면 균등 지터.
+    waves = plan.assign(len(bots)) if plan else [(None, None)] * len(bots)
+    if plan:
+        print(f"[INFO] 발사 계획 {plan.describe()}")
+
+    async def worker(bot, task_idx, job, wave):
+        d, h, c = job["date"], job["hour"], job["court"]
+        wave_idx, wave_offset_ms = wave
+        await scheduler.wait()
+        wake_ms = round((time.perf_counter_ns() - scheduler.fired_ns) / 1e6, 3)
+        if wave_offset_ms:
+            # 웨이브 대기는 세마포어 밖에서 — 뒤 웨이브가 앞 웨이브의 슬롯을 잡지 않게
+            delay_ns = scheduler.fired_ns + int(wave_offset_ms * 1e6) - time.perf_counter_ns()
+            if delay_ns > 0:
+                await asyncio.sleep(delay_ns / 1e9)
         t_queued = time.monotonic()
         async with sem:
             sem_wait_ms = round((time.monotonic() - t_queued) * 1000, 1)
-            # 발사 지터: 동일 IP 동시 폭주로 인한 서버 큐잉·차단 완화
-            if config.FIRE_JITTER_MS > 0:
+            # 발사 지터: 동일 IP 동시 폭주로 인한 서버 큐잉·차단 완화 (발사 계획 미사용 시)
+            if plan is None and config.FIRE_JITTER_MS > 0:
                 await asyncio.sleep(random.uniform(0, config.FIRE_JITTER_MS / 1000))
             fire_ts = datetime.now().isoformat(timespec="milliseconds")
             t_fire = time.monotonic()
-            success, message = False, "예외 발생"
+            n_before_fire = len(bot.timing)
+            bot.fire_window = True
+            shadow = shadows.get(bot)
+            success, message, hedge_info = False, "예외 발생", None
             try:
-                success, message = await bot.reserve(d, h, c, test_mode, worker_id=task_idx)
-                return {"date": d, "hour": h, "court": c,
+                if shadow is not None:
+                    success, message, hedge_info = await hedged_reserve(
+                        bot, shadow, tracker, budget, d, h, c, test_mode,
+                        worker_id=task_idx)
+                else:
+                    success, message = await bot.reserve(d, h, c, test_mode,
+                                                         worker_id=task_idx)
+                return {**job["tag"], "date": d, "hour": h, "court": c,
                         "success": success, "message": message}
             finally:
+                bot.fire_window = False
                 await bot.close()
+                if shadow is not None:
+                    shadow.fire_window = False
+                    await shadow.close()
+                net_ms, parse_ms, client_ms = _fire_breakdown(bot.timing[n_before_fire:])
+                fire_conn = fire_conn_summary(bot.timing[n_before_fire:])
+                for k, v in fire_conn.items():
+                    fire_conn_total[k] += v
+                if hedge_info and hedge_info["hedged"]:
+                    hedge_info["events"] = shadow.timing
                 # 예약 1건 요약 + 로그인부터의 전체 요청 이벤트 (분석용)
                 _dump_timing(log_path, {
-                    "worker": task_idx, "user_id": uid,
+                    **job["tag"],
+                    "worker": task_idx, "user_id": job["user_id"],
                     "date": d, "hour": h, "court": c,
                     "fire_ts": fire_ts, "sem_wait_ms": sem_wait_ms,
+                    "fire_lateness_ms": scheduler.lateness_ms, "wake_ms": wake_ms,
+                    "wave": wave_idx, "wave_offset_ms": wave_offset_ms,
                     "total_ms": round((time.monotonic() - t_fire) * 1000, 1),
+                    "net_ms": net_ms, "parse_ms": parse_ms, "client_ms": client_ms,
+                    "parse_offload": config.PARSE_OFFLOAD,
+                    "session": bot.session_source,
+                    "fire_conn": fire_conn,
+                    "keepalive": keeper.summary() if keeper else None,
+                    "dns": resolver.summary() if resolver else None,
+                    "hedge": hedge_info,
+                    "clock": clock,
                     "success": success, "message": message,
                     "events": bot.timing,
                 })
 
-    results = list(await asyncio.gather(
-        *[worker(bot, i + 1, d, h, c) for i, (bot, d, h, c) in enumerate(bots)]
-    ))
+    fire_conn_total = {"reused": 0, "new": 0}
+    worker_tasks = [asyncio.create_task(worker(bot, i + 1, job, wave))
+                    for i, ((bot, job), wave) in enumerate(zip(bots, waves))]
+
+    _acquire_parse_executor()
+    try:
+        # ── Phase 3: 예약 오픈 시간까지 비동기 대기 ──────────────────
+        # 로그인 직후 예열한 연결은 keepalive(클라 30초, 서버 수 초)로 정각 전에
+        # 끊기므로, 대기 루프가 오픈 직전(남은 20초/4초)에 재예열을 트리거한다.
+        # 1차(20초): 대상 페이지 프리페치 — 연결 예열 + DocumentForm 캐시
+        # 2차(4초): 같은 대상 페이지 재프리페치 — 연결 재예열 + 캐시 갱신.
+        #   메인 페이지 GET은 프리페치가 만든 PHP 세션 상태(마지막 조회 페이지)를
+        #   덮어쓸 수 있어 쓰지 않는다. 봇별 지터로 동시 핸드셰이크 폭주를 분산한다.
+        if wait_for_open:
+            rewarm_count = 0
+
+            async def _prefetch(bot, idx, job, jitter, **kw):
+                await asyncio.sleep(random.uniform(0, jitter))
+                pdt = datetime.strptime(job["date"], "%Y-%m-%d")
+                await bot.prefetch_form(job["court"], pdt.year, pdt.month, pdt.day,
+                                        worker_id=idx, hour=job["hour"], **kw)
+
+            async def rewarm_all():
+                nonlocal rewarm_count
+                rewarm_count += 1
+                if rewarm_count == 1:
+                    await asyncio.gather(
+                        _warm_parse_executor(),
+                        *[_prefetch(bot, bot.worker_id, job, jitter=1.0)
+                          for bot, job in warm_targets],
+                        return_exceptions=True,
+                    )
+                else:
+                    # 실패해도 1차 캐시가 남아 있으므로 짧게 1회만 시도
+                    await asyncio.gather(
+                        *[_prefetch(bot, bot.worker_id, job, jitter=0.3,
+                                    max_retries=1, total_timeout=3)
+                          for bot, job in warm_targets],
+                        return_exceptions=True,
+                    )
 
+            warmup_marks = (20, 4)
+            if keeper is not None:
+                # 2차(4초) 재예열 대신 측정된 유휴 종료 시간에 맞춘 핑으로 연결을 유지한다
+                warmup_marks = (20,)
+                keeper_tasks.append(asyncio.create_task(keeper.maintain(
+                    [bot.session for bot in ready], open_time.timestamp() - clock_shift)))
+            opened = await wait_for_reservation_open_async(warmup=rewarm_all,
+                                                           clock_offset=clock_shift,
+                                                           scheduler=scheduler,
+                                                           warmup_marks=warmup_marks)
+            for t in keeper_tasks:
+                t.cancel()
+            if not opened:
+                for t in worker_tasks:
+                    t.cancel()
+                await asyncio.gather(*worker_tasks, return_exceptions=True)
+                for bot, _ in warm_targets:
+                    await bot.close()
+                return [], "예약일이 아니거나 이미 지났습니다"
+        else:
+            await _warm_parse_executor()
+            scheduler.fire_now()
+
+        # ── Phase 4: 동시 예약 실행 (독립 세션) ─────────────────────
+        results = list(await asyncio.gather(*worker_tasks))
+    finally:
+        _release_parse_executor()
+    if keeper is not None:
+        ka = keeper.summary()
+        print(f"[KEEPALIVE] 발사 요청 연결: 재사용 {fire_conn_total['reused']}, "
+              f"새 연결 {fire_conn_total['new']} (서버 유휴 종료 ≈{ka['idle_timeout_s']}초, "
+              f"핑 {ka['ping_rounds']}회 × 세션 {len(ready)}개, 핑 간격 {ka['ping_interval_s']}초)")
+    return results, None
+
+
+def _print_results(results):
+    """[결과] 블록을 출력하고 성공 건수를 반환한다."""
     success_count = sum(1 for r in results if r["success"])
     print()
     print("=" * 60)
     print("[결과]")
     for r in results:
         status = "성공" if r["success"] else "실패"
-        print(f"  {r['date']} {r['hour']:02d}:00 {r['court']}번 코트 - {status} ({r['message']})")
+        who = f"[계정 {r['account']}] " if "account" in r else ""
+        print(f"  {who}{r['date']} {r['hour']:02d}:00 {r['court']}번 코트 - {status} ({r['message']})")
     print(f"총 {success_count}/{len(results)}건 성공")
     print("=" * 60)
+    return success_count
+
+
+async def run_reservation_async(
+    test_mode=False, dates=None, hours=None, court=None, courts=None,
+    reservations=None, user_id=None, user_pw=None, wait_for_open=True,
+    connector=None,
+):
+    """asyncio 기반 예약 실행.
+
+    예약 1건 = 독립 세션(PHPSESSID) 사용.
+    같은 계정으로 동시에 apply.php → proc.php 를 병렬 요청하면
+    서버 PHP 세션 상태가 덮어쓰여져 "(1-1) 정상적인 방법으로 신청" 오류 발생.
+    따라서 각 예약 작업에 독립 세션을 부여하고, 로그인만 asyncio.gather로 병렬화한다.
+
+    흐름:
+      Phase 1 (pre-login) : N개 봇 생성 → 모두 비동기 병렬 로그인 — O(1) 시간
+      Phase 2 (wait)      : 예약 오픈 시간까지 비동기 대기
+      Phase 3 (reserve)   : Semaphore로 동시 접속 제한하며 asyncio.gather 동시 실행
+
+    Args:
+        wait_for_open: 예약 오픈 시간까지 대기 여부 (API 호출 시 False)
+        connector: 공유할 TCPConnector (API 서버). 주어지면 닫지 않는다.
+    """
+    tasks = _build_tasks(dates, hours, court, courts, reservations)
+    uid = user_id or config.USER_ID
+    upw = user_pw or config.USER_PW
+
+    print("=" * 60)
+    print("고양시 테니스장 자동 예약 (asyncio - 독립 세션)")
+    print("=" * 60)
+    print(f"총 {len(tasks)}개 예약 작업 | 동시 접속 제한: {config.MAX_CONCURRENT}개")
+    for i, (d, h, c) in enumerate(tasks):
+        print(f"  [{i+1}] {d} {h:02d}:00~{h+2:02d}:00 / {c}번 코트")
+    print(f"설정: 최대 {config.MAX_RETRIES}회 재시도, 타임아웃 ({config.CONNECTION_TIMEOUT},{config.READ_TIMEOUT})초")
+    print()
+
+    # ── Phase 1: 로그인 전 대기 ──────────────────────────────────
+    if wait_for_open:
+        await wait_before_login_async()
+
+    jobs = [{"user_id": uid, "user_pw": upw, "date": d, "hour": h, "court": c,
+             "tag": {}}
+            for d, h, c in tasks]
+    log_path = LOGS_DIR / f"timing_{datetime.now():%Y%m%d_%H%M%S}_{uid}.jsonl"
+    results, error = await _run_jobs(jobs, test_mode, wait_for_open, log_path, connector)
+    if error:
+        return {"success": False, "results": [], "message": error}
+
+    success_count = _print_results(results)
+    return {
+        "success": success_count > 0,
+        "results": results,
+        "summary": f"{success_count}/{len(results)}건 성공",
+    }
+
+
+async def run_accounts_async(accounts, test_mode=False, wait_for_open=True):
+    """다중 계정을 단일 프로세스·단일 이벤트 루프에서 실행한다.
+
+    launch.py의 계정당 프로세스(main.py --account N) 방식과 달리 인터프리터·
+    모듈 로드·이벤트 루프를 한 벌만 쓰고, 로그인·프리페치·정각 발사를 모든
+    계정이 한 웨이브로 공유한다. 계정마다 20개 루프가 같은 초에 깨어나
+    CPU를 다투는 대신 정각 발사 시점이 계정 간에 조율된다.
+
+    Args:
+        accounts: config.load_accounts() 형식 리스트. reservation_config가
+                  None인 계정은 config.RESERVATION_CONFIG를 사용한다.
+
+    Returns:
+        dict: {"success", "results", "accounts", "summary"} — results 각 항목에
+              account/user_id가 포함되고, accounts는 계정별 집계.
+    """
+    jobs = []
+    for a in accounts:
+        tasks = _build_tasks(cfg=a.get("reservation_config"))
+        jobs += [{"user_id": a["user_id"], "user_pw": a["user_pw"],
+                  "date": d, "hour": h, "court": c,
+                  "tag": {"account": a["num"], "user_id": a["user_id"]}}
+                 for d, h, c in tasks]
+
+    print("=" * 60)
+    print("고양시 테니스장 자동 예약 (asyncio - 다중 계정 단일 프로세스)")
+    print("=" * 60)
+    print(f"계정 {len(accounts)}개 | 총 {len(jobs)}개 예약 작업 | "
+          f"동시 접속 제한: {config.MAX_CONCURRENT}개")
+    for i, job in enumerate(jobs):
+        print(f"  [{i+1}] 계정 {job['tag']['account']} ({job['user_id']}) "
+              f"{job['date']} {job['hour']:02d}:00~{job['hour']+2:02d}:00 / "
+              f"{job['court']}번 코트")
+    print()
+
+    if not jobs:
+        return {"success": False, "results": [], "accounts": [],
+                "message": "예약 작업 없음"}
+
+    if wait_for_open:
+        await wait_before_login_async()
+
+    log_path = LOGS_DIR / f"timing_{datetime.now():%Y%m%d_%H%M%S}_all.jsonl"
+    results, error = await _run_jobs(jobs, test_mode, wait_for_open, log_path)
+    if error:
+        return {"success": False, "results": [], "accounts": [], "message": error}
+
+    success_count = _print_results(results)
+
+    per_account = []
+    for a in accounts:
+        mine = [r for r in results if r["account"] == a["num"]]
+        planned = sum(1 for job in jobs if job["tag"]["account"] == a["num"])
+        ok = sum(1 for r in mine if r["success"])
+        per_account.append({
+            "account": a["num"], "user_id": a["user_id"],
+            "planned": planned, "attempted": len(mine), "success_count": ok,
+            "summary": f"{ok}/{planned}건 성공",
+        })
+
+    print("[계정별 요약]")
+    for s in per_account:
+        failed_login = s["planned"] - s["attempted"]
+        note = f" (로그인 실패 {failed_login}건)" if failed_login else ""
+        print(f"  계정 {s['account']:2d} ({s['user_id']}): {s['summary']}{note}")
+    print(f"[INFO] 타이밍 로그: {log_path}")
+    print("=" * 60)
 
     return {
         "success": success_count > 0,
         "results": results,
+        "accounts": per_account,
         "summary": f"{success_count}/{len(results)}건 성공",
     }
 
@@ -729,19 +1194,73 @@ def get_all_days_in_month(year, month):
     ]
 
 
-def is_likely_closure(slots):
-    """모든 슬롯(8개: 06:00~22:00)이 비어있으면 휴장일로 추정."""
-    if len(slots) >= 8:
-        available_hours = {s["start_hour"] for s in slots}
-        if set(config.AVAILABLE_HOURS).issubset(available_hours):
-            return True
-    return False
+@asynccontextmanager
+async def _search_session(bot, user_id, user_pw):
+    """조회용 세션. 로그인된 bot이 주어지면 빌려 쓰고 닫지 않는다.
+
+    직접 만든 세션은 로그인 실패 시 None을 내준다.
+    """
+    if bot is not None:
+        yield bot
+        return
+    async with TennisReservationAsync() as own:
+        yield own if await own.login(user_id, user_pw) else None
+
+
+@asynccontextmanager
+async def _search_shards(count, exclude=None):
+    """분할 검색용 추가 세션. config.load_accounts()에서 exclude 계정을 빼고
+    count개까지 동시에 로그인한다. 로그인에 실패한 계정은 빼고 내준다.
+    """
+    accounts = [a for a in config.load_accounts() if a["user_id"] != exclude][:max(0, count)]
+    if not accounts:
+        yield []
+        return
+    bots = [TennisReservationAsync() for _ in accounts]
+    try:
+        for b in bots:
+            await b._create_session()
+        ok = await asyncio.gather(
+            *(b.login(a["user_id"], a["user_pw"]) for b, a in zip(bots, accounts)))
+        ready = [b for b, logged_in in zip(bots, ok) if logged_in]
+        print(f"[INFO] 분할 검색: 추가 계정 {len(ready)}/{len(accounts)}개 로그인")
+        yield ready
+    finally:
+        for b in bots:
+            await b.close()
+
+
+def _extra_shards(shards):
+    return (config.SEARCH_SHARDS if shards is None else shards) - 1
+
+
+def _emit_progress(on_result, date_str, found, closed, d, dates):
+    """on_result({"date", "found", "closed", "done", "total"}) 호출 (없으면 무시)."""
+    if on_result is None:
+        return
+    on_result({
+        "date": date_str,
+        "found": found,
+        "closed": closed,
+        "done": dates.index(d) + 1,
+        "total": len(dates),
+    })
 
 
 async def search_available_slots_async(
-    year, month, courts=None, hours=None, verbose=True, user_id=None, user_pw=None
+    year, month, courts=None, hours=None, verbose=True, user_id=None, user_pw=None,
+    bot=None, concurrency=None, on_result=None, shards=None, max_age=None,
 ):
-    """해당 월 토/일 예약 가능 시간대 검색 (비동기)."""
+    """해당 월 토/일 예약 가능 시간대 검색 (비동기).
+
+    bot: 로그인된 TennisReservationAsync (API 서버 세션 재사용). 없으면 새로 로그인.
+    concurrency: 동시 페이지 조회 수 (기본 config.SEARCH_CONCURRENCY, search_pipeline.py)
+    on_result: 날짜 하나가 끝날 때마다 날짜 순서대로 호출 — _emit_progress 참고.
+    shards: 조회에 쓸 계정 수 (기본 config.SEARCH_SHARDS). 2 이상이면
+            config.load_accounts()의 다른 계정으로도 로그인해 페이지를 나눠 조회한다.
+    max_age: 이보다 새(초) 캐시 항목은 다시 조회하지 않는다 (0 = 모두 새로 조회,
+             기본 config.AVAIL_CACHE_MAX_AGE_S, avail_cache.py).
+    """
     courts = courts or config.ALL_COURTS
     hours = hours or config.SEARCH_DEFAULT_HOURS
     weekends = get_weekends_in_month(year, month)
@@ -757,53 +1276,55 @@ async def search_available_slots_async(
     print("=" * 70)
     print()
 
-    async with TennisReservationAsync() as bot:
-        if not await bot.login(user_id, user_pw):
+    async with _search_session(bot, user_id, user_pw) as bot:
+        if bot is None:
             return {"error": "로그인 실패", "results": []}
 
-        results = []
+        bitmap = SlotBitmap()
         skipped_dates = set()
-        day_names = ["월", "화", "수", "목", "금", "토", "일"]
+        wanted = mask_of_hours(hours)
 
-        for d in weekends:
-            day_name = day_names[d.weekday()]
-            date_str = f"{d.year}-{d.month:02d}-{d.day:02d}"
+        def on_date(d, pages):
+            day_name = DAY_NAMES[d.weekday()]
+            date_str = d.isoformat()
+            day = SlotBitmap()
 
             if verbose:
                 print(f"[검색] {date_str} ({day_name})")
 
             date_skipped = False
+            closed = False   # 휴장일 추정 — verbose와 무관하게 진행 이벤트에 싣는다
             for court in courts:
-                html = await bot.get_reservation_page(court, d.year, d.month, d.day)
-                if not html:
+                free = pages[court]
+                if free is None:
                     if verbose:
                         print(f"  {court}코트: 페이지 조회 실패")
                     continue
 
-                slots = bot.get_available_slots(html)
-
-                if is_likely_closure(slots):
+                if is_closure(free):
+                    closed = True
                     if verbose and not date_skipped:
                         print(f"  ※ 휴장일 추정 - 제외")
                         date_skipped = True
                         skipped_dates.add(date_str)
                     continue
 
-                for hour in hours:
-                    if hour in [s["start_hour"] for s in slots]:
-                        results.append({
-                            "date": date_str, "day": day_name,
-                            "court": court, "hour": hour,
-                            "time": f"{hour:02d}:00~{hour+2:02d}:00",
-                        })
-                        if verbose:
-                            print(f"  ○ {court}코트 {hour:02d}:00~{hour+2:02d}:00 빈자리")
-
-                await asyncio.sleep(0.1)
+                day.set_court(d, court, free & wanted)
+                if verbose:
+                    for hour in hours_of(free & wanted):
+                        print(f"  ○ {court}코트 {hour:02d}:00~{hour+2:02d}:00 빈자리")
 
             if verbose:
                 print()
+            bitmap.set(d, day.get(d))
+            _emit_progress(on_result, date_str, day.to_results(courts, hours), closed,
+                           d, weekends)
 
+        async with _search_shards(_extra_shards(shards), exclude=user_id) as extra:
+            await fetch_by_date([bot] + extra, weekends, courts, concurrency=concurrency,
+                                on_date=on_date, max_age=max_age)
+
+    results = bitmap.to_results(courts, hours)
     print("=" * 70)
     if skipped_dates:
         print(f"  검색 결과: 총 {len(results)}건 빈자리 (휴장일 {len(skipped_dates)}일 제외)")
@@ -822,13 +1343,24 @@ async def search_available_slots_async(
     print()
     print("=" * 70)
 
-    return {"year": year, "month": month, "total": len(results), "results": results}
+    return {"year": year, "month": month, "total": len(results), "results": results,
+            "bitmap": bitmap.to_json()}
 
 
 async def search_all_slots_async(
-    year, month, courts=None, verbose=True, user_id=None, user_pw=None
+    year, month, courts=None, verbose=True, user_id=None, user_pw=None,
+    bot=None, concurrency=None, on_result=None, shards=None, max_age=None,
 ):
-    """해당 월 전체 날짜/시간 예약 가능 시간대 검색 (비동기)."""
+    """해당 월 전체 날짜/시간 예약 가능 시간대 검색 (비동기).
+
+    bot: 로그인된 TennisReservationAsync (API 서버 세션 재사용). 없으면 새로 로그인.
+    concurrency: 동시 페이지 조회 수 (기본 config.SEARCH_CONCURRENCY, search_pipeline.py)
+    on_result: 날짜 하나가 끝날 때마다 날짜 순서대로 호출 — _emit_progress 참고.
+    shards: 조회에 쓸 계정 수 (기본 config.SEARCH_SHARDS). 2 이상이면
+            config.load_accounts()의 다른 계정으로도 로그인해 페이지를 나눠 조회한다.
+    max_age: 이보다 새(초) 캐시 항목은 다시 조회하지 않는다 (0 = 모두 새로 조회,
+             기본 config.AVAIL_CACHE_MAX_AGE_S, avail_cache.py).
+    """
     courts = courts or config.ALL_COURTS
     all_hours = config.AVAILABLE_HOURS
     all_days = get_all_days_in_month(year, month)
@@ -847,59 +1379,59 @@ async def search_all_slots_async(
     print("=" * 70)
     print()
 
-    async with TennisReservationAsync() as bot:
-        if not await bot.login(user_id, user_pw):
+    async with _search_session(bot, user_id, user_pw) as bot:
+        if bot is None:
             return {"error": "로그인 실패", "results": []}
 
-        results = []
+        bitmap = SlotBitmap()
         skipped_dates = set()
-        day_names = ["월", "화", "수", "목", "금", "토", "일"]
+        dates = [d for d, _ in all_days]
 
-        for d, weekday in all_days:
-            day_name = day_names[weekday]
-            date_str = f"{d.year}-{d.month:02d}-{d.day:02d}"
+        def on_date(d, pages):
+            weekday = d.weekday()
+            day_name = DAY_NAMES[weekday]
+            date_str = d.isoformat()
             is_weekend = weekday in (5, 6)
+            color = BLUE if is_weekend else ""
+            reset = RESET if is_weekend else ""
+            day = SlotBitmap()
 
             if verbose:
-                color = BLUE if is_weekend else ""
-                reset = RESET if is_weekend else ""
                 print(f"{color}[검색] {date_str} ({day_name}){reset}")
 
             date_skipped = False
+            closed = False   # 휴장일 추정 — verbose와 무관하게 진행 이벤트에 싣는다
             for court in courts:
-                html = await bot.get_reservation_page(court, d.year, d.month, d.day)
-                if not html:
+                free = pages[court]
+                if free is None:
                     if verbose:
                         print(f"  {court}코트: 페이지 조회 실패")
                     continue
 
-                slots = bot.get_available_slots(html)
-
-                if is_likely_closure(slots):
+                if is_closure(free):
+                    closed = True
                     if verbose and not date_skipped:
                         print(f"  ※ 휴장일 추정 - 제외")
                         date_skipped = True
                         skipped_dates.add(date_str)
                     break
 
-                for hour in all_hours:
-                    if hour in [s["start_hour"] for s in slots]:
-                        results.append({
-                            "date": date_str, "day": day_name,
-                            "court": court, "hour": hour,
-                            "time": f"{hour:02d}:00~{hour+2:02d}:00",
-                            "is_weekend": is_weekend,
-                        })
-                        if verbose:
-                            color = BLUE if is_weekend else ""
-                            reset = RESET if is_weekend else ""
-                            print(f"  {color}○ {court}코트 {hour:02d}:00~{hour+2:02d}:00 빈자리{reset}")
-
-                await asyncio.sleep(0.1)
+                day.set_court(d, court, free)
+                if verbose:
+                    for hour in hours_of(free):
+                        print(f"  {color}○ {court}코트 {hour:02d}:00~{hour+2:02d}:00 빈자리{reset}")
 
             if verbose and not date_skipped:
                 print()
+            bitmap.set(d, day.get(d))
+            _emit_progress(on_result, date_str, day.to_results(courts, all_hours), closed,
+                           d, dates)
+
+        async with _search_shards(_extra_shards(shards), exclude=user_id) as extra:
+            await fetch_by_date([bot] + extra, dates, courts, concurrency=concurrency,
+                                on_date=on_date, max_age=max_age)
 
+    results = bitmap.to_results(courts, all_hours)
     print("=" * 70)
     if skipped_dates:
         print(f"  검색 결과: 총 {len(results)}건 빈자리 (휴장일 {len(skipped_dates)}일 제외)")
@@ -926,6 +1458,7 @@ async def search_all_slots_async(
         "year": year, "month": month,
         "total": len(results), "results": results,
         "skipped_dates": list(skipped_dates),
+        "bitmap": bitmap.to_json(),
     }
 
 
@@ -10,7 +10,7 @@ import time
 import random
 import calendar
 from datetime import datetime, date
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from requests.adapters import HTTPAdapter
@@ -18,6 +18,7 @@ from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
 import config
+from codec_cache import decode_body
 from utils import wait_before_login, wait_for_reservation_open
 
 
@@ -79,6 +80,15 @@ class TennisReservationHTTP:
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         print(f"{timestamp} {self.prefix} {msg}")
 
+    @staticmethod
+    def _text(resp):
+        """응답 본문 디코드 — 경로별로 맞았던 코덱부터 시도 (codec_cache.py).
+
+        resp.text는 Content-Type 문자셋(없으면 chardet 추정)으로 디코드해
+        EUC-KR 선언에 UTF-8 바이트가 섞인 페이지를 깨뜨린다.
+        """
+        return decode_body(urlparse(resp.url).path, resp.content)
+
     def _request_with_retry(self, method, url, max_retries=None, **kwargs):
         """재시도 로직이 포함된 HTTP 요청"""
         if max_retries is None:
@@ -149,7 +159,7 @@ class TennisReservationHTTP:
                 # 로그인 확인
                 resp = self._request_with_retry("GET", config.MAIN_URL, max_retries=3)
 
-                if "로그아웃" in resp.text:
+                if "로그아웃" in self._text(resp):
                     self.logged_in = True
                     self.log("[SUCCESS] 로그인 성공!")
                     return True
@@ -198,7 +208,7 @@ class TennisReservationHTTP:
                 "GET", config.TENNIS_RESERVATION_URL,
                 params=params, max_retries=config.MAX_RETRIES
             )
-            return resp.text
+            return self._text(resp)
 
         except Exception as e:
             self.log(f"[ERROR] 예약 페이지 조회 실패: {e}")
@@ -299,7 +309,7 @@ class TennisReservationHTTP:
                 resp = self._request_with_retry("POST", apply_url, data=form_data, max_retries=3)
 
                 # useForm에서 사용자 정보 추출
-                soup2 = BeautifulSoup(resp.text, "html.parser")
+                soup2 = BeautifulSoup(self._text(resp), "html.parser")
                 use_form = soup2.find("form", {"name": "useForm"})
 
                 if not use_form:
@@ -338,7 +348,7 @@ class TennisReservationHTTP:
                 resp2 = self._request_with_retry("POST", proc_url, data=form_data, max_retries=3)
 
                 # 결과 확인
-                response_text = resp2.text
+                response_text = self._text(resp2)
 
                 if "정상적으로 완료" in response_text:
                     self.log("[SUCCESS] 대관접수 완료!")
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+월간 빈자리 검색 파이프라인 — 날짜×코트 페이지를 제한된 동시성으로 조회
+
+한 달 검색은 날짜×코트 약 120페이지를 세션 하나로 차례로(페이지마다 0.1초 쉬며)
+받아 수 분이 걸렸다. 페이지끼리는 서로 독립이므로 워커 여러 개가 한 작업 큐에서
+(date, court)를 꺼내 동시에 조회한다.
+
+  - 동시성: 워커 수 = config.SEARCH_CONCURRENCY (세션 하나를 공유)
+  - 속도 제한: 요청 시작 간격을 1/config.SEARCH_RATE초 이상으로 벌린다 (0=제한 없음)
+  - 분할(shard): 계정 여러 개로 로그인한 세션 목록을 주면 세션마다 워커를 띄워
+    같은 큐를 나눠 가진다. 먼저 끝난 세션이 남은 작업을 가져가므로(work stealing)
+    느린 세션에 작업이 몰리지 않는다. 속도 제한은 세션(PHPSESSID)마다 따로 둔다.
+    조회에 실패한 페이지는 큐 뒤로 보내 한 번 더 시도한다 (대개 다른 세션이 가져간다).
+  - 캐시: max_age초 안에 조회한 (날짜, 코트)는 avail_cache에서 꺼내고 나머지만
+    큐에 넣는다. 새로 조회한 페이지는 끝난 뒤 한 번에 저장한다.
+  - 순서: 큐는 날짜 순이고, 한 날짜의 코트가 모두 끝나면 날짜 순서대로 on_date를
+    부른다. 호출 측은 예전 순차 루프와 같은 순서로 출력·결과를 쌓고, 그때그때
+    진행 상황을 내보낼 수 있다 (API 작업 이벤트 등).
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import date
+
+import config
+from avail_cache import CACHE
+from slot_bitmap import hour_mask
+
+
+class RateLimiter:
+    """요청 시작 간격을 1/rate초 이상으로 벌린다 (rate <= 0이면 제한 없음)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def fetch_by_date(bots, dates, courts, concurrency=None, rate=None, on_date=None,
+                        stats=None, max_age=None):
+    """dates × courts 예약 페이지를 병렬 조회해 빈 시간대를 파싱한다.
+
+    Args:
+        bots: 로그인된 TennisReservationAsync 또는 그 목록 (목록이면 분할 조회)
+        dates: datetime.date 목록 (이 순서로 조회·통지)
+        concurrency / rate: 세션당 값. 기본값 config.SEARCH_CONCURRENCY / config.SEARCH_RATE
+        on_date: on_date(d, {court: 시간대 마스크 또는 None}) — 날짜의 모든 코트가 끝나면
+                 날짜 순서대로 호출 (조회 실패한 코트는 None)
+        stats: dict를 주면 {"pages": [세션별 조회 수], "retried": 재시도 수,
+               "cached": 캐시에서 꺼낸 수}를 채운다
+        max_age: 이보다 새(초) 캐시 항목은 다시 조회하지 않는다. 0이면 모두 새로 조회.
+                 기본 config.AVAIL_CACHE_MAX_AGE_S. config.AVAIL_CACHE가 꺼져 있으면
+                 지정값과 관계없이 0 (캐시를 읽지도 쓰지도 않는다)
+
+    Returns:
+        {date: {court: 시간대 마스크 또는 None}} — 8비트 마스크 (slot_bitmap.hour_mask)
+    """
+    if not isinstance(bots, (list, tuple)):
+        bots = [bots]
+    concurrency = concurrency or config.SEARCH_CONCURRENCY
+    rate = config.SEARCH_RATE if rate is None else rate
+    if not config.AVAIL_CACHE:
+        max_age = 0   # 캐시를 끄면 읽기도 끈다 (max_age를 지정해도)
+    elif max_age is None:
+        max_age = config.AVAIL_CACHE_MAX_AGE_S
+    pages = {d: {} for d in dates}
+    cached = CACHE.get_fresh(((d.isoformat(), court) for d in dates for court in courts),
+                             max_age)
+    for (date_str, court), hours in cached.items():
+        pages[date.fromisoformat(date_str)][court] = hours
+    queue = deque((d, court, None) for d in dates for court in courts
+                  if court not in pages[d])
+    if cached:
+        print(f"[INFO] 빈자리 캐시: {len(cached)}/{len(cached) + len(queue)}페이지 재사용 "
+              f"({max_age}초 이내 조회분)")
+    fetched_slots = {}
+    order = list(dates)
+    cursor = 0
+
+    def flush():
+        nonlocal cursor
+        while cursor < len(order) and len(pages[order[cursor]]) == len(courts):
+            d = order[cursor]
+            cursor += 1
+            if on_date is not None:
+                on_date(d, {court: pages[d][court] for court in courts})
+
+    fetched = [0] * len(bots)
+    retried = 0
+
+    async def worker(i, bot, limiter):
+        nonlocal retried
+        while queue:
+            d, court, failed_on = queue.popleft()
+            await limiter.wait()
+            html = await bot.get_reservation_page(court, d.year, d.month, d.day)
+            fetched[i] += 1
+            if not html and failed_on is None and len(bots) > 1:
+                retried += 1
+                queue.append((d, court, i))   # 뒤로 — 대개 다른 세션이 가져간다
+                continue
+            pages[d][court] = hour_mask(bot.get_available_slots(html)) if html else None
+            if html:
+                fetched_slots[(d.isoformat(), court)] = pages[d][court]
+            flush()
+
+    flush()   # 캐시만으로 채워진 앞쪽 날짜
+    per_bot = min(concurrency, len(queue)) or 1
+    workers = []
+    for i, bot in enumerate(bots):
+        limiter = RateLimiter(rate)
+        workers += [worker(i, bot, limiter) for _ in range(per_bot)]
+    await asyncio.gather(*workers)
+    if config.AVAIL_CACHE:
+        CACHE.put_many(fetched_slots)
+    if stats is not None:
+        stats.update(pages=fetched, retried=retried, cached=len(cached))
+    return pages
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+로그인 세션 캐시 — API 서버 요청 간 TennisReservationAsync 재사용
+
+/check-login, /check-slots, /reserve-single, /search-*는 같은 사용자에 대해 매번
+로그인(3회 왕복)을 반복했다. user_id별로 로그인된 세션을 프로세스 안에 보관해
+다음 요청은 로그인 없이 바로 쓴다.
+
+  - 만료: 만든 지 API_SESSION_TTL_S초가 지나면 새로 로그인한다.
+  - 크기: 최대 API_SESSION_CACHE_SIZE개, 넘치면 가장 오래 안 쓴 세션부터 버린다 (LRU).
+  - 검증(지연): 마지막 확인 후 API_SESSION_VALIDATE_S초 넘게 지난 세션만 빌려줄 때
+    메인 GET 1회로 "로그아웃" 링크를 확인한다. 링크가 없으면(서버 쪽 세션 만료)
+    버리고 새로 로그인한다. 페이지 조회가 실패한 요청도 invalidate()로 버린다.
+  - 비밀번호가 캐시된 세션과 다르면 새로 로그인한다 (다이제스트 비교).
+  - 버려진 세션은 빌려 간 요청이 모두 돌려준 뒤 닫는다.
+  - 예약(apply → proc)은 PHP 세션 상태를 쓰므로 borrow(exclusive=True)로 빌린다.
+    세션마다 공유/배타 잠금을 두어, 배타 사용은 먼저 빌려 간 조회(공유)가 모두 끝난
+    뒤 시작하고, 그동안 새 조회·지연 검증 GET은 배타 사용이 끝날 때까지 기다린다.
+    apply와 proc 사이에 같은 PHPSESSID로 다른 페이지를 받으면 세션 상태가 덮어쓰여
+    "(1-1) 정상적인 방법으로 신청" 오류가 나기 때문이다.
+
+집계(stats): hits, misses(새 로그인), validations, login_failures, 사유별 evictions
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import config
+from reservation_async import TennisReservationAsync
+
+
+class _SharedExclusiveLock:
+    """공유(조회)/배타(예약) 잠금. 배타 대기자가 있으면 새 공유 사용자도 기다린다."""
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @asynccontextmanager
+    async def shared(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: not self._writer and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._readers -= 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def exclusive(self):
+        async with self._cond:
+            self._writers_waiting += 1
+            try:
+                await self._cond.wait_for(lambda: not self._writer and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+                self._cond.notify_all()   # 취소됐으면 막혀 있던 공유 사용자를 깨운다
+            self._writer = True
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class _Entry:
+    def __init__(self, bot, pw_digest):
+        self.bot = bot
+        self.pw_digest = pw_digest
+        self.created = time.monotonic()
+        self.checked = self.created    # 마지막으로 로그인 상태를 확인한 시각
+        self.refs = 0                  # 빌려 간 요청 수
+        self.retired = False           # 캐시에서 빠짐 — 마지막 사용자가 닫는다
+        self.lock = _SharedExclusiveLock()
+
+
+class SessionCache:
+    def __init__(self, connector=None, max_size=None, ttl_s=None, validate_s=None):
+        self.connector = connector
+        self.max_size = max_size or config.API_SESSION_CACHE_SIZE
+        self.ttl_s = config.API_SESSION_TTL_S if ttl_s is None else ttl_s
+        self.validate_s = config.API_SESSION_VALIDATE_S if validate_s is None else validate_s
+        self._entries = OrderedDict()     # user_id → _Entry (끝이 최근 사용)
+        self._locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.validations = 0
+        self.login_failures = 0
+        self.evictions = {"ttl": 0, "lru": 0, "logout": 0, "password": 0, "error": 0}
+
+    async def _acquire(self, user_id, user_pw):
+        digest = hashlib.sha256(user_pw.encode("utf-8")).digest()
+        async with self._locks.setdefault(user_id, asyncio.Lock()):
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                reason = None
+                now = time.monotonic()
+                if not hmac.compare_digest(entry.pw_digest, digest):
+                    reason = "password"
+                elif now - entry.created >= self.ttl_s:
+                    reason = "ttl"
+                elif now - entry.checked >= self.validate_s:
+                    self.validations += 1
+                    async with entry.lock.shared():   # 진행 중인 예약 사이에 끼지 않게
+                        valid = await entry.bot.verify_login()
+                    if valid:
+                        entry.checked = time.monotonic()
+                    else:
+                        reason = "logout"
+                if reason is None:
+                    self.hits += 1
+                    self._entries.move_to_end(user_id)
+                    return entry
+                await self._evict(user_id, reason)
+
+            self.misses += 1
+            bot = TennisReservationAsync()
+            await bot._create_session(self.connector)
+            if not await bot.login(user_id, user_pw):
+                self.login_failures += 1
+                await bot.close()
+                return None
+            entry = self._entries[user_id] = _Entry(bot, digest)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                await self._evict(oldest, "lru")
+            return entry
+
+    async def _evict(self, user_id, reason):
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        self.evictions[reason] += 1
+        entry.retired = True
+        if entry.refs == 0:
+            await entry.bot.close()
+
+    @asynccontextmanager
+    async def borrow(self, user_id, user_pw, exclusive=False):
+        """로그인된 세션을 빌린다. 로그인 실패 시 None.
+
+        exclusive=True면 같은 세션의 다른 사용(공유·배타)이 모두 끝난 뒤 혼자 쓴다.
+        기본(공유)은 다른 공유 사용과 동시에 쓰되 배타 사용과는 겹치지 않는다.
+        """
+        entry = await self._acquire(user_id, user_pw)
+        if entry is None:
+            yield None
+            return
+        entry.refs += 1
+        try:
+            async with (entry.lock.exclusive() if exclusive else entry.lock.shared()):
+                yield entry.bot
+        finally:
+            entry.refs -= 1
+            if entry.retired and entry.refs == 0:
+                await entry.bot.close()
+
+    async def invalidate(self, user_id):
+        """세션을 버린다 (조회 실패 — 서버 쪽 만료 추정)."""
+        await self._evict(user_id, "error")
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "validations": self.validations,
+            "login_failures": self.login_failures,
+            "evictions": dict(self.evictions),
+        }
+
+    async def close(self):
+        for user_id in list(self._entries):
+            entry = self._entries.pop(user_id)
+            await entry.bot.close()
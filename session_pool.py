@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+로그인 세션 풀 — 실행 간 PHPSESSID 재사용
+
+TennisReservationAsync.login()은 봇마다 3회 왕복(메인 GET → login_process POST →
+메인 GET)이 필요하다. 계정당 N개 독립 세션을 쓰면 오픈 직전 구간에 3N건이 몰린다.
+
+(계정, 워커 슬롯)별로 aiohttp 쿠키 jar를 sessions/ 에 저장해 두고, 다음 실행에서
+불러와 메인 GET 1회("로그아웃" 링크 확인)로 검증한다. 검증 GET이 곧 연결 예열을
+겸하므로 재사용에 성공한 봇은 로그인+예열 4회 → 1회로 줄어든다.
+세션이 만료됐으면 쿠키를 비우고 기존처럼 전체 로그인한다.
+
+파일 형식: JSON {"user_id", "slot", "saved_at", "cookies": [{name, value, domain, path}]}
+권한: 디렉터리 0700, 파일 0600 (세션 쿠키 = 로그인 자격)
+
+임대(lease): 1예약 = 1독립 PHPSESSID 원칙을 지키려면 같은 세션 파일을 두 실행(겹친
+CLI 프로세스, API 서버의 동시 /reserve)이 함께 쓰면 안 된다. 불러오기 전에 파일별
+배타 잠금({uid}_{slot}.lock, flock)을 잡고 봇을 닫을 때 푼다. 잠금을 못 잡으면 그
+봇은 풀을 건너뛰고 새로 로그인한다 (저장도 하지 않는다).
+
+설정: config.SESSION_REUSE (TENNIS_SESSION_REUSE), config.SESSION_MAX_AGE_HOURS
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+from http.cookies import SimpleCookie
+from pathlib import Path
+
+from yarl import URL
+
+import config
+
+try:
+    import fcntl
+except ImportError:   # Windows — O_EXCL 잠금 파일로 대신한다
+    fcntl = None
+
+SESSIONS_DIR = Path(__file__).resolve().parent / "sessions"
+
+_UNSAFE_CHARS_RE = re.compile(r"[^0-9A-Za-z._-]")
+
+
+class SessionPool:
+    """(user_id, slot) → 쿠키 파일 매핑.
+
+    slot은 같은 계정 안에서의 독립 세션 번호(0부터). 같은 계정의 예약 작업
+    순서가 유지되는 한 실행마다 같은 작업이 같은 세션을 이어받는다.
+    """
+
+    def __init__(self, directory=SESSIONS_DIR, max_age_hours=None):
+        self.directory = Path(directory)
+        if max_age_hours is None:
+            max_age_hours = config.SESSION_MAX_AGE_HOURS
+        self.max_age = max_age_hours * 3600
+        self.stats = {"loaded": 0, "reused": 0, "expired": 0, "saved": 0, "busy": 0}
+
+    def path(self, user_id, slot):
+        safe_uid = _UNSAFE_CHARS_RE.sub("_", user_id)
+        return self.directory / f"{safe_uid}_{slot}.json"
+
+    def lease(self, user_id, slot):
+        """(user_id, slot) 세션의 배타 임대. 다른 실행이 쓰는 중이면 None.
+
+        flock은 열린 파일마다 걸리므로 같은 프로세스 안의 두 봇 사이에서도 배타적이고,
+        프로세스가 죽으면 커널이 풀어 준다.
+        """
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        lease = SessionLease(self.path(user_id, slot).with_suffix(".lock"))
+        if lease.acquire():
+            return lease
+        self.stats["busy"] += 1
+        return None
+
+    def load(self, session, user_id, slot):
+        """저장된 쿠키를 session.cookie_jar에 채운다. 불러왔으면 True.
+
+        max_age보다 오래된 파일은 서버에서 이미 만료됐을 가능성이 높으므로
+        검증 요청 없이 건너뛴다.
+        """
+        path = self.path(user_id, slot)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if data.get("user_id") != user_id:
+            return False
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            self.discard(user_id, slot)
+            return False
+
+        base_url = URL(config.MAIN_URL)
+        for c in data.get("cookies", []):
+            cookie = SimpleCookie()
+            cookie[c["name"]] = c["value"]
+            morsel = cookie[c["name"]]
+            morsel["path"] = c.get("path") or "/"
+            # 호스트 전용 쿠키는 domain 없이 넣어야 jar가 host-only로 유지한다
+            if c.get("domain") and c["domain"] != base_url.host:
+                morsel["domain"] = c["domain"]
+            session.cookie_jar.update_cookies(cookie, response_url=base_url)
+
+        loaded = bool(data.get("cookies"))
+        if loaded:
+            self.stats["loaded"] += 1
+        return loaded
+
+    def save(self, session, user_id, slot):
+        """로그인된 session의 쿠키를 0600 파일로 원자적으로 저장한다."""
+        cookies = [
+            {"name": m.key, "value": m.value,
+             "domain": m["domain"], "path": m["path"]}
+            for m in session.cookie_jar
+        ]
+        if not cookies:
+            return
+        data = {"user_id": user_id, "slot": slot,
+                "saved_at": time.time(), "cookies": cookies}
+
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path = self.path(user_id, slot)
+        # 임시 파일 이름은 저장마다 달라야 동시 저장이 서로의 임시 파일을 덮지 않는다
+        # (NamedTemporaryFile은 0600으로 만든다)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.directory,
+                                         prefix=path.stem + ".", suffix=".tmp",
+                                         delete=False) as f:
+            json.dump(data, f, ensure_ascii=False)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+        self.stats["saved"] += 1
+
+    def discard(self, user_id, slot):
+        try:
+            self.path(user_id, slot).unlink()
+        except FileNotFoundError:
+            pass
+
+    def mark_reused(self):
+        self.stats["reused"] += 1
+
+    def mark_expired(self, user_id, slot):
+        self.stats["expired"] += 1
+        self.discard(user_id, slot)
+
+
+class SessionLease:
+    """세션 파일 하나의 배타 잠금. release()는 여러 번 불러도 된다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def acquire(self):
+        if fcntl is None:
+            try:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            except FileExistsError:
+                return False
+            return True
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        if fcntl is None:
+            os.close(self._fd)
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        else:
+            # 잠금 파일은 지우지 않는다 — 지우면 대기 중인 다른 실행이 다른 inode를 잠근다
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+
+def assign_slots(jobs):
+    """job 목록에 계정 내 세션 슬롯 번호를 매긴다 (같은 user_id끼리 0, 1, 2, ...)."""
+    counters = {}
+    slots = []
+    for job in jobs:
+        n = counters.get(job["user_id"], 0)
+        counters[job["user_id"]] = n + 1
+        slots.append(n)
+    return slots
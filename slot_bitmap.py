@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+빈자리 비트맵 — 날짜 하루 = 32비트 마스크 (코트 4 × 시간대 8)
+
+빈자리는 {"date", "court", "hour", "time", "day", ...} dict 목록으로 오가는데,
+한 달이면 수백 건, 여러 달이면 수천 건이다. 정보량은 하루 32비트뿐이므로
+날짜별 마스크 배열 하나로 들고 다니고, dict 목록은 출력·JSON 응답 직전에만 만든다.
+
+비트 배치:  bit = (court - 1) * 8 + AVAILABLE_HOURS.index(hour)
+    court 1 → 0~7비트(06시~20시), court 2 → 8~15비트, … court 4 → 24~31비트
+
+  - 시간대 마스크(8비트): 페이지 하나(날짜·코트)의 빈 시간대. hour_mask(slots)로 만든다.
+    검색 파이프라인과 빈자리 캐시(avail_cache.py)가 이 단위로 주고받는다.
+  - SlotBitmap: 시작 날짜부터 하루 하나씩 32비트 마스크(array). | & - 로 합치고
+    (여러 검색 결과 합집합, 계정 희망 슬롯과 교집합), popcount()로 건수를 센다.
+"""
+
+from array import array
+from datetime import date, timedelta
+
+import config
+
+HOURS = tuple(config.AVAILABLE_HOURS)
+COURTS = tuple(config.ALL_COURTS)
+HOURS_PER_COURT = len(HOURS)
+ALL_HOURS_MASK = (1 << HOURS_PER_COURT) - 1
+DAY_NAMES = ("월", "화", "수", "목", "금", "토", "일")
+
+_HOUR_INDEX = {h: i for i, h in enumerate(HOURS)}
+
+# 날짜 마스크 배열의 타입 코드 — 원소 4바이트(32비트). "L"은 64비트 Linux에서 8바이트라
+# 메모리가 두 배가 되므로 "I"를 쓰고, "I"가 4바이트가 아닌 플랫폼에서만 "L"로 대신한다.
+TYPECODE = "I" if array("I").itemsize == 4 else "L"
+assert array(TYPECODE).itemsize == 4, "32비트 배열 타입 코드가 없습니다"
+DAY_MASK = 0xFFFFFFFF
+assert len(COURTS) * HOURS_PER_COURT <= 32
+
+
+def hour_bit(hour):
+    """시작 시각 → 시간대 비트. 시작 시각 표에 없는 시각은 0 (아무것도 맞지 않음)."""
+    i = _HOUR_INDEX.get(hour)
+    return 0 if i is None else 1 << i
+
+
+def hour_mask(slots):
+    """파싱된 슬롯 목록([{"start_hour": 6, ...}]) → 8비트 시간대 마스크."""
+    mask = 0
+    for s in slots:
+        i = _HOUR_INDEX.get(s["start_hour"])
+        if i is not None:
+            mask |= 1 << i
+    return mask
+
+
+def hours_of(mask):
+    """8비트 시간대 마스크 → 시작 시각 목록."""
+    return [h for i, h in enumerate(HOURS) if mask >> i & 1]
+
+
+def mask_of_hours(hours):
+    """시작 시각 목록 → 8비트 시간대 마스크. 표에 없는 시각(요청 본문의 7시 등)은 건너뛴다."""
+    mask = 0
+    for h in hours:
+        mask |= hour_bit(h)
+    return mask
+
+
+def is_closure(mask):
+    """전 시간대가 비어 있으면 휴장일로 추정 — 휴장일 판정의 기준 규칙.
+
+    async 엔진·뷰어·감시 모드가 이 함수를 쓰고, http 엔진(reservation_http.py)은
+    슬롯 목록용 사본 is_likely_closure로 같은 규칙을 따른다.
+    """
+    return mask & ALL_HOURS_MASK == ALL_HOURS_MASK
+
+
+def slot_bit(court, hour):
+    """(코트, 시작 시각) → 32비트 날짜 마스크의 비트. 없는 코트·시각은 0."""
+    if court not in COURTS:
+        return 0
+    return hour_bit(hour) << (court - 1) * HOURS_PER_COURT
+
+
+def court_hours(day_mask, court):
+    """32비트 날짜 마스크 → 그 코트의 8비트 시간대 마스크."""
+    return day_mask >> (court - 1) * HOURS_PER_COURT & ALL_HOURS_MASK
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def _as_date(d):
+    return d if isinstance(d, date) else date.fromisoformat(d)
+
+
+class SlotBitmap:
+    """start 날짜부터 하루 하나씩 32비트 마스크."""
+
+    __slots__ = ("start", "masks")
+
+    def __init__(self, start=None, days=0):
+        self.start = _as_date(start) if start is not None else None
+        self.masks = array(TYPECODE, bytes(array(TYPECODE).itemsize * days))
+
+    # ── 채우기 ──────────────────────────────────────────────
+
+    def _index(self, d):
+        """d의 배열 위치. 범위 밖이면 배열을 늘린다."""
+        d = _as_date(d)
+        if self.start is None:
+            self.start = d
+        offset = (d - self.start).days
+        if offset < 0:
+            self.masks = array(TYPECODE, bytes(array(TYPECODE).itemsize * -offset)) + self.masks
+            self.start = d
+            offset = 0
+        if offset >= len(self.masks):
+            self.masks.extend([0] * (offset + 1 - len(self.masks)))
+        return offset
+
+    def get(self, d):
+        if self.start is None:
+            return 0
+        offset = (_as_date(d) - self.start).days
+        return self.masks[offset] if 0 <= offset < len(self.masks) else 0
+
+    def set(self, d, mask):
+        """d 날짜의 32비트 마스크를 덮어쓴다."""
+        self.masks[self._index(d)] = mask & DAY_MASK
+
+    def set_court(self, d, court, hours_mask):
+        """d 날짜 court 코트의 시간대 마스크를 덮어쓴다."""
+        i = self._index(d)
+        shift = (court - 1) * HOURS_PER_COURT
+        self.masks[i] = (self.masks[i] & ~(ALL_HOURS_MASK << shift)
+                         | (hours_mask & ALL_HOURS_MASK) << shift) & DAY_MASK
+
+    def add(self, d, court, hour):
+        i = self._index(d)
+        self.masks[i] |= slot_bit(court, hour)
+
+    @classmethod
+    def from_slots(cls, items):
+        """dict 목록({"date", "court", "hour"}) → 비트맵 (계정 희망 슬롯 등)."""
+        bm = cls()
+        for s in items:
+            bm.add(s["date"], s["court"], s["hour"])
+        return bm
+
+    # ── 집합 연산 ───────────────────────────────────────────
+
+    def _combine(self, other, op):
+        spans = [(bm.start, bm.start + timedelta(days=len(bm.masks)))
+                 for bm in (self, other) if bm.start is not None and bm.masks]
+        out = SlotBitmap()
+        if not spans:
+            return out
+        out.start = min(first for first, _ in spans)
+        days = (max(end for _, end in spans) - out.start).days
+        out.masks = array(TYPECODE, (
+            op(self.get(d), other.get(d)) & DAY_MASK
+            for d in (out.start + timedelta(days=i) for i in range(days))))
+        return out
+
+    def __or__(self, other):
+        return self._combine(other, lambda a, b: a | b)
+
+    def __and__(self, other):
+        return self._combine(other, lambda a, b: a & b)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a & ~b)
+
+    def popcount(self):
+        return sum(popcount(m) for m in self.masks)
+
+    def __bool__(self):
+        return any(self.masks)
+
+    def __eq__(self, other):
+        return isinstance(other, SlotBitmap) and dict(self.items()) == dict(other.items())
+
+    def items(self):
+        """(date, 32비트 마스크) — 빈 날짜는 건너뛴다."""
+        for i, m in enumerate(self.masks):
+            if m:
+                yield self.start + timedelta(days=i), m
+
+    # ── 경계 변환 ───────────────────────────────────────────
+
+    def to_results(self, courts=COURTS, hours=HOURS):
+        """기존 dict 목록 형식 (날짜 → 코트 → 시간 순)."""
+        out = []
+        for d, m in self.items():
+            date_str = d.isoformat()
+            weekday = d.weekday()
+            for court in courts:
+                for hour in hours:
+                    if m & slot_bit(court, hour):
+                        out.append({
+                            "date": date_str, "day": DAY_NAMES[weekday],
+                            "court": court, "hour": hour,
+                            "time": f"{hour:02d}:00~{hour+2:02d}:00",
+                            "is_weekend": weekday in (5, 6),
+                        })
+        return out
+
+    def to_json(self):
+        """{"start": "YYYY-MM-DD", "masks": [int, ...]} — 뷰어·API 응답용."""
+        return {"start": self.start.isoformat() if self.start else None,
+                "masks": self.masks.tolist()}
+
+    @classmethod
+    def from_json(cls, data):
+        bm = cls(data.get("start"))
+        bm.masks = array(TYPECODE, data.get("masks") or [])
+        return bm
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+응답 스트리밍 판정 — 필요한 부분이 도착하면 본문 나머지를 기다리지 않는다
+
+정각 크리티컬 경로의 두 응답은 일부만 보면 된다:
+  - rent_period_apply.php: useForm 블록 (<form name="useForm"> ~ </form>)
+  - rent_period_proc.php : 결과 alert("…") 문구 ("정상적으로 완료", "한 건 이상 예약" …)
+                           가 든 스크립트 블록 (</script>까지)
+
+_request_with_retry(scan=...)는 청크가 올 때마다 바이트 그대로 needle을 찾고
+(문구는 EUC-KR·UTF-8 바이트로 미리 인코딩), 판정에 필요한 부분까지만 디코드해
+돌려준다. 남은 본문은 백그라운드에서 읽어 버려 keep-alive 연결을 풀에 되돌린다
+(중간에 끊으면 커넥터가 연결을 닫아 다음 요청이 새 핸드셰이크부터 시작한다).
+
+needle이 끝까지 안 나오면 전체 본문을 그대로 돌려주므로 판정 로직은 바뀌지 않는다.
+
+설정: config.STREAM_SCAN
+"""
+
+import asyncio
+import re
+
+# submit_reservation의 proc.php 판정 문구 (실패 → 성공 순으로 검사됨)
+PROC_MARKERS = (
+    "한 건 이상 예약", "예약이 완료된 시간", "이미 예약", "중복", "마감",
+    "존재하지않는", "정상적으로 완료",
+)
+
+_drain_tasks = set()   # 백그라운드 드레인 태스크 (GC 방지용 강한 참조)
+
+
+def _encoded(texts, encodings=("euc-kr", "utf-8")):
+    out = []
+    for text in texts:
+        for enc in encodings:
+            needle = text.encode(enc)
+            if needle not in out:
+                out.append(needle)
+    return tuple(out)
+
+
+class ScanSpec:
+    """needle이 나오고 그 뒤에 until 패턴이 나오면 판정 완료.
+
+    needles: 바이트 문자열 목록(그중 하나) 또는 정규식 패턴(bytes)
+    overlap: 청크 경계에 걸친 needle을 놓치지 않도록 다시 훑는 길이.
+             정규식이면 일치 길이의 상한을 지정해야 한다.
+    """
+
+    def __init__(self, name, needles, until, overlap=None):
+        self.name = name
+        if isinstance(needles, (tuple, list)):
+            overlap = max(len(n) for n in needles) - 1
+            needles = b"|".join(re.escape(n) for n in needles)
+        self.needle = re.compile(needles)
+        self.until = re.compile(until, re.IGNORECASE)
+        self.overlap = overlap
+
+    def scanner(self):
+        return Scanner(self)
+
+
+class Scanner:
+    """청크를 누적하며 판정 위치를 찾는다."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.buf = bytearray()
+        self._scanned = 0
+        self._hit = None      # 찾은 needle의 끝 위치
+
+    def feed(self, chunk):
+        """청크를 더한다. 판정에 필요한 부분이 모였으면 그 끝 위치, 아니면 None."""
+        self.buf += chunk
+        if self._hit is None:
+            start = max(0, self._scanned - self.spec.overlap)
+            self._scanned = len(self.buf)
+            m = self.spec.needle.search(self.buf, start)
+            if m is None:
+                return None
+            self._hit = m.end()
+        m = self.spec.until.search(self.buf, self._hit)
+        return m.end() if m else None
+
+
+# apply.php: useForm 여는 태그 ~ 닫는 </form>
+USE_FORM = ScanSpec(
+    "useForm",
+    (b'name="useForm"', b"name='useForm'", b"name=useForm"),
+    rb"</form\s*>",
+)
+
+# proc.php: 결과 문구가 든 alert("...") 호출 ~ 그 스크립트의 </script>.
+# 문구만 찾으면 페이지 머리말의 "마감" 같은 무관한 단어에서 끊겨, 뒤에 오는 실제
+# 결과 문구를 못 본 채 판정할 수 있다. 그래서 alert 인자 안의 문구만 인정한다.
+# (EUC-KR 2바이트 문자는 따옴표 바이트를 포함하지 않는다)
+_ALERT_MESSAGE_MAX = 300
+PROC_RESULT = ScanSpec(
+    "proc",
+    rb"alert\(\s*[\"'][^\"'\n]{0,%d}?(?:" % _ALERT_MESSAGE_MAX
+    + b"|".join(re.escape(n) for n in _encoded(PROC_MARKERS)) + b")",
+    rb"</script\s*>",
+    overlap=_ALERT_MESSAGE_MAX + 64,
+)
+
+
+async def read_until(resp, spec):
+    """응답 본문을 spec 판정 위치까지 읽는다.
+
+    Returns:
+        (bytes, early): early=True면 본문이 남아 있고 드레인을 백그라운드로 넘겼다
+                        (호출자는 resp를 release하지 않는다).
+    """
+    scanner = spec.scanner()
+    async for chunk in resp.content.iter_any():
+        end = scanner.feed(chunk)
+        if end is None:
+            continue
+        if resp.content.at_eof():
+            break
+        drain_in_background(resp)
+        return bytes(scanner.buf[:end]), True
+    return bytes(scanner.buf), False
+
+
+def drain_in_background(resp, timeout=10.0):
+    """남은 본문을 읽어 버리고 연결을 풀에 되돌린다. 실패하면 연결을 닫는다."""
+
+    async def drain():
+        try:
+            await asyncio.wait_for(resp.read(), timeout)
+        except asyncio.CancelledError:
+            resp.close()
+            raise
+        except Exception:
+            resp.close()
+            return
+        resp.release()
+
+    task = asyncio.create_task(drain())
+    _drain_tasks.add(task)
+    task.add_done_callback(_drain_tasks.discard)
+    return task
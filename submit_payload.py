@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+예약 신청 요청 본문 조립 (apply.php / proc.php)
+
+정각 크리티컬 경로의 클라이언트 측 작업을 줄이기 위해 두 가지 경로를 제공한다.
+
+- 일반 경로: DocumentForm dict를 복사·수정해 apply 본문을 만들고, apply 응답의
+  useForm 필드를 합친 뒤 proc 본문을 만든다 (build_apply_fields / build_proc_fields).
+- 컴파일 경로 (CompiledSubmit): T-20초 프리페치 시점에 apply 본문을 URL 인코딩
+  바이트로 미리 만들고, proc 본문은 useForm 필드만 채우면 되는 템플릿으로 둔다.
+  정각에는 바이트 전송 + useForm 추출 1회만 남는다.
+
+인코딩은 aiohttp가 dict를 보낼 때와 동일하다 (urlencode, UTF-8, quote_plus).
+"""
+
+from urllib.parse import quote_plus, urlencode
+
+import config
+
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+DEFAULT_COM_NM = "개인"
+
+
+def _pair(key, value):
+    return f"{quote_plus(key)}={quote_plus(value)}"
+
+
+def encode_fields(fields):
+    """폼 필드 dict를 application/x-www-form-urlencoded 바이트로 인코딩한다."""
+    return urlencode(fields, doseq=True).encode("ascii")
+
+
+def build_apply_fields(form_data, court_number, time_value):
+    """DocumentForm 필드에 코트·시간 선택을 반영한 apply.php 필드 dict."""
+    fields = dict(form_data)
+    fields["place_opt"] = config.COURT_VALUE_MAP[court_number]
+    fields["rent_chk[]"] = time_value
+    fields["use_time"] = "2"
+    return fields
+
+
+def proc_overrides(time_value, com_nm):
+    """proc.php 필수 필드 (사이트 JavaScript checkIt() 참조).
+
+    rent_chk[]는 전체 값 유지 (DB 레코드 ID 포함) — 정규화하면
+    "존재하지않는 시간데이터" 오류가 난다.
+    """
+    return {
+        "regno": "0000000000000",
+        "com_nm": com_nm or DEFAULT_COM_NM,
+        "apply_chk2": "1",
+        "apply_chk": "1",
+        "stime": time_value[:2],
+        "etime": time_value[4:6],
+        "rent_stime": time_value[:4],
+        "rent_etime": time_value[4:8],
+        "rent_p_stime": "",
+        "rent_p_etime": "",
+    }
+
+
+def build_proc_fields(apply_fields, use_fields, time_value):
+    """apply 필드 + useForm 필드(값 있는 것만) + 필수 필드로 proc.php 필드 dict를 만든다."""
+    fields = dict(apply_fields)
+    fields.update(use_fields)
+    fields.update(proc_overrides(time_value, fields.get("com_nm")))
+    return fields
+
+
+class CompiledSubmit:
+    """정각 전에 만들어 두는 apply/proc 요청 본문.
+
+    apply_body: apply.php에 그대로 쓰는 URL 인코딩 바이트
+    proc_body(use_fields): 서버가 돌려준 useForm 필드만 채워 proc.php 바이트를 만든다.
+        필드 순서·값은 build_proc_fields() + encode_fields()와 같다.
+    """
+
+    def __init__(self, form_data, court_number, time_value):
+        fields = build_apply_fields(form_data, court_number, time_value)
+        self.court_number = court_number
+        self.time_value = time_value
+        self.apply_body = encode_fields(fields)
+
+        self._base = fields
+        self._base_encoded = {k: _pair(k, v) for k, v in fields.items()}
+        overrides = proc_overrides(time_value, None)
+        self._override_keys = dict.fromkeys(overrides)
+        # com_nm은 useForm 값에 따라 달라지므로 정각에 채운다
+        self._override_encoded = {k: _pair(k, v) for k, v in overrides.items()
+                                  if k != "com_nm"}
+
+    def _fixed(self, key, com_nm):
+        if key == "com_nm":
+            return _pair("com_nm", com_nm)
+        return self._override_encoded[key]
+
+    def proc_body(self, use_fields):
+        com_nm = (use_fields.get("com_nm") or self._base.get("com_nm")
+                  or DEFAULT_COM_NM)
+        parts = []
+        for key, encoded in self._base_encoded.items():
+            if key in self._override_keys:
+                parts.append(self._fixed(key, com_nm))
+            elif key in use_fields:
+                parts.append(_pair(key, use_fields[key]))
+            else:
+                parts.append(encoded)
+        for key, value in use_fields.items():
+            if key in self._base_encoded:
+                continue
+            if key in self._override_keys:
+                parts.append(self._fixed(key, com_nm))
+            else:
+                parts.append(_pair(key, value))
+        for key in self._override_keys:
+            if key not in self._base_encoded and key not in use_fields:
+                parts.append(self._fixed(key, com_nm))
+        return "&".join(parts).encode("ascii")
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""fire_plan — 잘못된 TENNIS_FIRE_PLAN 처리"""
+
+import contextlib
+import io
+import unittest
+
+from fire_plan import build_fire_plan, parse_plan
+
+
+class MalformedPlanTest(unittest.TestCase):
+    def test_parse_plan_rejects_malformed(self):
+        for spec in ("0:4,x:2", "0:0", "-10:*", " , "):
+            with self.assertRaises(ValueError):
+                parse_plan(spec)
+
+    def test_build_falls_back_to_single_wave(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            plan = build_fire_plan("0:4,80ms:4")
+        self.assertEqual(plan.source, "config-fallback")
+        self.assertEqual(plan.assign(3), [(0, 0.0)] * 3)
+        self.assertIn("[WARN]", out.getvalue())
+
+    def test_build_valid_plan(self):
+        plan = build_fire_plan("80:1,0:2")
+        self.assertEqual(plan.source, "config")
+        self.assertEqual(plan.assign(4), [(0, 0.0), (0, 0.0), (1, 80.0), (1, 80.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
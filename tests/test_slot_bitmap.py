@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""slot_bitmap — 32비트 날짜 마스크 배열, 시작 시각 표에 없는 시각·코트 처리"""
+
+import unittest
+
+from slot_bitmap import ALL_HOURS_MASK, SlotBitmap, hour_bit, mask_of_hours, slot_bit
+
+
+class UnknownHourTest(unittest.TestCase):
+    def test_mask_of_hours_skips_unknown_hours(self):
+        self.assertEqual(mask_of_hours([6, 7]), hour_bit(6))
+        self.assertEqual(mask_of_hours([7, 25]), 0)
+
+    def test_slot_bit_unknown_is_zero(self):
+        self.assertEqual(slot_bit(1, 7), 0)
+        self.assertEqual(slot_bit(9, 6), 0)
+
+    def test_to_results_with_unknown_hour_matches_nothing_extra(self):
+        bm = SlotBitmap()
+        bm.add("2026-11-07", 1, 6)
+        bm.add("2026-11-07", 2, 8)
+        results = bm.to_results(courts=(1, 2), hours=[6, 7])
+        self.assertEqual([(r["court"], r["hour"]) for r in results], [(1, 6)])
+
+
+class DayMaskArrayTest(unittest.TestCase):
+    def test_masks_are_32_bit(self):
+        bm = SlotBitmap("2026-11-01", days=30)
+        self.assertEqual(bm.masks.itemsize, 4)
+        self.assertEqual((bm | SlotBitmap.from_json(bm.to_json())).masks.itemsize, 4)
+
+    def test_out_of_range_values_are_masked(self):
+        bm = SlotBitmap()
+        bm.set("2026-11-07", (1 << 40) | 0b1)
+        self.assertEqual(bm.get("2026-11-07"), 0b1)
+        bm.set_court("2026-11-08", 5, ALL_HOURS_MASK)      # 없는 코트 — 32비트 밖
+        bm.set_court("2026-11-08", 4, 0x1FF)               # 9비트 — 코트 4 칸만
+        self.assertEqual(bm.get("2026-11-08"), ALL_HOURS_MASK << 24)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""stream_scan — 스트리밍으로 자른 proc.php 본문과 전체 본문의 판정 비교"""
+
+import unittest
+
+from stream_scan import PROC_MARKERS, PROC_RESULT, USE_FORM
+
+
+def verdict(text):
+    """submit_reservation과 같은 순서(실패 → 성공)로 처음 걸리는 문구."""
+    return next((m for m in PROC_MARKERS if m in text), None)
+
+
+def scan(spec, body, chunk_size):
+    scanner = spec.scanner()
+    for i in range(0, len(body), chunk_size):
+        end = scanner.feed(body[i:i + chunk_size])
+        if end is not None:
+            return body[:end]
+    return body
+
+
+def page(result_script, chrome="<li>접수 마감 안내 (공지)</li>"):
+    return (
+        "<html><head><script>function chk(){ alert(\"시간을 선택하세요.\"); }</script></head>"
+        f"<body><ul>{chrome}</ul>{result_script}<div>{'푸터 ' * 200}</div></body></html>"
+    )
+
+
+class ProcResultScanTest(unittest.TestCase):
+    def assert_same_verdict(self, html, expected):
+        for encoding in ("euc-kr", "utf-8"):
+            body = html.encode(encoding)
+            for chunk_size in (1, 7, 64, 4096):
+                cut = scan(PROC_RESULT, body, chunk_size)
+                self.assertLess(len(cut), len(body))
+                self.assertEqual(verdict(cut.decode(encoding)), expected)
+                self.assertEqual(verdict(html), expected)
+
+    def test_unrelated_marker_before_alert(self):
+        html = page('<script type="text/javascript">alert("한 건 이상 예약이 완료되어 있습니다.");'
+                    "history.back();</script>")
+        self.assertEqual(verdict(html), "한 건 이상 예약")
+        self.assert_same_verdict(html, "한 건 이상 예약")
+
+    def test_alert_message_with_parentheses(self):
+        html = page("<script>alert(\"예약이 완료된 시간입니다.(3)\");history.back();</script>",
+                    chrome="<li>(중복 신청 안내)</li>")
+        self.assert_same_verdict(html, "예약이 완료된 시간")
+
+    def test_success(self):
+        html = page("<script>alert('대관접수가 정상적으로 완료되었습니다..');"
+                    "location.href='/';</script>", chrome="<li>안내</li>")
+        self.assert_same_verdict(html, "정상적으로 완료")
+
+    def test_no_result_alert_reads_full_body(self):
+        body = page("<p>점검 중</p>").encode("euc-kr")
+        self.assertEqual(scan(PROC_RESULT, body, 64), body)
+
+
+class UseFormScanTest(unittest.TestCase):
+    def test_cut_after_form(self):
+        body = b"<p>x</p><form name='useForm'><input name=a></form >" + b"tail" * 100
+        self.assertTrue(scan(USE_FORM, body, 5).endswith(b"</form >"))
+
+
+if __name__ == "__main__":
+    unittest.main()
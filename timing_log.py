@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+타이밍 로그(logs/timing_*.jsonl) 읽기 도우미
+
+reservation_async가 예약 1건마다 남기는 JSONL 레코드를 한 줄씩 스트리밍으로
+읽는다 (파일 전체를 메모리에 올리지 않음). fire_plan(자동 웨이브 산출)과
+분석 스크립트가 함께 쓴다.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+LOGS_DIR = Path(__file__).resolve().parent / "logs"   # reservation_async 타이밍 로그 폴더
+
+APPLY_PATH = "/rent/rent_period_apply.php"
+PROC_PATH = "/rent/rent_period_proc.php"
+
+
+def timing_log_paths(logs_dir=LOGS_DIR, pattern="timing_*.jsonl"):
+    """타이밍 로그 파일 목록 (파일명 = 시작 시각 순)."""
+    return sorted(Path(logs_dir).glob(pattern))
+
+
+def iter_timing_records(paths=None):
+    """타이밍 로그 레코드를 순서대로 yield한다. 깨진 줄은 건너뛴다.
+
+    Args:
+        paths: 파일 경로 목록 (미지정 시 logs/timing_*.jsonl 전체)
+    """
+    for path in (timing_log_paths() if paths is None else paths):
+        try:
+            f = open(path, encoding="utf-8")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def _parse_ts(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def event_start(event):
+    """요청 이벤트의 시작 시각 (ts는 응답 수신 시각이므로 elapsed_ms를 뺀다)."""
+    end = _parse_ts(event.get("ts"))
+    if end is None:
+        return None
+    return end - timedelta(milliseconds=event.get("elapsed_ms", 0))
+
+
+def nominal_open(record):
+    """레코드의 명목 오픈 시각 — 발사 시각(fire_ts)에 가장 가까운 정분.
+
+    정각 대기 없이 실행된 레코드(fire_lateness_ms 없음)는 None.
+    """
+    if record.get("fire_lateness_ms") is None:
+        return None
+    fire = _parse_ts(record.get("fire_ts"))
+    if fire is None:
+        return None
+    return (fire + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+
+def _open_local(record):
+    """명목 오픈(서버 시계 기준)을 로컬 시각으로 환산한다.
+
+    로컬 시각 + 오프셋 = 서버 시각이므로 clock.applied_ms만큼 앞당긴다.
+    """
+    open_at = nominal_open(record)
+    if open_at is None:
+        return None
+    return open_at - timedelta(milliseconds=(record.get("clock") or {}).get("applied_ms", 0))
+
+
+def success_after_open_ms(record):
+    """성공한 예약의 최종 proc.php 응답 수신 시각 − 명목 오픈 (ms). 해당 없으면 None."""
+    if not record.get("success"):
+        return None
+    open_at = _open_local(record)
+    if open_at is None:
+        return None
+    hedge = record.get("hedge") or {}
+    events = hedge.get("events", []) if hedge.get("winner") == "hedge" else record.get("events", [])
+    for event in reversed(events):
+        if event.get("path") == PROC_PATH and event.get("outcome") == "ok":
+            end = _parse_ts(event.get("ts"))
+            if end is None:
+                return None
+            return round((end - open_at).total_seconds() * 1000, 1)
+    return None
+
+
+def accepted_apply_delay_ms(record):
+    """서버가 apply.php를 처음 받아들인 요청의 시작 시각 − 명목 오픈 (ms).
+
+    "받아들임" = 성공 응답 뒤에 proc.php 요청이 이어진 apply.php
+    (useForm이 나왔다는 뜻). 오픈 전 apply는 useForm 없이 돌아와 proc까지 가지 않는다.
+    서버 시계 보정(clock.applied_ms)이 있었으면 서버 시계 기준으로 환산한다.
+    해당 요청이 없거나 명목 오픈을 알 수 없으면 None.
+    """
+    open_at = _open_local(record)
+    if open_at is None:
+        return None
+    events = [e for e in record.get("events", []) if "path" in e]
+    for prev, nxt in zip(events, events[1:]):
+        if (prev["path"] == APPLY_PATH and prev.get("outcome") == "ok"
+                and nxt["path"] == PROC_PATH):
+            start = event_start(prev)
+            if start is None or start < open_at - timedelta(seconds=5):
+                continue
+            return round((start - open_at).total_seconds() * 1000, 1)
+    return None
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+타이밍 로그 분석 (logs/timing_*.jsonl)
+
+reservation_async가 예약 1건마다 남기는 타이밍 레코드를 스트리밍으로 읽어
+동시 접속·재시도 설정 튜닝에 필요한 지표를 출력한다.
+
+  - 경로별(apply/proc/tennis_rent.php 등) 응답 시간 백분위수
+  - 경로별 재시도율·타임아웃율·오류율
+  - 오픈 후 성공까지 걸린 시간 분포
+  - 월별 비교 (성공률, apply/proc p50·p95, 성공까지 시간)
+  - 발사 요청의 연결 재사용률 (keep-alive 유지 효과)
+
+파일을 한 줄씩 읽고 지연 시간은 고정 크기 로그 구간 히스토그램(상대 오차 ~2%)에
+누적하므로, 몇 달 치 로그도 메모리 사용량이 일정하다.
+
+사용법:
+    python3 timing_report.py                    # logs/timing_*.jsonl 전체
+    python3 timing_report.py --month 2026-05    # 특정 월만
+    python3 timing_report.py logs/timing_20260525_*.jsonl
+    python3 timing_report.py --json             # JSON 출력 (회귀 추적용)
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+from urllib.parse import urlparse
+
+from timing_log import (
+    LOGS_DIR, iter_timing_records, success_after_open_ms, timing_log_paths,
+)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Histogram:
+    """로그 스케일 구간 히스토그램 (ms). 구간 폭 ≈ 2%, 메모리는 구간 수에 비례."""
+
+    _SCALE = 50  # log1p(ms) * 50 → 구간 번호
+
+    def __init__(self):
+        self.counts = {}
+        self.n = 0
+        self.max = None
+
+    def add(self, value_ms):
+        value_ms = max(0.0, float(value_ms))
+        idx = int(math.log1p(value_ms) * self._SCALE)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.n += 1
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, q):
+        if not self.n:
+            return None
+        rank = max(1, math.ceil(self.n * q / 100))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                # 구간 중앙값으로 환산
+                return round(math.expm1((idx + 0.5) / self._SCALE), 1)
+        return self.max
+
+    def summary(self):
+        out = {"n": self.n}
+        for q in PERCENTILES:
+            out[f"p{q}"] = self.percentile(q)
+        out["max"] = None if self.max is None else round(self.max, 1)
+        return out
+
+
+class PathStats:
+    """경로 하나의 요청 시도 집계."""
+
+    def __init__(self):
+        self.latency = Histogram()   # 성공(ok) 시도의 응답 시간
+        self.attempts = 0
+        self.retries = 0             # attempt > 1 인 시도
+        self.outcomes = {}
+
+    def add(self, event):
+        self.attempts += 1
+        if event.get("attempt", 1) > 1:
+            self.retries += 1
+        outcome = event.get("outcome", "unknown")
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if outcome == "ok":
+            self.latency.add(event.get("elapsed_ms", 0))
+
+    def summary(self):
+        def rate(n):
+            return round(n / self.attempts * 100, 2) if self.attempts else 0.0
+        errors = self.attempts - self.outcomes.get("ok", 0)
+        return {
+            "attempts": self.attempts,
+            "retry_rate": rate(self.retries),
+            "timeout_rate": rate(self.outcomes.get("timeout", 0)),
+            "error_rate": rate(errors),
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "latency_ms": self.latency.summary(),
+        }
+
+
+class Bucket:
+    """집계 단위(전체 또는 월 하나)."""
+
+    def __init__(self):
+        self.files = set()
+        self.records = 0
+        self.successes = 0
+        self.paths = {}
+        self.time_to_success = Histogram()
+        self.sem_wait = Histogram()
+        self.fire_conn = {"reused": 0, "new": 0}
+
+    def add(self, record, source):
+        self.files.add(source)
+        self.records += 1
+        if record.get("success"):
+            self.successes += 1
+        for event in record.get("events", []):
+            path = event.get("path")
+            if path is None:
+                continue   # 파싱·본문 조립 이벤트
+            if "://" in path:
+                # 경로 없는 URL(MAIN_URL)은 전체 URL로 기록된다
+                path = urlparse(path).path or "/"
+            self.paths.setdefault(path, PathStats()).add(event)
+        tts = success_after_open_ms(record)
+        if tts is not None:
+            self.time_to_success.add(tts)
+        if record.get("sem_wait_ms") is not None:
+            self.sem_wait.add(record["sem_wait_ms"])
+        for key, n in (record.get("fire_conn") or {}).items():
+            if key in self.fire_conn:
+                self.fire_conn[key] += n
+
+    def summary(self):
+        return {
+            "runs": len(self.files),
+            "reservations": self.records,
+            "success_rate": round(self.successes / self.records * 100, 1) if self.records else 0.0,
+            "time_to_success_ms": self.time_to_success.summary(),
+            "sem_wait_ms": self.sem_wait.summary(),
+            "fire_conn": dict(self.fire_conn),
+            "paths": {p: s.summary() for p, s in sorted(self.paths.items())},
+        }
+
+
+def _record_month(record, source):
+    fire_ts = record.get("fire_ts")
+    if fire_ts:
+        return fire_ts[:7]
+    # timing_YYYYMMDD_HHMMSS_*.jsonl
+    stem = Path(source).stem.split("_")
+    if len(stem) > 1 and len(stem[1]) == 8:
+        return f"{stem[1][:4]}-{stem[1][4:6]}"
+    return "unknown"
+
+
+def analyze(paths, month=None):
+    """로그 파일들을 스트리밍으로 집계해 (전체 Bucket, {월: Bucket})를 반환한다."""
+    total, months = Bucket(), {}
+    for path in paths:
+        for record in iter_timing_records([path]):
+            key = _record_month(record, path)
+            if month and key != month:
+                continue
+            total.add(record, path)
+            months.setdefault(key, Bucket()).add(record, path)
+    return total, months
+
+
+def _fmt(value, width=8):
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.1f}"
+
+
+def print_report(total, months):
+    summary = total.summary()
+    print("=" * 78)
+    print(f"  타이밍 로그 분석: 실행 {summary['runs']}회, 예약 {summary['reservations']}건, "
+          f"성공률 {summary['success_rate']:.1f}%")
+    print("=" * 78)
+
+    print("[경로별 응답 시간 (성공 시도, ms)]")
+    print(f"  {'경로':<32} {'시도':>6} {'p50':>8} {'p90':>8} {'p99':>8} "
+          f"{'재시도%':>7} {'타임아웃%':>8}")
+    for path, s in summary["paths"].items():
+        lat = s["latency_ms"]
+        print(f"  {path:<32} {s['attempts']:>6} {_fmt(lat['p50'])} {_fmt(lat['p90'])} "
+              f"{_fmt(lat['p99'])} {s['retry_rate']:>7.2f} {s['timeout_rate']:>8.2f}")
+
+    tts = summary["time_to_success_ms"]
+    print()
+    print("[오픈 후 성공까지 (최종 proc.php 응답, ms)]")
+    if tts["n"]:
+        print(f"  n={tts['n']}  p50={tts['p50']}  p90={tts['p90']}  "
+              f"p99={tts['p99']}  max={tts['max']}")
+    else:
+        print("  정각 대기 후 성공한 기록 없음")
+    sem = summary["sem_wait_ms"]
+    if sem["n"]:
+        print(f"  세마포어 대기: p50={sem['p50']}  p99={sem['p99']}  max={sem['max']}")
+    conn = summary["fire_conn"]
+    fired = conn["reused"] + conn["new"]
+    if fired:
+        print(f"  발사 요청 연결 재사용: {conn['reused']}/{fired} "
+              f"({conn['reused'] / fired * 100:.1f}%)")
+
+    if len(months) > 1:
+        print()
+        print("[월별 비교]")
+        print(f"  {'월':<8} {'예약':>5} {'성공%':>6} {'Δ성공%':>7} {'apply p50':>10} "
+              f"{'apply p95':>10} {'proc p95':>9} {'성공 p50':>9}")
+        prev = None
+        for key in sorted(months):
+            m = months[key].summary()
+            apply_lat = (m["paths"].get("/rent/rent_period_apply.php") or {}).get("latency_ms", {})
+            proc_lat = (m["paths"].get("/rent/rent_period_proc.php") or {}).get("latency_ms", {})
+            delta = "" if prev is None else f"{m['success_rate'] - prev:+.1f}"
+            print(f"  {key:<8} {m['reservations']:>5} {m['success_rate']:>6.1f} {delta:>7} "
+                  f"{_fmt(apply_lat.get('p50'), 10)} {_fmt(apply_lat.get('p95'), 10)} "
+                  f"{_fmt(proc_lat.get('p95'), 9)} {_fmt(m['time_to_success_ms']['p50'], 9)}")
+            prev = m["success_rate"]
+    print("=" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="타이밍 로그(logs/timing_*.jsonl) 분석")
+    parser.add_argument("paths", nargs="*", help="분석할 JSONL 파일 (기본: logs/timing_*.jsonl)")
+    parser.add_argument("--logs-dir", default=str(LOGS_DIR), help="로그 폴더 (기본 logs/)")
+    parser.add_argument("--month", help="특정 월만 분석 (YYYY-MM)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.paths] or timing_log_paths(args.logs_dir)
+    if not paths:
+        print(f"[INFO] 타이밍 로그가 없습니다: {args.logs_dir}")
+        return
+
+    total, months = analyze(paths, args.month)
+    if args.json:
+        print(json.dumps({
+            "total": total.summary(),
+            "months": {k: months[k].summary() for k in sorted(months)},
+        }, ensure_ascii=False, indent=2))
+        return
+    print_report(total, months)
+
+
+if __name__ == "__main__":
+    main()
@@ -167,24 +167,85 @@ async def wait_before_login_async():
     print(f"[INFO] {config.LOGIN_ADVANCE_MINUTES}분 전 도달. 로그인을 시작합니다.")
 
 
-async def wait_for_reservation_open_async(warmup=None):
+def reservation_open_time(now=None):
+    """오늘의 예약 오픈 시각(로컬). 즉시 실행 모드이거나 예약일이 아니면 None."""
+    now = now or datetime.now()
+    if config.RESERVATION_DAY == 0 or now.day != config.RESERVATION_DAY:
+        return None
+    return now.replace(
+        hour=config.RESERVATION_HOUR,
+        minute=config.RESERVATION_MINUTE,
+        second=0,
+        microsecond=0
+    )
+
+
+class FireScheduler:
+    """정각 발사 스케줄러 — 워커 전원을 하나의 Event로 동시에 풀어준다.
+
+    워커는 정각 전에 wait()에서 대기하고, run()이 목표 시각까지
+    거친 asyncio.sleep → 마지막 FIRE_SPIN_MS 동안 perf_counter_ns 바쁜 대기 후
+    Event를 set한다. asyncio.sleep(0.01) 폴링의 최대 10ms 오차와 틱마다의
+    print 비용을 없애고, 실제 발사 시각과 목표의 차이(lateness_ms)를 기록한다.
+    """
+
+    def __init__(self, spin_ms=None):
+        self.spin_ns = int((spin_ms if spin_ms is not None else config.FIRE_SPIN_MS) * 1_000_000)
+        self.event = asyncio.Event()
+        self.fired_ns = None      # Event set 시점 (perf_counter_ns)
+        self.lateness_ms = None   # 실제 발사 − 목표 (ms, 즉시 발사면 None)
+
+    async def wait(self):
+        await self.event.wait()
+
+    def fire_now(self):
+        if not self.event.is_set():
+            self.fired_ns = time.perf_counter_ns()
+            self.event.set()
+
+    async def run(self, target_ts):
+        """target_ts(로컬 epoch 초)에 Event를 set한다.
+
+        벽시계 → 단조 시계 변환은 한 번만 하고, 이후는 perf_counter_ns만 본다.
+        """
+        deadline_ns = time.perf_counter_ns() + int((target_ts - time.time()) * 1e9)
+        coarse_s = (deadline_ns - self.spin_ns - time.perf_counter_ns()) / 1e9
+        if coarse_s > 0:
+            await asyncio.sleep(coarse_s)
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+        self.fire_now()
+        self.lateness_ms = round((self.fired_ns - deadline_ns) / 1e6, 3)
+
+
+async def wait_for_reservation_open_async(warmup=None, clock_offset=0.0, scheduler=None,
+                                          warmup_marks=(20, 4)):
     """예약 오픈 시간까지 비동기 정밀 대기.
 
     RESERVATION_DAY = 0이면 바로 실행
     RESERVATION_DAY != 0이면:
-      - 오늘이 예약일과 같으면: 예약 시간까지 대기 (10ms 정밀도)
+      - 오늘이 예약일과 같으면: 예약 시간까지 대기 (FireScheduler, sub-ms 정밀도)
       - 그 외: False 반환
 
     Args:
         warmup: 오픈 직전 연결 재예열용 async 콜백.
-                남은 시간이 20초/4초 이하가 되는 시점에 각 1회,
+                남은 시간이 warmup_marks(초) 이하가 되는 시점에 각 1회,
                 fire-and-forget 태스크로 실행되어 정각 시작을 지연시키지 않는다.
+        warmup_marks: 재예열 시점 (남은 초, 내림차순). keepalive.py 핑으로
+                      연결을 유지할 때는 폼 프리페치용 (20,)만 쓴다.
+        clock_offset: 서버 시계 − 로컬 시계(초, clock_sync.py 추정값).
+                      서버 기준 정각에 맞추도록 목표 시각을 그만큼 옮긴다.
+        scheduler: FireScheduler. 주면 정각(또는 즉시 실행)에 scheduler.event가
+                   set되어 미리 대기 중인 워커가 한꺼번에 출발한다.
 
     Returns:
         bool: 성공 시 True, 실행 불가 시 False
     """
+    scheduler = scheduler or FireScheduler()
+
     if config.RESERVATION_DAY == 0:
         print("[INFO] 즉시 실행 모드")
+        scheduler.fire_now()
         return True
 
     now = datetime.now()
@@ -203,26 +264,28 @@ async def wait_for_reservation_open_async(warmup=None):
         minute=config.RESERVATION_MINUTE,
         second=0,
         microsecond=0
-    )
+    ) - timedelta(seconds=clock_offset)
 
     if now >= target:
         print(f"[INFO] 예약 시간({config.RESERVATION_HOUR}:{config.RESERVATION_MINUTE:02d})이 지났습니다. 바로 진행합니다.")
+        scheduler.fire_now()
         return True
 
     wait_seconds = (target - now).total_seconds()
     print(f"[INFO] 예약 오픈까지 {wait_seconds:.0f}초 남았습니다.")
-    print(f"[INFO] 목표 시간: {target.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"[INFO] 목표 시간: {target.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}"
+          + (f" (서버 시계 보정 {clock_offset * 1000:+.0f}ms)" if clock_offset else ""))
 
     # keepalive(클라 30초, 서버는 보통 수 초)가 끊기지 않은 상태로 정각을 맞도록
-    # 남은 20초(TLS 세션 확보)·4초(최종 예열) 시점에 재예열을 트리거한다.
-    warmup_marks = [20, 4]
+    # 기본값은 남은 20초(TLS 세션 확보)·4초(최종 예열) 시점에 재예열을 트리거한다.
+    warmup_marks = sorted(warmup_marks, reverse=True)
     warmup_tasks = []  # fire-and-forget 태스크 GC 방지용 참조
 
+    # 남은 1초까지는 1초 단위(재예열 시점에는 맞춰 깨어남)로 자고 출력도 그때만 한다.
+    # 마지막 1초는 출력 없이 FireScheduler에 넘긴다.
     while True:
-        now = datetime.now()
-        remaining = (target - now).total_seconds()
-
-        if remaining <= 0:
+        remaining = (target - datetime.now()).total_seconds()
+        if remaining <= 1:
             break
 
         if warmup and warmup_marks and remaining <= warmup_marks[0]:
@@ -230,13 +293,15 @@ async def wait_for_reservation_open_async(warmup=None):
             print(f"\n[WARMUP] 연결 재예열 (남은 {remaining:.1f}초)")
             warmup_tasks.append(asyncio.create_task(warmup()))
 
-        if remaining > 10:
-            print(f"\r[WAIT] 남은 시간: {remaining:.0f}초", end="", flush=True)
-            await asyncio.sleep(1)
-        else:
-            # 마지막 10초: 10ms 정밀도로 대기
-            print(f"\r[READY] {remaining:.3f}초 후 시작!", end="", flush=True)
-            await asyncio.sleep(0.01)
-
-    print("\n[GO!] 예약을 시작합니다!")
+        tag = "WAIT" if remaining > 10 else "READY"
+        print(f"\r[{tag}] 남은 시간: {remaining:.0f}초", end="", flush=True)
+        step = min(1.0, remaining - 1)
+        if warmup and warmup_marks and remaining > warmup_marks[0]:
+            step = min(step, remaining - warmup_marks[0])
+        await asyncio.sleep(step)
+
+    await scheduler.run(target.timestamp())
+    # 워커가 첫 요청을 보낼 때까지 양보한 뒤 출력한다 (출력을 발사 경로 밖으로)
+    await asyncio.sleep(0)
+    print(f"\n[GO!] 예약을 시작합니다! (목표 대비 {scheduler.lateness_ms:+.3f}ms)")
     return True
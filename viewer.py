@@ -18,7 +18,7 @@ import os
 import sys
 import threading
 import webbrowser
-from datetime import datetime
+from datetime import date, datetime
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
@@ -263,7 +263,8 @@ class _APIHandler(BaseHTTPRequestHandler):
                 result = {"ok": False, "error": "날짜 없음"}
             else:
                 try:
-                    result = search_dates_availability(dates)
+                    result = search_dates_availability(
+                        dates, body.get("shards"), body.get("max_age"))
                 except Exception as e:
                     result = {"ok": False, "error": str(e)}
             payload = json.dumps(result, ensure_ascii=False).encode()
@@ -385,6 +386,7 @@ def load_settings():
     return {
         "login_advance_minutes": cfg.LOGIN_ADVANCE_MINUTES,
         "slots_per_account":     cfg.SLOTS_PER_ACCOUNT,
+        "search_shards":         cfg.SEARCH_SHARDS,
     }
 
 
@@ -417,69 +419,73 @@ def get_initial_month(accounts):
 VIEWER_HOURS = [6, 8, 10, 12, 14, 16, 18, 20]  # config.AVAILABLE_HOURS와 동일
 
 
-def search_dates_availability(dates):
+def search_dates_availability(dates, shards=None, max_age=None):
     """선택된 날짜들의 코트별 빈자리를 병렬 조회한다 (읽기 전용, 예약 안 함).
 
-    첫 번째 계정으로 로그인 1회 → 날짜×코트 페이지를 Semaphore(4)로 병렬 조회.
+    앞쪽 계정 shards개(기본 TENNIS_SEARCH_SHARDS)로 로그인 → 날짜×코트 페이지를
+    search_pipeline으로 세션들에 나눠 병렬 조회 (config.SEARCH_CONCURRENCY / SEARCH_RATE).
+    max_age초 안에 조회한 페이지는 빈자리 캐시(avail_cache.py)에서 쓴다.
     어느 한 코트라도 휴장일 패턴이면 해당 날짜 전체를 휴장으로 처리한다.
 
-    Returns: {"ok", "results", "closed_dates", "searched_dates", "elapsed"}
+    Returns: {"ok", "bitmap", "count", "closed_dates", "searched_dates", "sessions", "elapsed"}
+             bitmap = slot_bitmap.SlotBitmap.to_json() — 브라우저에서 bitmapKeys()로 푼다
              실패 시 {"ok": False, "error": str}
     """
     import asyncio
     import time
 
-    from reservation_async import TennisReservationAsync, is_likely_closure
+    from reservation_async import TennisReservationAsync
+    from search_pipeline import fetch_by_date
+    from slot_bitmap import SlotBitmap, is_closure, mask_of_hours
 
     accounts = load_data()
     if not accounts:
         return {"ok": False, "error": "계정 없음"}
-    cred = accounts[0]
+    shards = max(1, int(shards or load_settings()["search_shards"]))
+    creds = accounts[:shards]
     t0 = time.time()
 
     async def _run():
-        async with TennisReservationAsync() as bot:
-            if not await bot.login(cred["user_id"], cred["user_pw"]):
+        bots = [TennisReservationAsync() for _ in creds]
+        try:
+            for bot in bots:
+                await bot._create_session()
+            ok = await asyncio.gather(
+                *(bot.login(c["user_id"], c["user_pw"]) for bot, c in zip(bots, creds)))
+            ready = [bot for bot, logged_in in zip(bots, ok) if logged_in]
+            if not ready:
                 return {"ok": False, "error": "로그인 실패"}
 
-            sem = asyncio.Semaphore(4)
-
-            async def fetch(date_str, court):
-                y, m, d = (int(x) for x in date_str.split("-"))
-                async with sem:
-                    html = await bot.get_reservation_page(court, y, m, d)
-                    await asyncio.sleep(0.05)  # 서버 부하 완화
-                return date_str, court, html
-
-            pages = await asyncio.gather(
-                *(fetch(ds, c) for ds in dates for c in ALL_COURTS)
+            pages = await fetch_by_date(
+                ready, [date.fromisoformat(ds) for ds in dates], ALL_COURTS,
+                max_age=max_age,
             )
 
+            wanted = mask_of_hours(VIEWER_HOURS)
+            bitmap = SlotBitmap()
             closed = set()
-            slots_by_key = {}
-            for date_str, court, html in pages:
-                if not html:
-                    continue
-                slots = bot.get_available_slots(html)
-                if is_likely_closure(slots):
-                    closed.add(date_str)
-                slots_by_key[(date_str, court)] = slots
-
-            results = [
-                {"date": ds, "court": c, "hour": s["start_hour"]}
-                for (ds, c), slots in sorted(slots_by_key.items())
-                if ds not in closed
-                for s in slots
-                if s["start_hour"] in VIEWER_HOURS
-            ]
-            results.sort(key=lambda r: (r["date"], r["hour"], r["court"]))
+            for d, by_court in pages.items():
+                for court, free in by_court.items():
+                    if free is None:
+                        continue
+                    if is_closure(free):
+                        closed.add(d.isoformat())
+                    bitmap.set_court(d, court, free & wanted)
+            for date_str in closed:
+                bitmap.set(date_str, 0)
+
             return {
                 "ok": True,
-                "results": results,
+                "bitmap": bitmap.to_json(),
+                "count": bitmap.popcount(),
                 "closed_dates": sorted(closed),
                 "searched_dates": sorted(dates),
+                "sessions": len(ready),
                 "elapsed": round(time.time() - t0, 1),
             }
+        finally:
+            for bot in bots:
+                await bot.close()
 
     return asyncio.run(_run())
 
@@ -1157,6 +1163,25 @@ async function redistribute() {
 }
 
 /* ── 빈자리 검색 ── */
+
+/* 검색 결과 비트맵 → "YYYY-MM-DD:시간:코트" 키 (slot_bitmap.py: 비트 = (코트-1)*8 + 시간 순번) */
+function bitmapKeys(bm) {
+  const keys = [];
+  if (!bm || !bm.start) return keys;
+  const [y, m, d] = bm.start.split('-').map(Number);
+  bm.masks.forEach((mask, i) => {
+    if (!mask) return;
+    const dt = new Date(y, m - 1, d + i);
+    const ds = `${dt.getFullYear()}-${String(dt.getMonth()+1).padStart(2,'0')}-${String(dt.getDate()).padStart(2,'0')}`;
+    for (let c = 1; c <= 4; c++) {
+      ALL_HOURS.forEach((hr, hi) => {
+        if (mask & (1 << ((c - 1) * 8 + hi))) keys.push(`${ds}:${hr}:${c}`);
+      });
+    }
+  });
+  return keys;
+}
+
 async function runSearch() {
   if (searching) return;
   ensureMonthDefaults();
@@ -1180,12 +1205,12 @@ async function runSearch() {
       // 같은 날짜의 이전 결과를 지우고 최신 결과로 교체 (날짜 단위 병합)
       const fresh = new Set(r.searched_dates);
       availSlots = new Set([...availSlots].filter(k => !fresh.has(k.slice(0, 10))));
-      r.results.forEach(s => availSlots.add(`${s.date}:${s.hour}:${s.court}`));
+      bitmapKeys(r.bitmap).forEach(k => availSlots.add(k));
       fresh.forEach(d => { searchedDates.add(d); closedDates.delete(d); });
       (r.closed_dates || []).forEach(d => closedDates.add(d));
       buildCalendar();
       const closedMsg = r.closed_dates?.length ? ` (휴장 ${r.closed_dates.length}일)` : '';
-      showToast(`✓ ${r.searched_dates.length}일 검색 — 빈자리 ${r.results.length}건${closedMsg}, ${r.elapsed}초`);
+      showToast(`✓ ${r.searched_dates.length}일 검색 — 빈자리 ${r.count}건${closedMsg}, ${r.elapsed}초`);
     } else {
       showToast('✗ 검색 실패: ' + (r.error || ''), true);
     }
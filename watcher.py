@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+취소분 감시 모드 — 원하는 (날짜, 코트, 시간)이 비면 바로 신청
+
+25일 오픈 뒤에도 취소로 빈자리가 수시로 생기지만 지금은 --search를 손으로 돌려야만
+알 수 있다. 로그인 세션 하나로 감시 대상 페이지(날짜·코트)를 주기적으로 조회하고,
+직전 스냅샷(8비트 시간대 마스크, slot_bitmap.py)과 비교해 원하는 시간이 비어 있으면
+조회한 페이지를 그대로 넘겨 submit_reservation()으로 신청한다 (재조회 1왕복 절약).
+
+  - 대상: config 예약 조건(방법 1/2/3)의 (날짜, 시간, 코트). 지난 날짜는 자동 제외.
+  - 주기(적응형): 감시 페이지에 변화가 있으면 WATCH_MIN_INTERVAL_S로 좁히고, 변화가
+    없으면 WATCH_BACKOFF배씩 WATCH_MAX_INTERVAL_S까지 늘린다. 조회 실패 시 2배.
+    매 주기 ±10% 지터를 둔다.
+  - 신청: 성공하면 그 날짜의 다른 대상은 뺀다 (1일 1건 제한). "한 건 이상 예약"
+    응답도 같게 처리한다. 그 밖의 실패(선점됨, 예약 불가 등)는 계속 감시하되 같은
+    슬롯이 WATCH_MAX_ATTEMPTS번 실패하면 그 슬롯을 대상에서 뺀다 (매 주기 재신청 방지).
+  - 테스트 모드: 신청 직전에 멈춘 "성공"은 예약이 아니므로 날짜를 빼지 않고
+    tested에만 남긴다. 같은 슬롯은 다시 신청하지 않고, 모든 대상을 확인하면 끝낸다.
+  - 세션: WATCH_VERIFY_S마다 로그인 상태를 확인하고 풀렸으면 다시 로그인한다.
+  - 기록: 주기마다 지연·요청 수·변화 수·다음 간격을 logs/watch_*.jsonl에 남기고,
+    끝나면 요약(주기 수, 지연 p50/p95, 주기당 요청 수)을 출력한다.
+
+전 시간대가 빈 페이지는 휴장일로 보고 신청하지 않는다 (slot_bitmap.is_closure 기준,
+http 엔진의 reservation_http.is_likely_closure와 같은 규칙).
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, datetime
+
+import config
+from reservation_async import LOGS_DIR, TennisReservationAsync, _build_tasks, _dump_timing
+from slot_bitmap import hour_bit, hour_mask, hours_of, is_closure, popcount
+
+
+class Watcher:
+    def __init__(self, bot, targets, test_mode=False, log_path=None):
+        """targets: [(date "YYYY-MM-DD", hour, court)] — 같은 날짜 안에서는 앞쪽이 우선."""
+        self.bot = bot
+        self.targets = list(dict.fromkeys(targets))
+        self.test_mode = test_mode
+        self.log_path = log_path
+        self.interval = config.WATCH_MIN_INTERVAL_S
+        self.snapshot = {}       # (date, court) → 시간대 마스크
+        self.cycles = []         # 주기별 기록
+        self.reserved = []
+        self.tested = []         # 테스트 모드에서 신청 직전까지 간 슬롯
+        self._tested_slots = set()
+        self.attempts = []
+        self.failures = {}       # (date, hour, court) → 실패 횟수
+        self._verified = time.monotonic()
+
+    def _pages(self):
+        """감시할 (date, court) → 원하는 시간대 마스크 (대상 순서 유지)."""
+        pages = {}
+        for d, hour, court in self.targets:
+            pages[(d, court)] = pages.get((d, court), 0) | hour_bit(hour)
+        return pages
+
+    def _drop_past(self):
+        today = date.today().isoformat()
+        past = [t for t in self.targets if t[0] < today]
+        if past:
+            self.targets = [t for t in self.targets if t[0] >= today]
+            print(f"[INFO] 지난 날짜 대상 {len(past)}건 제외")
+
+    async def _ensure_login(self, user_id, user_pw):
+        if time.monotonic() - self._verified < config.WATCH_VERIFY_S:
+            return True
+        self._verified = time.monotonic()
+        if await self.bot.verify_login():
+            return True
+        print("[WARN] 로그인 풀림 — 다시 로그인")
+        return await self.bot.login(user_id, user_pw)
+
+    async def _fetch(self, key):
+        d, court = key
+        y, m, day = (int(x) for x in d.split("-"))
+        html = await self.bot.get_reservation_page(court, y, m, day)
+        slots = self.bot.get_available_slots(html) if html else None
+        return key, html, slots
+
+    async def cycle(self):
+        """감시 페이지를 한 번씩 조회하고 비어 있는 대상을 신청한다."""
+        t0 = time.monotonic()
+        self.bot.timing.clear()   # 주기마다 비워 장시간 감시에도 쌓이지 않게 한다
+        pages = self._pages()
+        sem = asyncio.Semaphore(config.SEARCH_CONCURRENCY)
+
+        async def bounded(key):
+            async with sem:
+                return await self._fetch(key)
+
+        fetched = await asyncio.gather(*(bounded(k) for k in pages))
+        fetch_ms = (time.monotonic() - t0) * 1000
+
+        changes = failures = 0
+        opened = []
+        for key, html, slots in fetched:
+            if slots is None:
+                failures += 1
+                continue
+            free = hour_mask(slots)
+            prev = self.snapshot.get(key)
+            self.snapshot[key] = free
+            if prev is not None and prev != free:
+                changes += popcount(prev ^ free)
+                freed = hours_of(free & ~prev)
+                if freed:
+                    print(f"[WATCH] {key[0]} {key[1]}번 코트 새 빈자리: "
+                          f"{', '.join(f'{h:02d}:00' for h in freed)}")
+            if is_closure(free):
+                continue
+            for hour in hours_of(free & pages[key]):
+                opened.append((key, hour, html, slots))
+
+        for (d, court), hour, html, slots in self._by_priority(opened):
+            if (d, hour, court) not in self.targets:
+                continue   # 같은 날짜 다른 대상이 먼저 성공 (또는 시도 한도 초과)
+            if (d, hour, court) in self._tested_slots:
+                continue   # 테스트 모드 — 이미 신청 직전까지 확인한 슬롯
+            await self._reserve(d, hour, court, html, slots)
+
+        if failures == len(fetched) and fetched:
+            self.interval = min(config.WATCH_MAX_INTERVAL_S, self.interval * 2)
+        elif changes:
+            self.interval = config.WATCH_MIN_INTERVAL_S
+        else:
+            self.interval = min(config.WATCH_MAX_INTERVAL_S,
+                                self.interval * config.WATCH_BACKOFF)
+
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "cycle": len(self.cycles) + 1,
+            "pages": len(fetched),
+            "failures": failures,
+            "fetch_ms": round(fetch_ms, 1),
+            "latency_ms": round((time.monotonic() - t0) * 1000, 1),
+            "requests": sum(1 for e in self.bot.timing if "method" in e),   # 재시도 포함
+            "changes": changes,
+            "opened": len(opened),
+            "targets": len(self.targets),
+            "next_interval_s": round(self.interval, 1),
+        }
+        self.cycles.append(record)
+        if self.log_path is not None:
+            _dump_timing(self.log_path, record)
+        return record
+
+    def _by_priority(self, opened):
+        order = {t: i for i, t in enumerate(self.targets)}
+        return sorted(opened, key=lambda o: order.get((o[0][0], o[1], o[0][1]), len(order)))
+
+    async def _reserve(self, d, hour, court, html, slots):
+        slot = next((s for s in slots if s["start_hour"] == hour), None)
+        if slot is None:
+            return
+        y, m, day = (int(x) for x in d.split("-"))
+        print(f"[WATCH] {d} {hour:02d}:00 {court}번 코트 빈자리 — 즉시 신청")
+        success, message = await self.bot.submit_reservation(
+            court, y, m, day, slot["value"], self.test_mode, page_html=html)
+        self.attempts.append({"date": d, "hour": hour, "court": court,
+                              "success": success, "message": message})
+        record = {"date": d, "hour": hour, "court": court, "message": message}
+        if success and self.test_mode:
+            self.tested.append(record)
+            self._tested_slots.add((d, hour, court))
+            return
+        if success or "1일 1건" in message:
+            # 1일 1건 제한 — 같은 날짜의 나머지 대상은 더 볼 필요가 없다
+            self.targets = [t for t in self.targets if t[0] != d]
+            self.snapshot = {k: v for k, v in self.snapshot.items() if k[0] != d}
+            if success:
+                self.reserved.append(record)
+            return
+        slot_key = (d, hour, court)
+        self.failures[slot_key] = self.failures.get(slot_key, 0) + 1
+        if self.failures[slot_key] >= config.WATCH_MAX_ATTEMPTS:
+            self.targets.remove(slot_key)
+            print(f"[WARN] {d} {hour:02d}:00 {court}번 코트 {self.failures[slot_key]}회 실패 "
+                  f"({message}) — 감시 대상에서 제외")
+
+    async def run(self, user_id, user_pw, duration_s=0):
+        """대상이 모두 끝나거나 duration_s초(0 = 무제한)가 지날 때까지 감시한다."""
+        deadline = time.monotonic() + duration_s if duration_s else None
+        while True:
+            self._drop_past()
+            if not self.targets:
+                print("[INFO] 감시 대상이 없습니다 — 종료")
+                break
+            if self._tested_slots.issuperset(self.targets):
+                print("[TEST] 모든 대상을 신청 직전까지 확인 — 종료")
+                break
+            if not await self._ensure_login(user_id, user_pw):
+                print("[ERROR] 재로그인 실패 — 감시 중단")
+                break
+            rec = await self.cycle()
+            print(f"[WATCH] #{rec['cycle']} {rec['pages']}페이지 {rec['latency_ms']:.0f}ms "
+                  f"요청 {rec['requests']}건 변화 {rec['changes']} → {rec['next_interval_s']}초 후")
+            if deadline is not None and time.monotonic() >= deadline:
+                print("[INFO] 감시 시간 종료")
+                break
+            await asyncio.sleep(self.interval * random.uniform(0.9, 1.1))
+
+    def summary(self):
+        latencies = [c["latency_ms"] for c in self.cycles]
+        requests = [c["requests"] for c in self.cycles]
+        out = {
+            "cycles": len(self.cycles),
+            "requests": sum(requests),
+            "reserved": self.reserved,
+            "tested": self.tested,
+            "attempts": self.attempts,
+        }
+        if latencies:
+            out["latency_ms_p50"] = round(statistics.median(latencies), 1)
+            out["latency_ms_p95"] = round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 1)
+            out["requests_per_cycle"] = round(sum(requests) / len(requests), 1)
+        return out
+
+
+async def watch_async(user_id=None, user_pw=None, targets=None, test_mode=False,
+                      duration_s=0):
+    """취소분 감시 실행. targets 미지정 시 config 예약 조건에서 만든다.
+
+    Returns:
+        Watcher.summary() + "log" (주기별 JSONL 경로)
+    """
+    user_id = user_id or config.USER_ID
+    user_pw = user_pw or config.USER_PW
+    if targets is None:
+        targets = _build_tasks()
+
+    log_path = LOGS_DIR / f"watch_{datetime.now():%Y%m%d_%H%M%S}_{user_id}.jsonl"
+
+    print("=" * 60)
+    print("  취소분 감시 모드")
+    print("=" * 60)
+    for d, hour, court in targets:
+        print(f"  - {d} {hour:02d}:00 {court}번 코트")
+    print(f"  주기: {config.WATCH_MIN_INTERVAL_S}~{config.WATCH_MAX_INTERVAL_S}초 (적응형)"
+          f"{' | 테스트 모드' if test_mode else ''}")
+    print("=" * 60)
+
+    async with TennisReservationAsync() as bot:
+        if not await bot.login(user_id, user_pw):
+            return {"error": "로그인 실패", "reserved": []}
+        watcher = Watcher(bot, targets, test_mode=test_mode, log_path=log_path)
+        try:
+            await watcher.run(user_id, user_pw, duration_s)
+        except asyncio.CancelledError:
+            print("[INFO] 감시 중단")
+
+    summary = watcher.summary()
+    summary["log"] = str(log_path)
+    print("=" * 60)
+    print(f"  감시 {summary['cycles']}회 | 요청 {summary['requests']}건"
+          + (f" (주기당 {summary['requests_per_cycle']}건)" if summary["cycles"] else ""))
+    if summary["cycles"]:
+        print(f"  주기 지연 p50 {summary['latency_ms_p50']}ms / p95 {summary['latency_ms_p95']}ms")
+    for r in summary["reserved"]:
+        print(f"  ✓ {r['date']} {r['hour']:02d}:00 {r['court']}번 코트 — {r['message']}")
+    for r in summary["tested"]:
+        print(f"  [TEST] {r['date']} {r['hour']:02d}:00 {r['court']}번 코트 — {r['message']}")
+    print(f"  주기 로그: {log_path}")
+    print("=" * 60)
+    return summary